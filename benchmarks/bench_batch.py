@@ -0,0 +1,45 @@
+"""
+Match throughput of BatchSimulator vs. one Simulation at a time.
+
+Usage: python -m benchmarks.bench_batch [--matches N ...] [--max-time SECONDS]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from src.batch import BatchSimulator, PLAYER_WON, ENEMY_WON
+from src.simulation import Simulation, PLAYER_SIDE, ENEMY_SIDE
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--matches", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--sequential", type=int, default=200,
+                        help="number of matches to time one at a time")
+    parser.add_argument("--max-time", type=float, default=300.0,
+                        help="game seconds before a match counts as undecided")
+    args = parser.parse_args()
+
+    print(f"{'mode':>16} {'matches':>8} {'seconds':>8} {'matches/s':>10} {'player won':>11} {'enemy won':>10}")
+
+    winners = []
+    start = time.perf_counter()
+    for seed in range(args.sequential):
+        winners.append(Simulation(player_ai=True, seed=seed).run(max_time=args.max_time))
+    elapsed = time.perf_counter() - start
+    print(f"{'sequential':>16} {args.sequential:>8} {elapsed:>8.2f} {args.sequential / elapsed:>10.1f} "
+          f"{winners.count(PLAYER_SIDE) / args.sequential:>11.3f} "
+          f"{winners.count(ENEMY_SIDE) / args.sequential:>10.3f}")
+
+    for matches in args.matches:
+        start = time.perf_counter()
+        results = BatchSimulator(matches, seed=0).run(max_time=args.max_time)
+        elapsed = time.perf_counter() - start
+        print(f"{'batch':>16} {matches:>8} {elapsed:>8.2f} {matches / elapsed:>10.1f} "
+              f"{np.mean(results == PLAYER_WON):>11.3f} {np.mean(results == ENEMY_WON):>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
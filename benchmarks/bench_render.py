@@ -0,0 +1,100 @@
+"""
+Unit drawing cost: per-unit pygame.draw calls vs. the pre-rendered SpriteAtlas,
+and whole-frame cost: full repaint + flip vs. the DirtyRectRenderer.
+
+Usage: python -m benchmarks.bench_render [--frames N]
+"""
+
+import argparse
+import os
+import time
+
+# Render offscreen so the benchmark runs anywhere
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from src.constants import SCREEN_WIDTH, SCREEN_HEIGHT, NUM_LANES, BLACK
+from src.battlefield import Battlefield
+from src.renderer import DirtyRectRenderer
+from src.sprites import SpriteAtlas
+from src.ui import UI
+from benchmarks.bench_targeting import build_armies
+
+TOTAL_UNITS = [100, 1000, 5000]
+FRAME_UNITS = [12, 60, 300]
+
+
+def time_frames(battlefield: Battlefield, screen: pygame.Surface, player, enemy, frames: int) -> float:
+    """Average seconds per frame of drawing every unit."""
+    start = time.perf_counter()
+    for _ in range(frames):
+        battlefield.render_units(screen, player.units, enemy.units)
+    return (time.perf_counter() - start) / frames
+
+
+def time_full_frames(screen: pygame.Surface, battlefield: Battlefield, ui: UI,
+                     player, enemy, frames: int) -> float:
+    """Average seconds per frame of Game.render's full repaint."""
+    start = time.perf_counter()
+    for _ in range(frames):
+        move(player, enemy)
+        screen.fill(BLACK)
+        battlefield.render(screen)
+        battlefield.render_units(screen, player.units, enemy.units)
+        ui.render_header(screen, enemy.mana)
+        ui.render_footer(screen, player.mana, None)
+        pygame.display.flip()
+    return (time.perf_counter() - start) / frames
+
+
+def time_dirty_frames(renderer: DirtyRectRenderer, player, enemy, frames: int) -> float:
+    """Average seconds per frame of the DirtyRectRenderer."""
+    start = time.perf_counter()
+    for _ in range(frames):
+        move(player, enemy)
+        renderer.render(player, enemy, False, False)
+    return (time.perf_counter() - start) / frames
+
+
+def move(player, enemy):
+    """Walk both armies a frame's worth forward."""
+    for unit in player.units:
+        unit.y -= 1
+    for unit in enemy.units:
+        unit.y += 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--frames", type=int, default=20)
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    sprites = SpriteAtlas()
+
+    print(f"{'units':>6} {'draw ms/frame':>14} {'atlas ms/frame':>15} {'speedup':>8}")
+    for total in TOTAL_UNITS:
+        player, enemy = build_armies(total // (2 * NUM_LANES))
+        drawn = time_frames(Battlefield(), screen, player, enemy, args.frames)
+        blitted = time_frames(Battlefield(sprites), screen, player, enemy, args.frames)
+        print(f"{total:>6} {drawn * 1000:>14.2f} {blitted * 1000:>15.2f} {drawn / blitted:>7.1f}x")
+
+    ui = UI(sprites)
+    ui.init_fonts()
+    battlefield = Battlefield(sprites)
+    print()
+    print(f"{'units':>6} {'full ms/frame':>14} {'dirty ms/frame':>15} {'speedup':>8}")
+    for total in FRAME_UNITS:
+        player, enemy = build_armies(total // (2 * NUM_LANES))
+        full = time_full_frames(screen, battlefield, ui, player, enemy, args.frames)
+        player, enemy = build_armies(total // (2 * NUM_LANES))
+        renderer = DirtyRectRenderer(screen, battlefield, ui)
+        dirty = time_dirty_frames(renderer, player, enemy, args.frames)
+        print(f"{total:>6} {full * 1000:>14.2f} {dirty * 1000:>15.2f} {full / dirty:>7.1f}x")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Load test of the lockstep match server: the server runs in a child process
+while this one connects relay-only bots (they spawn, but don't simulate),
+two per match, and reports the server's CPU use and how late its turns ran.
+On a machine with few cores the bots compete with the server for the CPU,
+which shows up as turn lag rather than as server CPU.
+
+Usage: python -m benchmarks.bench_server [--matches N] [--seconds S]
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import time
+
+from src.client import play_bot
+from src.server import MatchServer
+
+
+async def measure(port: int, warmup: float, seconds: float, results):
+    server = MatchServer(seed=0)
+    await server.start("127.0.0.1", port)
+    results.put("listening")
+    await asyncio.sleep(warmup)
+    scheduler = server.scheduler
+    turn, lag = scheduler.turn, scheduler.total_lag
+    scheduler.max_lag = 0.0
+    cpu, wall = time.process_time(), time.perf_counter()
+    await asyncio.sleep(seconds)
+    cpu, wall = time.process_time() - cpu, time.perf_counter() - wall
+    turns = scheduler.turn - turn
+    results.put((len(server.matches), cpu / wall, turns, (scheduler.total_lag - lag) / max(turns, 1),
+                 scheduler.max_lag))
+    await server.close()
+
+
+def serve(port: int, warmup: float, seconds: float, results):
+    asyncio.run(measure(port, warmup, seconds, results))
+
+
+async def run_bots(port: int, matches: int, spawn_chance: float):
+    bots = [asyncio.ensure_future(play_bot("127.0.0.1", port, seed=i, spawn_chance=spawn_chance,
+                                           simulate=False))
+            for i in range(2 * matches)]
+    await asyncio.gather(*bots, return_exceptions=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--matches", type=int, default=1000)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--warmup", type=float, default=3.0, help="seconds for the bots to connect")
+    parser.add_argument("--spawn-chance", type=float, default=0.05,
+                        help="chance a bot spawns on each frame it receives")
+    parser.add_argument("--port", type=int, default=7788)
+    args = parser.parse_args()
+
+    results = multiprocessing.Queue()
+    server = multiprocessing.Process(target=serve, args=(args.port, args.warmup, args.seconds, results))
+    server.start()
+    results.get()
+    asyncio.run(run_bots(args.port, args.matches, args.spawn_chance))
+    matches, cpu, turns, mean_lag, max_lag = results.get()
+    server.join()
+
+    print(f"{matches} matches over {turns} turns: server cpu {100 * cpu:.0f}% "
+          f"({100 * cpu / max(matches, 1) * 1000:.0f}% per 1000 matches), "
+          f"turn lag mean {mean_lag * 1000:.2f}ms, worst {max_lag * 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
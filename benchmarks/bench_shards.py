@@ -0,0 +1,62 @@
+"""
+Tick cost of lane-sharded simulation (src.shards) vs. the serial update,
+checking every backend ends in the same state. Process shards only pay off
+with big armies and as many free cores as shards.
+
+Usage: python -m benchmarks.bench_shards [--ticks N] [--shards N]
+"""
+
+import argparse
+import os
+import time
+
+from src.constants import FPS, NUM_LANES
+from src.shards import ShardedUnits, INLINE, THREAD, PROCESS
+from benchmarks.bench_targeting import build_armies
+
+TOTAL_UNITS = [600, 6000, 30000]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--ticks", type=int, default=20)
+    parser.add_argument("--shards", type=int, default=NUM_LANES)
+    args = parser.parse_args()
+    dt = 1.0 / FPS
+
+    print(f"{os.cpu_count()} cores, {args.shards} shards")
+    print(f"{'units':>7} {'serial ms/tick':>15} " + " ".join(f"{b + ' ms/tick':>16}" for b in (INLINE, THREAD, PROCESS))
+          + "  match")
+    for total in TOTAL_UNITS:
+        player, enemy = build_armies(total // (2 * NUM_LANES))
+        stores = []
+        for backend in (INLINE, THREAD, PROCESS):
+            store = ShardedUnits(args.shards, backend)
+            store.place(sorted(player.units + enemy.units, key=lambda u: u.seq))
+            stores.append(store)
+
+        start = time.perf_counter()
+        for _ in range(args.ticks):
+            player.update(dt, enemy)
+            enemy.update(dt, player)
+        serial = (time.perf_counter() - start) / args.ticks
+        expected = sorted(((u.is_player, u.seq, u.lane, u.y, u.hp) for u in player.units + enemy.units),
+                          key=lambda state: state[1])
+
+        timings = []
+        match = True
+        for store in stores:
+            start = time.perf_counter()
+            for _ in range(args.ticks):
+                store.update_side(True, dt)
+                store.update_side(False, dt)
+            timings.append((time.perf_counter() - start) / args.ticks)
+            match &= store.units() == expected
+            store.close()
+
+        print(f"{total:>7} {serial * 1000:>15.2f} " + " ".join(f"{t * 1000:>16.2f}" for t in timings)
+              + f"  {'yes' if match else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
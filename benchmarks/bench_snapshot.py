@@ -0,0 +1,46 @@
+"""
+Latency of Simulation.snapshot() and restore() vs. deepcopy of the match.
+
+Usage: python -m benchmarks.bench_snapshot [--repeats N]
+"""
+
+import argparse
+import copy
+import time
+
+from src.constants import NUM_LANES
+from src.simulation import Simulation
+from benchmarks.bench_targeting import build_armies
+
+LIVE_UNITS = [50, 500, 5000]
+
+
+def time_call(fn, repeats: int) -> float:
+    """Average seconds per call."""
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'units':>6} {'snapshot us':>12} {'restore us':>11} {'deepcopy us':>12} {'speedup':>8}")
+    for total in LIVE_UNITS:
+        player, enemy = build_armies(max(1, round(total / (2 * NUM_LANES))))
+        simulation = Simulation(player=player, enemy=enemy)
+        snapshot = simulation.snapshot()
+
+        taken = time_call(simulation.snapshot, args.repeats)
+        restored = time_call(lambda: simulation.restore(snapshot), args.repeats)
+        copied = time_call(lambda: copy.deepcopy(simulation), max(1, args.repeats // 20))
+        units = len(player.units) + len(enemy.units)
+        print(f"{units:>6} {taken * 1e6:>12.1f} {restored * 1e6:>11.1f} {copied * 1e6:>12.1f} "
+              f"{copied / (taken + restored):>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
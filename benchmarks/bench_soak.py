@@ -0,0 +1,56 @@
+"""
+Allocation during a long AI-vs-AI soak: spawns vs. Unit objects allocated,
+traced memory and garbage collections per window of back-to-back matches.
+
+Usage: python -m benchmarks.bench_soak [--matches N] [--window N]
+"""
+
+import argparse
+import gc
+import tracemalloc
+
+from src.ai import AI, AIParams
+from src.simulation import Simulation
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--matches", type=int, default=200)
+    parser.add_argument("--window", type=int, default=20)
+    parser.add_argument("--decision-interval", type=float, default=0.5,
+                        help="AI decision interval; shorter means bigger armies and more churn")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    params = AIParams(decision_interval=args.decision_interval)
+    print(f"{'matches':>7} {'ticks':>7} {'spawns':>7} {'unit objs':>10} {'traced KB':>10} "
+          f"{'gc gen0':>8} {'gc gen1+':>9}")
+    tracemalloc.start()
+    gc.collect()
+    for window_start in range(0, args.matches, args.window):
+        before = [stats["collections"] for stats in gc.get_stats()]
+        ticks = spawns = objects = 0
+        for index in range(window_start, window_start + args.window):
+            simulation = Simulation(player=AI(True, params), enemy=AI(False, params),
+                                    seed=args.seed + index)
+            sides = (simulation.player, simulation.enemy)
+            counted = [0]
+            for side in sides:
+                side.spawn_listener = lambda unit_name, lane: counted.__setitem__(0, counted[0] + 1)
+            simulation.run()
+            ticks += simulation.ticks
+            spawns += counted[0]
+            # Every Unit a side allocated is either still alive or waiting in its pool
+            objects += sum(len(side.units) + len(side.pool) for side in sides)
+        after = [stats["collections"] for stats in gc.get_stats()]
+
+        # Finished matches may linger in reference cycles until the next collection
+        gc.collect()
+        traced, _ = tracemalloc.get_traced_memory()
+        print(f"{window_start + args.window:>7} {ticks:>7} {spawns:>7} {objects:>10} {traced // 1024:>10} "
+              f"{after[0] - before[0]:>8} {sum(after[1:]) - sum(before[1:]):>9}")
+    tracemalloc.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Startup cost in fresh processes: how long importing each headless module
+takes (and that none of them pulls in pygame), and the game's time to its
+first frame on a dummy display, against the budgets in src/constants.py.
+
+Usage: python -m benchmarks.bench_startup [--runs N]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+from src.constants import STARTUP_BUDGET, HEADLESS_IMPORT_BUDGET
+
+HEADLESS_MODULES = ["src.constants", "src.simulation", "src.replay", "src.fast_forward",
+                    "src.tournament", "src.server", "src.client"]
+# The budget applies to the simulation; the others are shown for comparison
+BUDGETED_MODULE = "src.simulation"
+
+IMPORT_TIME = """
+import sys, time
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start, 'pygame' in sys.modules)
+"""
+GAME_STARTUP = """
+from src.startup import StartupTimer
+startup = StartupTimer()
+from src.game import Game
+startup.mark("imports")
+game = Game(startup=startup)
+game.update(0.0)
+game.render()
+startup.mark("first frame")
+print(startup.total)
+"""
+
+
+def run(code: str, env: dict | None = None) -> tuple[float, subprocess.CompletedProcess]:
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env)
+    return time.perf_counter() - start, result
+
+
+def import_time(module: str, runs: int) -> tuple[float, bool]:
+    """Fastest import of module in runs fresh processes, and whether it loaded pygame."""
+    outputs = [run(IMPORT_TIME.format(module=module))[1].stdout.split() for _ in range(runs)]
+    return min(float(seconds) for seconds, _ in outputs), any(pygame == "True" for _, pygame in outputs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    bare = min(run("pass")[0] for _ in range(args.runs))
+    print(f"bare interpreter: {bare * 1000:.0f}ms")
+    print(f"{'module':<18} {'import':>8}  pygame")
+    for module in HEADLESS_MODULES:
+        seconds, pygame = import_time(module, args.runs)
+        verdict = ""
+        if module == BUDGETED_MODULE:
+            over = seconds > HEADLESS_IMPORT_BUDGET
+            verdict = f"  (budget {HEADLESS_IMPORT_BUDGET * 1000:.0f}ms: {'OVER' if over else 'ok'})"
+        print(f"{module:<18} {seconds * 1000:6.1f}ms  {'YES' if pygame else 'no'}{verdict}")
+
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", PYGAME_HIDE_SUPPORT_PROMPT="1")
+    totals = []
+    for _ in range(args.runs):
+        _, result = run(GAME_STARTUP, env)
+        if result.returncode != 0:
+            print(f"game startup failed:\n{result.stderr}")
+            return
+        totals.append(float(result.stdout.split()[-1]))
+    best = min(totals)
+    print(f"game to first frame: {best * 1000:.0f}ms "
+          f"(budget {STARTUP_BUDGET * 1000:.0f}ms: {'OVER' if best > STARTUP_BUDGET else 'ok'})")
+
+
+if __name__ == "__main__":
+    main()
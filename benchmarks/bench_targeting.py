@@ -0,0 +1,153 @@
+"""
+Tick cost of target acquisition: per-lane sorted index vs. linear scan, and
+in a siege, units keeping their target (Unit.find_target) vs. searching
+for it every tick.
+
+Usage: python -m benchmarks.bench_targeting [--max-linear N]
+"""
+
+import argparse
+import random
+import time
+
+from src.constants import NUM_LANES, PLAYER_BASE_Y, ENEMY_BASE_Y, FPS, UNIT_TYPES
+from src.lane_index import LaneIndex
+from src.player import Player
+from src.unit import Unit, UnitType
+
+UNITS_PER_LANE = [10, 100, 1000, 10000]
+SIEGE_UNITS_PER_LANE = [10, 100, 1000]
+
+
+class LinearTargets:
+    """Stand-in for LaneIndex that scans every enemy, as find_target used to."""
+
+    def __init__(self, player: Player):
+        self.player = player
+
+    def refresh(self):
+        pass
+
+    def nearest(self, lane: int, y: float, max_range: float) -> Unit | None:
+        nearest_enemy = None
+        nearest_distance = float('inf')
+        for enemy in self.player.units:
+            if not enemy.is_alive or enemy.lane != lane:
+                continue
+            distance = abs(y - enemy.y)
+            if distance <= max_range and distance < nearest_distance:
+                nearest_distance = distance
+                nearest_enemy = enemy
+        return nearest_enemy
+
+    def unchanged_within(self, lane: int, version: int, low: float, high: float) -> bool:
+        return False
+
+    @property
+    def versions(self) -> list[int]:
+        return [0] * NUM_LANES
+
+
+class SearchCounter(LaneIndex):
+    """LaneIndex counting target searches, optionally without ever letting a unit keep its target."""
+
+    def __init__(self, sticky: bool = True):
+        super().__init__()
+        self.sticky = sticky
+        self.searches = 0
+
+    def unchanged_within(self, lane: int, version: int, low: float, high: float) -> bool:
+        return self.sticky and super().unchanged_within(lane, version, low, high)
+
+    def nearest(self, lane: int, y: float, max_range: float) -> Unit | None:
+        self.searches += 1
+        return super().nearest(lane, y, max_range)
+
+
+def build_armies(units_per_lane: int, seed: int = 0) -> tuple[Player, Player]:
+    """Two armies spread over their own half of every lane, meeting in the middle."""
+    rng = random.Random(seed)
+    names = list(UNIT_TYPES.keys())
+    middle = (PLAYER_BASE_Y + ENEMY_BASE_Y) / 2
+    player = Player(is_human=True)
+    enemy = Player(is_human=False)
+    for side, low, high in ((player, middle, PLAYER_BASE_Y), (enemy, ENEMY_BASE_Y, middle)):
+        for lane in range(NUM_LANES):
+            for _ in range(units_per_lane):
+                unit = Unit(UnitType.from_name(rng.choice(names)), lane, side.is_player_side)
+                unit.y = rng.uniform(low, high)
+                unit.lane_stats = side.lane_stats
+                side.lane_stats.add(lane, unit.hp)
+                side.units.append(unit)
+                side.lane_index.insert(unit)
+    return player, enemy
+
+
+def build_siege(units_per_lane: int, sticky: bool, seed: int = 0) -> tuple[Player, Player]:
+    """Two walls of tanks in every lane, each tank in range of the enemy front."""
+    rng = random.Random(seed)
+    middle = (PLAYER_BASE_Y + ENEMY_BASE_Y) / 2
+    player = Player(is_human=True)
+    enemy = Player(is_human=False)
+    for side, direction in ((player, 1), (enemy, -1)):
+        side.lane_index = SearchCounter(sticky)
+        for lane in range(NUM_LANES):
+            for _ in range(units_per_lane):
+                unit = side.add_unit(UnitType.from_name("tank"), lane)
+                unit.y = middle + direction * rng.uniform(5, 15)
+                unit.attack_cooldown = rng.uniform(0, unit.unit_type.attack_cooldown)
+        side.lane_index.refresh()
+    return player, enemy
+
+
+def time_ticks(player: Player, enemy: Player, ticks: int) -> float:
+    """Average seconds per tick of both sides' updates."""
+    dt = 1.0 / FPS
+    start = time.perf_counter()
+    for _ in range(ticks):
+        player.update(dt, enemy)
+        enemy.update(dt, player)
+    return (time.perf_counter() - start) / ticks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--max-linear", type=int, default=1000,
+                        help="largest units-per-lane size to run the linear scan on")
+    parser.add_argument("--ticks", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'units/lane':>10} {'indexed ms/tick':>16} {'linear ms/tick':>15} {'speedup':>8}")
+    for units_per_lane in UNITS_PER_LANE:
+        player, enemy = build_armies(units_per_lane)
+        indexed = time_ticks(player, enemy, args.ticks)
+
+        if units_per_lane <= args.max_linear:
+            player, enemy = build_armies(units_per_lane)
+            player.lane_index, enemy.lane_index = LinearTargets(player), LinearTargets(enemy)
+            linear = time_ticks(player, enemy, max(1, args.ticks // 5))
+            print(f"{units_per_lane:>10} {indexed * 1000:>16.3f} {linear * 1000:>15.3f} "
+                  f"{linear / indexed:>7.1f}x")
+        else:
+            print(f"{units_per_lane:>10} {indexed * 1000:>16.3f} {'-':>15} {'-':>8}")
+
+    print()
+    print(f"{'siege units/lane':>16} {'sticky ms/tick':>15} {'searching ms/tick':>18} "
+          f"{'searches/unit/tick':>19} {'same':>5}")
+    for units_per_lane in SIEGE_UNITS_PER_LANE:
+        runs = []
+        for sticky in (True, False):
+            player, enemy = build_siege(units_per_lane, sticky)
+            player.lane_index.searches = enemy.lane_index.searches = 0
+            seconds = time_ticks(player, enemy, args.ticks * 10)
+            updates = units_per_lane * NUM_LANES * 2 * args.ticks * 10
+            searches = player.lane_index.searches + enemy.lane_index.searches
+            state = [(u.y, u.hp) for u in player.units + enemy.units]
+            runs.append((seconds, searches / updates, state))
+        (sticky_seconds, sticky_rate, sticky_state), (search_seconds, _, search_state) = runs
+        print(f"{units_per_lane:>16} {sticky_seconds * 1000:>15.3f} {search_seconds * 1000:>18.3f} "
+              f"{sticky_rate:>19.3f} {'yes' if sticky_state == search_state else 'NO':>5}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Deterministic scenario generators for the benchmark suite. Each returns a
+fresh Simulation; the same arguments always give the same state.
+"""
+
+import random
+
+from src.constants import NUM_LANES, UNIT_TYPES, PLAYER_BASE_Y, ENEMY_BASE_Y
+from src.player import Player
+from src.ai import AI
+from src.simulation import Simulation
+from src.unit import Unit
+
+
+def place(player: Player, unit_name: str, lane: int, y: float) -> Unit:
+    """Spawn a unit for free and move it to y. Call refresh_lanes() when done placing."""
+    player.mana = UNIT_TYPES[unit_name]["cost"]
+    unit = player.spawn_unit(unit_name, lane)
+    unit.y = y
+    return unit
+
+
+def refresh_lanes(simulation: Simulation):
+    """Restore the lane indexes' y order after placing units."""
+    simulation.player.lane_index.refresh()
+    simulation.enemy.lane_index.refresh()
+
+
+def head_on(units_per_lane: int, seed: int = 0) -> Simulation:
+    """N random units per lane and side, packed just short of the middle, about to meet."""
+    rng = random.Random(seed)
+    names = list(UNIT_TYPES.keys())
+    simulation = Simulation(player=AI(is_player_side=True), enemy=AI(), seed=seed)
+    middle = (PLAYER_BASE_Y + ENEMY_BASE_Y) / 2
+    for lane in range(NUM_LANES):
+        for i in range(units_per_lane):
+            depth = 40 + (i % 20) * 10
+            place(simulation.player, rng.choice(names), lane, middle + depth)
+            place(simulation.enemy, rng.choice(names), lane, middle - depth)
+    refresh_lanes(simulation)
+    return simulation
+
+
+def giant_vs_swarm(archers: int, seed: int = 0) -> Simulation:
+    """One player giant in the middle lane against a swarm of enemy archers."""
+    rng = random.Random(seed)
+    simulation = Simulation(player=AI(is_player_side=True), enemy=AI(), seed=seed)
+    middle = (PLAYER_BASE_Y + ENEMY_BASE_Y) / 2
+    place(simulation.player, "giant", 1, middle + 60)
+    for _ in range(archers):
+        place(simulation.enemy, "archer", 1, middle - rng.uniform(0, 120))
+    refresh_lanes(simulation)
+    return simulation
+
+
+def ai_vs_ai(seed: int = 0) -> Simulation:
+    """Two heuristic AIs from the usual starting state."""
+    return Simulation(player_ai=True, seed=seed)
+
+
+SCENARIOS = {
+    "head_on_10": lambda: head_on(10),
+    "head_on_100": lambda: head_on(100),
+    "head_on_1000": lambda: head_on(1000),
+    "giant_vs_200_archers": lambda: giant_vs_swarm(200),
+}
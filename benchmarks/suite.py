@@ -0,0 +1,233 @@
+"""
+Benchmark suite: times Unit.update, Player.update, AI.make_decision, headless
+rendering and whole AI-vs-AI matches on generated scenarios, writes the
+results as JSON and compares them against a stored baseline.
+
+Usage:
+    python -m benchmarks.suite [--output results.json] [--baseline benchmarks/baseline.json]
+                               [--threshold 0.15] [--update-baseline] [--quick]
+
+Exits with status 1 when any result is worse than the baseline by more
+than the threshold. Baselines are machine specific: regenerate them with
+--update-baseline on the machine that runs the comparison.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+from src.constants import FPS, MAX_MANA
+from src.player import Player
+from benchmarks.scenarios import SCENARIOS, ai_vs_ai
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+DT = 1.0 / FPS
+
+
+def best_time(fn, repeats: int) -> float:
+    """Best seconds of fn() over several runs, after one warm-up run (least noisy)."""
+    fn()
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def bench_unit_update(make_simulation, ticks: int, repeats: int) -> float:
+    """Microseconds per Unit.update call."""
+    simulation = make_simulation()
+    snapshot = simulation.snapshot()
+    calls = 0
+
+    def run():
+        nonlocal calls
+        simulation.restore(snapshot)
+        calls = 0
+        elapsed = 0.0
+        for _ in range(ticks):
+            for side, other in ((simulation.player, simulation.enemy), (simulation.enemy, simulation.player)):
+                units = side.units
+                enemy_index = other.lane_index
+                start = time.perf_counter()
+                for unit in units:
+                    unit.update(DT, enemy_index)
+                elapsed += time.perf_counter() - start
+                calls += len(units)
+                side.units = [u for u in units if u.is_alive]
+                side.lane_index.refresh()
+        return elapsed
+
+    run()
+    elapsed = min(run() for _ in range(repeats))
+    return elapsed / max(1, calls) * 1e6
+
+
+def bench_player_update(make_simulation, ticks: int, repeats: int) -> float:
+    """Milliseconds per tick of both sides' Player.update."""
+    simulation = make_simulation()
+    snapshot = simulation.snapshot()
+    player, enemy = simulation.player, simulation.enemy
+
+    def run():
+        simulation.restore(snapshot)
+        for _ in range(ticks):
+            # The base class update, so AI decisions aren't included
+            Player.update(player, DT, enemy)
+            Player.update(enemy, DT, player)
+
+    return best_time(run, repeats) / ticks * 1000
+
+
+def bench_ai_decision(make_simulation, calls: int, repeats: int) -> float:
+    """Microseconds per AI.make_decision, with full mana so it always spawns."""
+    simulation = make_simulation()
+    snapshot = simulation.snapshot()
+    ai, opponent = simulation.enemy, simulation.player
+
+    def run():
+        elapsed = 0.0
+        for _ in range(calls):
+            simulation.restore(snapshot)
+            ai.mana = MAX_MANA
+            start = time.perf_counter()
+            ai.make_decision(opponent)
+            elapsed += time.perf_counter() - start
+        return elapsed
+
+    run()
+    return min(run() for _ in range(repeats)) / calls * 1e6
+
+
+def bench_render(make_simulation, frames: int, repeats: int) -> float | None:
+    """Milliseconds per full Game.render frame on a dummy display, None without pygame."""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    try:
+        import pygame
+        from src.game import Game
+    except ImportError:
+        return None
+    game = Game()
+    game.simulation = make_simulation()
+
+    def run():
+        for _ in range(frames):
+            game.render()
+
+    result = best_time(run, repeats) / frames * 1000
+    pygame.quit()
+    return result
+
+
+def bench_ai_vs_ai(game_seconds: float) -> float:
+    """Simulated game seconds per wall second, playing seeded matches back to back."""
+    played = 0.0
+    seed = 0
+    start = time.perf_counter()
+    while played < game_seconds:
+        simulation = ai_vs_ai(seed)
+        simulation.run(max_time=game_seconds - played)
+        played += simulation.time
+        seed += 1
+    return played / (time.perf_counter() - start)
+
+
+def run_suite(quick: bool = False) -> dict:
+    """Run every benchmark; return {name: {"value", "unit", "higher_is_better"}}."""
+    repeats = 3 if quick else 7
+    scale = 0.25 if quick else 1.0
+    results = {}
+
+    def add(name: str, value: float | None, unit: str, higher_is_better: bool = False):
+        if value is None:
+            return
+        results[name] = {"value": value, "unit": unit, "higher_is_better": higher_is_better}
+        print(f"{name:<42} {value:>12.3f} {unit}", file=sys.stderr)
+
+    for name, make_simulation in SCENARIOS.items():
+        ticks = 5 if "1000" in name else 30
+        add(f"unit_update/{name}", bench_unit_update(make_simulation, ticks, repeats), "us/call")
+        add(f"player_update/{name}", bench_player_update(make_simulation, ticks, repeats), "ms/tick")
+        add(f"ai_decision/{name}", bench_ai_decision(make_simulation, max(1, int(200 * scale)), repeats),
+            "us/call")
+    for name in ("head_on_10", "head_on_100"):
+        add(f"render/{name}", bench_render(SCENARIOS[name], max(1, int(60 * scale)), repeats), "ms/frame")
+    add("ai_vs_ai/10_minutes", bench_ai_vs_ai(600.0 * scale), "game s/s", higher_is_better=True)
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Names of results worse than the baseline by more than threshold (a fraction)."""
+    regressions = []
+    print(f"\n{'benchmark':<42} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<42} {'-':>12} {result['value']:>12.3f} {'new':>8}")
+            continue
+        change = result["value"] / base["value"] - 1.0
+        worse = -change if result["higher_is_better"] else change
+        flag = "  REGRESSION" if worse > threshold else ""
+        print(f"{name:<42} {base['value']:>12.3f} {result['value']:>12.3f} {change:>+7.1%}{flag}")
+        if worse > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="allowed slowdown vs. the baseline, as a fraction")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="store these results as the new baseline")
+    parser.add_argument("--quick", action="store_true", help="fewer repeats and shorter runs")
+    parser.add_argument("--rounds", type=int, default=3,
+                        help="run the whole suite this many times and keep each benchmark's best, "
+                             "so a noisy spell on the machine doesn't skew one benchmark")
+    args = parser.parse_args()
+
+    results = run_suite(args.quick)
+    for _ in range(args.rounds - 1):
+        for name, result in run_suite(args.quick).items():
+            best = max if result["higher_is_better"] else min
+            results[name]["value"] = best(results[name]["value"], result["value"])
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "quick": args.quick,
+            "rounds": args.rounds,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; create one with --update-baseline")
+        return
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline["meta"].get("quick") != args.quick:
+        print("Note: baseline and current run differ in --quick; run lengths aren't comparable")
+    regressions = compare(report["results"], baseline["results"], args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
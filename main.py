@@ -7,13 +7,60 @@ Controls:
 - Click a lane on the battlefield to deploy the selected unit
 - ESC to quit
 - SPACE to restart after game over
+
+Options:
+- --seed N       deterministic game: seeded AI
+- --record FILE  save each match's spawn actions: the first to FILE, restarts to FILE-2, -3... (see src/replay.py)
+- --opponent search  play against the Monte Carlo lookahead AI
+- --dirty-rects  only repaint changed screen areas (for slow displays)
+- --profile FILE  show the frame profiler (F3 toggles it) and export it to FILE
+- --tick-rate N  simulation ticks per second (e.g. 30 on weak hardware)
+- --fps N        render frame rate cap (e.g. 144); units are interpolated between ticks
+- --sim-thread   step the simulation on its own thread
+- --startup-timing  print how long each startup phase took, against STARTUP_BUDGET
+- --params FILE  play with the AI parameters and unit stats in FILE (see src/tuner.py)
 """
 
-from src.game import Game
+import argparse
+import os
+
+from src.constants import FPS, TICK_RATE, PARAMS_FILE_ENV
+from src.startup import StartupTimer
 
 
 def main():
-    game = Game()
+    startup = StartupTimer()
+    parser = argparse.ArgumentParser(description="Forever War")
+    parser.add_argument("--seed", type=int, help="play a deterministic, reproducible game")
+    parser.add_argument("--record", metavar="FILE", help="record the match to a replay file")
+    parser.add_argument("--opponent", choices=["heuristic", "search"], default="heuristic",
+                        help="enemy AI")
+    parser.add_argument("--dirty-rects", action="store_true",
+                        help="only repaint the parts of the screen that changed")
+    parser.add_argument("--profile", metavar="FILE",
+                        help="start with the frame profiler on, exporting its timings to FILE")
+    parser.add_argument("--tick-rate", type=int, default=TICK_RATE,
+                        help="simulation ticks per second")
+    parser.add_argument("--fps", type=int, default=FPS, help="render frame rate cap")
+    parser.add_argument("--sim-thread", action="store_true",
+                        help="run the simulation on its own thread")
+    parser.add_argument("--startup-timing", action="store_true",
+                        help="print how long startup took, up to the first frame")
+    parser.add_argument("--params", metavar="FILE",
+                        help="AI parameters and unit stats to play with, as written by src.tuner")
+    args = parser.parse_args()
+    if args.params:
+        # Read when the unit types and AI are imported, below
+        os.environ[PARAMS_FILE_ENV] = args.params
+
+    # Imported here so --help and argument errors don't wait for pygame
+    from src.game import Game
+    startup.mark("imports")
+
+    game = Game(seed=args.seed, record_path=args.record, opponent=args.opponent,
+                dirty_rects=args.dirty_rects, profile_path=args.profile,
+                tick_rate=args.tick_rate, fps=args.fps, sim_thread=args.sim_thread,
+                startup=startup if args.startup_timing else None)
     game.run()
 
 
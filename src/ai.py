@@ -1,56 +1,86 @@
 import random
+from dataclasses import dataclass
 from src.player import Player
-from src.unit import Unit
+from src.fast_forward import ticks_until
+from src.unit_types import UNIT_TABLE
+from src.params import tuned_params
 from src.constants import (
     AI_DECISION_INTERVAL, AI_DEFEND_THRESHOLD,
     AI_REINFORCE_THRESHOLD, AI_REINFORCE_CHANCE,
-    UNIT_TYPES, PLAYER_BASE_Y, ENEMY_BASE_Y
+    PLAYER_BASE_Y, ENEMY_BASE_Y, NUM_LANES
 )
 
 
+# Values from the parameters file, if any, replace the constants as defaults
+_tuned = tuned_params()["ai"]
+
+
+@dataclass(frozen=True)
+class AIParams:
+    decision_interval: float = _tuned.get("decision_interval", AI_DECISION_INTERVAL)
+    defend_threshold: float = _tuned.get("defend_threshold", AI_DEFEND_THRESHOLD)
+    reinforce_threshold: float = _tuned.get("reinforce_threshold", AI_REINFORCE_THRESHOLD)
+    reinforce_chance: float = _tuned.get("reinforce_chance", AI_REINFORCE_CHANCE)
+
+
 class AI(Player):
-    def __init__(self):
-        super().__init__(is_human=False)
+    def __init__(self, is_player_side: bool = False, params: AIParams | None = None,
+                 rng: random.Random | None = None):
+        super().__init__(is_human=False, is_player_side=is_player_side)
+        self.params = params or AIParams()
+        self.rng = rng or random.Random()
         self.decision_timer = 0.0
-        self.unit_names = list(UNIT_TYPES.keys())
+        self.unit_names = UNIT_TABLE.names
 
-    def update(self, dt: float, enemy_units: list[Unit]):
-        """Update AI state and make decisions."""
-        # Call parent update
-        super().update(dt, enemy_units)
-
-        # Decision making
+    def act(self, dt: float, opponent: Player):
+        """Make decisions."""
         self.decision_timer += dt
-        if self.decision_timer >= AI_DECISION_INTERVAL:
+        if self.decision_timer >= self.params.decision_interval:
             self.decision_timer = 0.0
-            self.make_decision(enemy_units)
+            self.make_decision(opponent)
+
+    def idle_ticks(self, dt: float) -> int | None:
+        # The decision happens on the tick the timer reaches the interval
+        return ticks_until(self.decision_timer, self.params.decision_interval, dt) - 1
+
+    def coast(self, ticks: int, dt: float, opponent: Player):
+        super().coast(ticks, dt, opponent)
+        for _ in range(ticks):
+            self.decision_timer += dt
+
+    def snapshot(self) -> tuple:
+        return super().snapshot() + (self.decision_timer, self.rng.getstate())
 
-    def calculate_lane_threat(self, lane: int, enemy_units: list[Unit]) -> float:
+    def restore(self, state: tuple):
+        super().restore(state[:-2])
+        self.decision_timer, rng_state = state[-2:]
+        self.rng.setstate(rng_state)
+
+    def distance_from_base(self, y: float) -> float:
+        """Distance of a y coordinate from our own base."""
+        if self.is_player_side:
+            return PLAYER_BASE_Y - y
+        return y - ENEMY_BASE_Y
+
+    def calculate_lane_threat(self, lane: int, opponent: Player) -> float:
         """
         Calculate threat level for a lane (0.0 to 1.0).
-        Higher threat means enemy (player) is closer to our base (top).
+        Higher threat means the opponent is closer to our base.
         """
-        lane_enemies = [u for u in enemy_units if u.lane == lane and u.is_alive]
-        lane_allies = self.get_units_in_lane(lane)
+        enemy_count, enemy_power, enemy_front = opponent.lane_summary(lane)
+        _, ally_power, _ = self.lane_summary(lane)
 
-        if not lane_enemies:
+        if not enemy_count:
             return 0.0
 
-        # Find the closest enemy to our base (top)
-        # Player units move up (decreasing y), so smaller y = closer to AI base
-        closest_enemy_y = min(e.y for e in lane_enemies)
-
-        # Distance from AI base (top) - smaller distance = higher threat
-        distance_to_base = closest_enemy_y - ENEMY_BASE_Y
+        # Distance of the closest enemy to our base - smaller distance = higher threat
+        distance_to_base = self.distance_from_base(enemy_front)
         max_distance = PLAYER_BASE_Y - ENEMY_BASE_Y
 
         # Normalize: closer to our base = higher threat
         position_threat = 1.0 - (distance_to_base / max_distance)
 
         # Factor in enemy count vs ally count
-        enemy_power = sum(e.hp for e in lane_enemies)
-        ally_power = sum(a.hp for a in lane_allies) if lane_allies else 0
-
         if ally_power == 0:
             power_ratio = 1.0
         else:
@@ -59,30 +89,23 @@ class AI(Player):
         # Combined threat
         return (position_threat * 0.6 + power_ratio * 0.4)
 
-    def calculate_lane_advantage(self, lane: int, enemy_units: list[Unit]) -> float:
+    def calculate_lane_advantage(self, lane: int, opponent: Player) -> float:
         """
         Calculate our advantage in a lane (0.0 to 1.0).
-        Higher value means we're winning that lane (pushing toward player base).
+        Higher value means we're winning that lane (pushing toward the opponent's base).
         """
-        lane_enemies = [u for u in enemy_units if u.lane == lane and u.is_alive]
-        lane_allies = self.get_units_in_lane(lane)
+        ally_count, ally_power, ally_front = self.lane_summary(lane)
+        _, enemy_power, _ = opponent.lane_summary(lane)
 
-        if not lane_allies:
+        if not ally_count:
             return 0.0
 
-        # Find our furthest unit toward player base (bottom)
-        # AI units move down (increasing y), so larger y = closer to player base
-        furthest_ally_y = max(a.y for a in lane_allies)
-
-        # Calculate how far we've pushed
+        # Calculate how far our furthest unit has pushed from our base
         max_distance = PLAYER_BASE_Y - ENEMY_BASE_Y
-        distance_pushed = furthest_ally_y - ENEMY_BASE_Y
+        distance_pushed = self.distance_from_base(ally_front)
         position_advantage = distance_pushed / max_distance
 
         # Factor in power ratio
-        ally_power = sum(a.hp for a in lane_allies)
-        enemy_power = sum(e.hp for e in lane_enemies) if lane_enemies else 0
-
         if enemy_power == 0:
             power_ratio = 1.0
         else:
@@ -91,43 +114,47 @@ class AI(Player):
         return (position_advantage * 0.4 + power_ratio * 0.6)
 
     def get_affordable_units(self) -> list[str]:
-        """Get list of unit names we can afford."""
-        return [name for name in self.unit_names if self.can_afford(name)]
+        """Get list of unit names we can afford (shared, so not to be modified)."""
+        return UNIT_TABLE.affordable_names(self.mana)
 
-    def make_decision(self, enemy_units: list[Unit]):
-        """Make a strategic decision about what to spawn."""
+    def make_decision(self, opponent: Player):
+        """
+        Make a strategic decision about what to spawn. Lane evaluation reads
+        the sides' LaneStats, so it costs the same however big the armies are
+        and a decision_interval of 0 (deciding every frame) is affordable.
+        """
         affordable = self.get_affordable_units()
         if not affordable:
             return
 
         # Analyze all lanes
-        lane_threats = [self.calculate_lane_threat(i, enemy_units) for i in range(3)]
-        lane_advantages = [self.calculate_lane_advantage(i, enemy_units) for i in range(3)]
+        lane_threats = [self.calculate_lane_threat(i, opponent) for i in range(NUM_LANES)]
+        lane_advantages = [self.calculate_lane_advantage(i, opponent) for i in range(NUM_LANES)]
 
         # Priority 1: Defend high threat lanes
         for lane, threat in enumerate(lane_threats):
-            if threat > AI_DEFEND_THRESHOLD:
+            if threat > self.params.defend_threshold:
                 # Spawn defensive unit
                 defensive_units = [u for u in ["tank", "soldier", "knight"] if u in affordable]
                 if defensive_units:
-                    unit = random.choice(defensive_units)
+                    unit = self.rng.choice(defensive_units)
                     self.spawn_unit(unit, lane)
                     return
 
         # Priority 2: Reinforce winning lanes
         for lane, advantage in enumerate(lane_advantages):
-            if advantage > (1.0 - AI_REINFORCE_THRESHOLD):
-                if random.random() < AI_REINFORCE_CHANCE:
+            if advantage > (1.0 - self.params.reinforce_threshold):
+                if self.rng.random() < self.params.reinforce_chance:
                     # Spawn offensive unit to push
                     offensive_units = [u for u in ["soldier", "archer", "assassin", "knight"]
                                       if u in affordable]
                     if offensive_units:
-                        unit = random.choice(offensive_units)
+                        unit = self.rng.choice(offensive_units)
                         self.spawn_unit(unit, lane)
                         return
 
         # Priority 3: Random attack if we have enough mana
         if self.mana >= 5:
-            lane = random.randint(0, 2)
-            unit = random.choice(affordable)
+            lane = self.rng.randint(0, NUM_LANES - 1)
+            unit = self.rng.choice(affordable)
             self.spawn_unit(unit, lane)
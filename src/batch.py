@@ -0,0 +1,219 @@
+import numpy as np
+
+from src.constants import (
+    FPS, NUM_LANES, MAX_MANA, STARTING_MANA, MANA_REGEN_RATE,
+    PLAYER_BASE_Y, ENEMY_BASE_Y
+)
+from src.ai import AIParams
+from src.unit_store import UnitStore, UNIT_NAMES
+from src.unit_types import UNIT_TABLE
+
+# Match results
+UNDECIDED = 0
+PLAYER_WON = 1
+ENEMY_WON = 2
+
+# Unit pools used by AI.make_decision
+DEFENSIVE_UNITS = ["tank", "soldier", "knight"]
+OFFENSIVE_UNITS = ["soldier", "archer", "assassin", "knight"]
+
+
+class MatchUnitStore(UnitStore):
+    """UnitStore holding the units of many matches, tagged with a match id."""
+
+    COLUMNS = {**UnitStore.COLUMNS, "match": np.int64}
+
+    def __init__(self, capacity: int = 1024):
+        super().__init__(capacity)
+        self.next_seq = 0
+        # Stats by type id, straight from the unit type table's arrays
+        self.type_stats = {
+            stat: np.array(getattr(UNIT_TABLE, stat))
+            for stat in ("hp", "damage", "speed", "range", "attack_cooldown")
+        }
+
+    def groups(self, rows: np.ndarray) -> np.ndarray:
+        return self.match[rows] * NUM_LANES + self.lane[rows]
+
+    def spawn_many(self, matches: np.ndarray, type_ids: np.ndarray, lanes: np.ndarray, is_player: bool):
+        """Spawn one unit per entry, at full hp at its side's base."""
+        count = len(matches)
+        if self.count + count > len(self.y):
+            self._grow(count)
+        rows = slice(self.count, self.count + count)
+        self.count += count
+
+        self.match[rows] = matches
+        self.type_id[rows] = type_ids
+        self.lane[rows] = lanes
+        self.is_player[rows] = is_player
+        self.seq[rows] = np.arange(self.next_seq, self.next_seq + count)
+        self.next_seq += count
+        self.y[rows] = PLAYER_BASE_Y if is_player else ENEMY_BASE_Y
+        for stat, values in self.type_stats.items():
+            getattr(self, stat)[rows] = values[type_ids]
+        self.max_hp[rows] = self.hp[rows]
+        self.cooldown[rows] = 0.0
+        self.is_attacking[rows] = False
+        self.removed[rows] = False
+
+    def reached_base_by_match(self, is_player: bool, num_matches: int) -> np.ndarray:
+        """For every match, whether any unit of a side has reached the opposing base."""
+        rows = self.side_rows(is_player)
+        if is_player:
+            rows = rows[self.y[rows] <= ENEMY_BASE_Y]
+        else:
+            rows = rows[self.y[rows] >= PLAYER_BASE_Y]
+        return np.bincount(self.match[rows], minlength=num_matches) > 0
+
+    def drop_matches(self, finished: np.ndarray):
+        """Remove the units of finished matches."""
+        n = self.count
+        self.remove(np.flatnonzero(finished[self.match[:n]] & ~self.removed[:n]))
+
+
+class BatchSimulator:
+    """
+    Many independent AI-vs-AI matches advanced in lockstep.
+    All units share one MatchUnitStore and follow the same rules as Simulation;
+    mana, AI decision timers and results are per-match arrays (column 0 is the
+    player side, column 1 the enemy side). The AI mirrors AI.make_decision,
+    drawing from one NumPy generator instead of the random module.
+    """
+
+    def __init__(self, num_matches: int, seed: int | None = None, params: AIParams | None = None):
+        self.num_matches = num_matches
+        self.params = params or AIParams()
+        self.rng = np.random.default_rng(seed)
+        self.units = MatchUnitStore()
+        self.mana = np.full((num_matches, 2), float(STARTING_MANA))
+        self.decision_timer = np.zeros((num_matches, 2))
+        self.results = np.full(num_matches, UNDECIDED, dtype=np.int8)
+        self.ticks = 0
+        self.time = 0.0
+
+        self.costs = np.array(UNIT_TABLE.costs, dtype=float)
+        self.defensive = np.isin(UNIT_NAMES, DEFENSIVE_UNITS)
+        self.offensive = np.isin(UNIT_NAMES, OFFENSIVE_UNITS)
+
+    @property
+    def running(self) -> np.ndarray:
+        return self.results == UNDECIDED
+
+    def step(self, dt: float):
+        """Advance every running match by dt seconds."""
+        running = self.running
+        for column, is_player in ((0, True), (1, False)):
+            # Regenerate mana
+            self.mana[running, column] = np.minimum(MAX_MANA, self.mana[running, column] + MANA_REGEN_RATE * dt)
+
+            self.units.update_side(is_player, dt)
+
+            # Decision making
+            self.decision_timer[running, column] += dt
+            due = running & (self.decision_timer[:, column] >= self.params.decision_interval)
+            self.decision_timer[due, column] = 0.0
+            if np.any(due):
+                self.make_decisions(np.flatnonzero(due), is_player)
+        self.ticks += 1
+        self.time += dt
+
+        # Check win conditions, player side first like Simulation.step
+        player_won = running & self.units.reached_base_by_match(True, self.num_matches)
+        enemy_won = running & ~player_won & self.units.reached_base_by_match(False, self.num_matches)
+        self.results[player_won] = PLAYER_WON
+        self.results[enemy_won] = ENEMY_WON
+        finished = player_won | enemy_won
+        if np.any(finished):
+            self.units.drop_matches(finished)
+
+    def run(self, dt: float = 1.0 / FPS, max_time: float = 600.0) -> np.ndarray:
+        """Step until every match ends or max_time elapses; return the results."""
+        while np.any(self.running) and self.time < max_time:
+            self.step(dt)
+        return self.results
+
+    def lane_evaluations(self, matches: np.ndarray, is_player: bool) -> tuple[np.ndarray, np.ndarray]:
+        """Lane threats and advantages, shaped (len(matches), NUM_LANES), like AI.calculate_lane_*."""
+        units = self.units
+        n = units.count
+        slot = np.full(self.num_matches, -1)
+        slot[matches] = np.arange(len(matches))
+
+        rows = np.flatnonzero((slot[units.match[:n]] >= 0) & (units.hp[:n] > 0))
+        groups = slot[units.match[rows]] * NUM_LANES + units.lane[rows]
+        ours = units.is_player[rows] == is_player
+        y = units.y[rows]
+        distance = PLAYER_BASE_Y - y if is_player else y - ENEMY_BASE_Y
+        hp = units.hp[rows]
+        size = len(matches) * NUM_LANES
+
+        ally_count = np.bincount(groups[ours], minlength=size)
+        enemy_count = np.bincount(groups[~ours], minlength=size)
+        ally_power = np.bincount(groups[ours], weights=hp[ours], minlength=size)
+        enemy_power = np.bincount(groups[~ours], weights=hp[~ours], minlength=size)
+        closest_enemy = np.full(size, np.inf)
+        np.minimum.at(closest_enemy, groups[~ours], distance[~ours])
+        furthest_ally = np.full(size, -np.inf)
+        np.maximum.at(furthest_ally, groups[ours], distance[ours])
+        max_distance = PLAYER_BASE_Y - ENEMY_BASE_Y
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            position_threat = 1.0 - closest_enemy / max_distance
+            threat_ratio = np.where(ally_power == 0, 1.0,
+                                    np.minimum(1.0, enemy_power / (ally_power + enemy_power)))
+            threats = np.where(enemy_count > 0, position_threat * 0.6 + threat_ratio * 0.4, 0.0)
+
+            position_advantage = furthest_ally / max_distance
+            advantage_ratio = np.where(enemy_power == 0, 1.0,
+                                       np.minimum(1.0, ally_power / (ally_power + enemy_power)))
+            advantages = np.where(ally_count > 0, position_advantage * 0.4 + advantage_ratio * 0.6, 0.0)
+
+        return threats.reshape(-1, NUM_LANES), advantages.reshape(-1, NUM_LANES)
+
+    def _choose(self, mask: np.ndarray) -> np.ndarray:
+        """Uniformly pick one True column per row (rows must have at least one)."""
+        counts = mask.sum(axis=1)
+        picks = (self.rng.random(len(mask)) * counts).astype(np.int64)
+        return np.argmax(np.cumsum(mask, axis=1) > picks[:, None], axis=1)
+
+    def make_decisions(self, matches: np.ndarray, is_player: bool):
+        """Vectorized AI.make_decision for one side of the given matches."""
+        column = 0 if is_player else 1
+        mana = self.mana[matches, column]
+        affordable = mana[:, None] >= self.costs[None, :]
+        deciding = affordable.any(axis=1)
+        matches, mana, affordable = matches[deciding], mana[deciding], affordable[deciding]
+        if len(matches) == 0:
+            return
+        threats, advantages = self.lane_evaluations(matches, is_player)
+        unit = np.full(len(matches), -1)
+        lane = np.full(len(matches), -1)
+
+        # Priority 1: Defend the first high threat lane
+        defensive = affordable & self.defensive
+        threatened = threats > self.params.defend_threshold
+        defend = threatened.any(axis=1) & defensive.any(axis=1)
+        if np.any(defend):
+            lane[defend] = np.argmax(threatened[defend], axis=1)
+            unit[defend] = self._choose(defensive[defend])
+
+        # Priority 2: Reinforce the first winning lane that passes the dice roll
+        offensive = affordable & self.offensive
+        rolls = self.rng.random(advantages.shape) < self.params.reinforce_chance
+        reinforcing = (advantages > (1.0 - self.params.reinforce_threshold)) & rolls
+        reinforce = (unit < 0) & reinforcing.any(axis=1) & offensive.any(axis=1)
+        if np.any(reinforce):
+            lane[reinforce] = np.argmax(reinforcing[reinforce], axis=1)
+            unit[reinforce] = self._choose(offensive[reinforce])
+
+        # Priority 3: Random attack if we have enough mana
+        attack = (unit < 0) & (mana >= 5)
+        if np.any(attack):
+            lane[attack] = self.rng.integers(0, NUM_LANES, np.count_nonzero(attack))
+            unit[attack] = self._choose(affordable[attack])
+
+        spawning = unit >= 0
+        matches, unit, lane = matches[spawning], unit[spawning], lane[spawning]
+        self.mana[matches, column] -= self.costs[unit]
+        self.units.spawn_many(matches, unit, lane, is_player)
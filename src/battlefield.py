@@ -1,15 +1,18 @@
 import pygame
 from src.constants import (
-    SCREEN_WIDTH, HEADER_HEIGHT, LANE_WIDTH,
+    SCREEN_WIDTH, HEADER_HEIGHT, LANE_WIDTH, NUM_LANES,
     LANE_COLORS, LANE_DIVIDER_COLOR,
     PLAYER_BASE_Y, ENEMY_BASE_Y, BATTLEFIELD_HEIGHT
 )
 from src.unit import Unit
+from src.sprites import SpriteAtlas
 
 
 class Battlefield:
-    def __init__(self):
-        self.num_lanes = 3
+    def __init__(self, sprites: SpriteAtlas | None = None):
+        self.num_lanes = NUM_LANES
+        # Pre-rendered unit sprites; units draw themselves without an atlas
+        self.sprites = sprites
         self.lane_rects: list[pygame.Rect] = []
 
         # Create vertical lane rectangles
@@ -80,12 +83,19 @@ class Battlefield:
             3
         )
 
-    def render_units(self, screen: pygame.Surface, player_units: list[Unit], enemy_units: list[Unit]):
-        """Render all units on the battlefield."""
+    def render_units(self, screen: pygame.Surface, player_units: list[Unit], enemy_units: list[Unit],
+                     alpha: float = 1.0):
+        """Render all units on the battlefield, alpha of the way from their last tick's position."""
+        if self.sprites is not None:
+            # One batched blit call for every body and health bar
+            screen.blits(self.sprites.unit_blits(player_units, alpha), doreturn=False)
+            screen.blits(self.sprites.unit_blits(enemy_units, alpha), doreturn=False)
+            return
+
         for unit in player_units:
             if unit.is_alive:
-                unit.render(screen)
+                unit.render(screen, alpha)
 
         for unit in enemy_units:
             if unit.is_alive:
-                unit.render(screen)
+                unit.render(screen, alpha)
@@ -1,20 +1,22 @@
 import pygame
 from src.constants import (
-    UNIT_TYPES, CARD_WIDTH, CARD_HEIGHT, CARD_SPACING, SCREEN_WIDTH,
+    CARD_WIDTH, CARD_HEIGHT, CARD_SPACING, CARD_MIN_WIDTH, SCREEN_WIDTH,
     CARD_BG_COLOR, CARD_SELECTED_COLOR, CARD_DISABLED_COLOR,
     WHITE, MANA_COLOR
 )
+from src.sprites import SpriteAtlas
+from src.unit_types import UNIT_TABLE
 
 
 class Card:
-    def __init__(self, unit_name: str, x: int, y: int):
+    def __init__(self, unit_name: str, x: int, y: int, width: int = CARD_WIDTH):
         self.unit_name = unit_name
-        self.unit_data = UNIT_TYPES[unit_name]
+        self.unit_data = UNIT_TABLE.definitions[unit_name]
         self.x = x
         self.y = y
-        self.width = CARD_WIDTH
+        self.width = width
         self.height = CARD_HEIGHT
-        self.rect = pygame.Rect(x, y, CARD_WIDTH, CARD_HEIGHT)
+        self.rect = pygame.Rect(x, y, width, CARD_HEIGHT)
         self.selected = False
 
     @property
@@ -26,7 +28,7 @@ class Card:
         return self.rect.collidepoint(pos)
 
     def render(self, screen: pygame.Surface, font: pygame.font.Font,
-               current_mana: float, is_selected: bool):
+               current_mana: float, is_selected: bool, sprites: SpriteAtlas | None = None):
         """Render the card."""
         can_afford = current_mana >= self.cost
 
@@ -53,7 +55,10 @@ class Card:
 
         unit_color = self.unit_data["color"] if can_afford else (80, 80, 80)
 
-        if self.unit_data["shape"] == "rect":
+        if sprites is not None:
+            half_icon = icon_size // 2
+            screen.blit(sprites.icon(self.unit_name, can_afford), (icon_x - half_icon, icon_y - half_icon))
+        elif self.unit_data["shape"] == "rect":
             icon_rect = pygame.Rect(
                 icon_x - icon_size // 2,
                 icon_y - icon_size // 2,
@@ -79,19 +84,31 @@ class Card:
         screen.blit(cost_surface, cost_rect)
 
 
+def card_width(count: int) -> int:
+    """Width of each of count cards in the deck; raises ValueError if they can't fit."""
+    width = min(CARD_WIDTH, (SCREEN_WIDTH - (count + 1) * CARD_SPACING) // count)
+    if width < CARD_MIN_WIDTH:
+        most = (SCREEN_WIDTH - CARD_SPACING) // (CARD_MIN_WIDTH + CARD_SPACING)
+        raise ValueError(f"{count} unit types don't fit in the deck, which holds at most {most}")
+    return width
+
+
 class Deck:
-    def __init__(self, card_y: int):
+    def __init__(self, card_y: int, sprites: SpriteAtlas | None = None):
         self.cards: list[Card] = []
         self.selected_card: Card | None = None
+        self.sprites = sprites
 
-        # Create cards for all unit types
-        unit_names = ["soldier", "tank", "archer", "knight", "assassin", "giant"]
-        total_width = len(unit_names) * CARD_WIDTH + (len(unit_names) - 1) * CARD_SPACING
+        # Create cards for all unit types, narrowed (down to CARD_MIN_WIDTH)
+        # if extra unit types wouldn't fit between margins of CARD_SPACING
+        unit_names = UNIT_TABLE.names
+        width = card_width(len(unit_names))
+        total_width = len(unit_names) * width + (len(unit_names) - 1) * CARD_SPACING
         start_x = (SCREEN_WIDTH - total_width) // 2  # Center cards
 
         for i, unit_name in enumerate(unit_names):
-            x = start_x + i * (CARD_WIDTH + CARD_SPACING)
-            card = Card(unit_name, x, card_y)
+            x = start_x + i * (width + CARD_SPACING)
+            card = Card(unit_name, x, card_y, width)
             self.cards.append(card)
 
     def handle_click(self, pos: tuple[int, int], current_mana: float) -> Card | None:
@@ -114,4 +131,4 @@ class Deck:
         """Render all cards in the deck."""
         for card in self.cards:
             is_selected = card == self.selected_card
-            card.render(screen, font, current_mana, is_selected)
+            card.render(screen, font, current_mana, is_selected, self.sprites)
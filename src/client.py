@@ -0,0 +1,86 @@
+"""
+Reference client for the lockstep match server (src/server.py).
+
+Plays a match in the usual game window (src/network_game.py), or runs headless bots that play
+each other (or the AI) over the network, e.g. against a server on loopback.
+A player on the top side sees the board the same way up as the bottom
+player: their units come down from the top.
+
+Usage:
+    python -m src.client [--host H] [--port N] [--vs-ai]
+    python -m src.client --bots N [--vs-ai]
+"""
+
+import argparse
+import asyncio
+import random
+from collections import Counter
+
+from src.constants import SERVER_PORT, NUM_LANES
+from src.lockstep import LockstepSession
+from src.protocol import UNIT_NAMES, end_message
+
+
+async def play_bot(host: str, port: int, vs_ai: bool = False, seed: int | None = None,
+                   spawn_chance: float = 0.1, simulate: bool = True) -> LockstepSession:
+    """
+    Headless client spawning random affordable units. It simulates as fast as
+    frames arrive, so the server's turns set the pace. Without simulate it
+    only relays random spawns (for load tests): no checksums, no result.
+    """
+    rng = random.Random(seed)
+    session = LockstepSession(vs_ai)
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(session.take_outgoing())
+    try:
+        while not session.ended:
+            data = await reader.read(65536)
+            if not data:
+                break
+            session.receive(data)
+            if not session.started:
+                continue
+            if simulate:
+                session.run_ready()
+            if not session.simulation.game_over and rng.random() < spawn_chance:
+                player = session.own_player
+                affordable = [name for name in UNIT_NAMES if not simulate or player.can_afford(name)]
+                if affordable:
+                    session.spawn(rng.choice(affordable), rng.randrange(NUM_LANES))
+            outgoing = session.take_outgoing()
+            if outgoing:
+                writer.write(outgoing)
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+    return session
+
+
+async def play_bots(host: str, port: int, count: int, vs_ai: bool, seed: int = 0) -> Counter:
+    """Play count bots at once; return how their matches ended, by reason."""
+    sessions = await asyncio.gather(*(play_bot(host, port, vs_ai, seed + i) for i in range(count)))
+    return Counter(end_message(session.end_reason) for session in sessions)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Forever War network client")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=SERVER_PORT)
+    parser.add_argument("--vs-ai", action="store_true", help="play the AI instead of another player")
+    parser.add_argument("--bots", type=int, help="run this many headless bots instead of a window")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the bots' random spawns")
+    args = parser.parse_args()
+
+    if args.bots:
+        endings = asyncio.run(play_bots(args.host, args.port, args.bots, args.vs_ai, args.seed))
+        for reason, count in endings.most_common():
+            print(f"{count} bots: {reason}")
+        return
+    # Imported here so headless bots don't need pygame
+    from src.network_game import NetworkGame
+    NetworkGame(args.host, args.port, vs_ai=args.vs_ai).run()
+
+
+if __name__ == "__main__":
+    main()
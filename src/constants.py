@@ -27,7 +27,7 @@ HEALTH_BAR_BG = (60, 60, 60)
 HEALTH_BAR_PLAYER = (0, 200, 0)
 HEALTH_BAR_ENEMY = (200, 0, 0)
 
-# Lane colors (3 vertical lanes)
+# Lane colors (one per vertical lane)
 LANE_COLORS = [
     (40, 45, 50),
     (35, 40, 45),
@@ -39,7 +39,8 @@ LANE_DIVIDER_COLOR = (60, 65, 70)
 HEADER_HEIGHT = 50
 FOOTER_HEIGHT = 150
 BATTLEFIELD_HEIGHT = SCREEN_HEIGHT - HEADER_HEIGHT - FOOTER_HEIGHT
-LANE_WIDTH = SCREEN_WIDTH // 3
+NUM_LANES = 3
+LANE_WIDTH = SCREEN_WIDTH // NUM_LANES
 
 # Base positions (vertical: player at bottom, enemy at top)
 PLAYER_BASE_Y = SCREEN_HEIGHT - FOOTER_HEIGHT - 40
@@ -49,6 +50,8 @@ ENEMY_BASE_Y = HEADER_HEIGHT + 40
 CARD_WIDTH = 90
 CARD_HEIGHT = 80
 CARD_SPACING = 8
+# Cards narrow down to this to fit extra unit types (e.g. from UNIT_TYPES_FILE_ENV)
+CARD_MIN_WIDTH = 72
 CARD_Y = SCREEN_HEIGHT - FOOTER_HEIGHT + 50
 
 # Mana settings
@@ -58,6 +61,29 @@ MANA_REGEN_RATE = 1.0  # per second
 
 # Game settings
 FPS = 60
+# Simulation ticks per second, independent of the render rate (FPS)
+TICK_RATE = 60
+# Most ticks run to catch up after a slow frame; time beyond that is dropped
+MAX_CATCHUP_TICKS = 5
+# Resolve combat in two phases (see src.two_phase): every unit plans from the
+# same state, then all damage lands at once. Off keeps the legacy order, in
+# which the player side's units strike first.
+TWO_PHASE_TICK = False
+# Startup budgets, in seconds (python -m benchmarks.bench_startup checks them).
+# Game window: from main.py starting to the first frame drawn; importing
+# pygame alone takes over a third of it. Headless tools: importing
+# src.simulation in a fresh interpreter, since batch jobs start many
+# short-lived processes. Nothing headless may import pygame.
+STARTUP_BUDGET = 0.4
+HEADLESS_IMPORT_BUDGET = 0.015
+
+# Environment variable naming a JSON file of extra unit types, in the
+# UNIT_TYPES format (see src.unit_types); they can also override these
+UNIT_TYPES_FILE_ENV = "FOREVER_WAR_UNIT_TYPES"
+# Environment variable naming a JSON parameters file (see src.params), as
+# written by src.tuner, whose AI parameters and unit stats replace the
+# AI_* constants and the stats in UNIT_TYPES
+PARAMS_FILE_ENV = "FOREVER_WAR_PARAMS"
 
 # Unit type definitions
 UNIT_TYPES = {
@@ -140,3 +166,21 @@ AI_DECISION_INTERVAL = 1.5  # seconds
 AI_DEFEND_THRESHOLD = 0.7
 AI_REINFORCE_THRESHOLD = 0.3
 AI_REINFORCE_CHANCE = 0.6
+
+# Policy table AI settings (see src.policy_table; make policy-table builds the file)
+POLICY_TABLE_PATH = "policy_table.bin"
+POLICY_BUCKETS = 3  # threat and advantage buckets per lane
+
+# Search AI settings
+SEARCH_AI_BUDGET = 0.002  # seconds of search per decision, about 10 rollouts in a midgame
+SEARCH_AI_CANDIDATES = None  # moves kept for the rollouts, saving mana included; None keeps them all
+SEARCH_AI_HORIZON = 6.0  # seconds simulated by each rollout
+SEARCH_AI_MODEL_DT = 0.25  # forward model timestep
+SEARCH_AI_WAITS = (0.0,)  # seconds a spawn can be held back; longer waits need a bigger budget
+
+# Lockstep match server settings
+SERVER_PORT = 7777
+SERVER_INPUT_DELAY = 6  # ticks between the server receiving a spawn and its tick
+SERVER_TURN_TICKS = 3  # ticks per turn; the server sends one frame per match per turn
+SERVER_MAX_SPAWNS_PER_TURN = 4  # further spawns from a client in the same turn are dropped
+SERVER_CHECKSUM_INTERVAL = 60  # ticks between clients' state checksums
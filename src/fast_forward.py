@@ -0,0 +1,186 @@
+"""
+Event-driven fast-forwarding of headless matches.
+
+Between engagements units move in straight lines at constant speed, and an
+engaged unit just waits for its cooldown, so the next tick on which anything
+interesting can happen (a unit coming into range, an attack, a unit reaching
+a base, an AI decision) can be bounded ahead of time. FastForward jumps
+straight to it with Simulation.coast and only steps tick by tick when an
+event is due. Jumps repeat the per-tick float arithmetic, so a fast-forwarded
+match is identical to a stepped one.
+
+Usage: python -m src.fast_forward [--games N] [--seed N] [--max-time S]
+"""
+
+import math
+import time
+from typing import TYPE_CHECKING
+from src.constants import NUM_LANES, PLAYER_BASE_Y, ENEMY_BASE_Y
+
+if TYPE_CHECKING:
+    from src.simulation import Simulation
+
+# Slack on distance bounds, so float rounding can't make a jump overshoot an event
+MARGIN = 1e-6
+# Shorter jumps than this are stepped instead
+MIN_JUMP = 2
+
+
+def ticks_until(value: float, target: float, step: float) -> int:
+    """Ticks until a timer adding step every tick (as the tick loop does) reaches target."""
+    ticks = 1
+    value += step
+    while value < target:
+        value += step
+        ticks += 1
+    return ticks
+
+
+def ticks_until_expired(cooldown: float, step: float) -> int:
+    """Ticks until an attack cooldown counting down by step reaches 0 (0 if it already has)."""
+    ticks = 0
+    while cooldown > 0:
+        cooldown -= step
+        ticks += 1
+    return ticks
+
+
+class FastForward:
+    """
+    Drives a Simulation with jumps over uneventful ticks. Only fixed ticks
+    without inputs are supported: headless matches between AIs or replays.
+    """
+
+    def __init__(self, simulation: "Simulation"):
+        self.simulation = simulation
+        self.events = 0     # jumps and single steps
+        self.jumped = 0     # ticks covered by jumps
+
+    def lane_bound(self, lane: int, bottom_units: list, top_units: list) -> float:
+        """Ticks that can pass in a lane before any of its units changes what it is doing."""
+        dt = self.simulation.dt
+        bound = math.inf
+        if not bottom_units or not top_units:
+            # Nothing to fight, so only base arrivals matter
+            for unit in bottom_units:
+                bound = min(bound, (unit.y - ENEMY_BASE_Y - MARGIN) / (unit.speed * dt))
+            for unit in top_units:
+                bound = min(bound, (PLAYER_BASE_Y - unit.y - MARGIN) / (unit.speed * dt))
+            return bound
+
+        # Buckets are sorted by y: the fronts are the bottom side's lowest unit
+        # and the top side's highest. Units that got past each other are
+        # too awkward to bound, so they are stepped.
+        bottom_front = bottom_units[0].y
+        top_front = top_units[-1].y
+        if top_front >= bottom_front:
+            return 0
+
+        # A unit moves unless the opposing front is in range. Distances between
+        # the sides only shrink, so engaged units stay engaged.
+        bottom_moving = []
+        top_moving = []
+        for units, moving, distance in ((bottom_units, bottom_moving, lambda u: u.y - top_front),
+                                        (top_units, top_moving, lambda u: bottom_front - u.y)):
+            for unit in units:
+                if distance(unit) > unit.range:
+                    moving.append(unit)
+                else:
+                    # Engaged: it attacks on the tick its cooldown runs out
+                    bound = min(bound, ticks_until_expired(unit.attack_cooldown, dt) - 1)
+
+        # A moving unit closes on the nearest enemy at most at its own speed
+        # plus the fastest moving enemy's; it must stay out of range, and
+        # short of the base (only reachable past the enemy front anyway)
+        top_speed = max((u.speed for u in top_moving), default=0)
+        bottom_speed = max((u.speed for u in bottom_moving), default=0)
+        for unit in bottom_moving:
+            gap = unit.y - top_front - unit.range - MARGIN
+            bound = min(bound, gap / ((unit.speed + top_speed) * dt))
+        for unit in top_moving:
+            gap = bottom_front - unit.y - unit.range - MARGIN
+            bound = min(bound, gap / ((unit.speed + bottom_speed) * dt))
+        return bound
+
+    def next_event(self, max_time: float) -> int:
+        """How many ticks can be jumped over before anything happens (0: step)."""
+        simulation = self.simulation
+        dt = simulation.dt
+        bound = math.inf
+        for side in (simulation.player, simulation.enemy):
+            if side.unit_store is not None:
+                return 0
+            if sum(side.lane_stats.counts) != len(side.units):
+                # Units killed last tick still act once before they are removed
+                return 0
+            idle = side.idle_ticks(dt)
+            if idle is not None:
+                bound = min(bound, idle)
+        if bound < MIN_JUMP:
+            return 0
+
+        # The last ticks before max_time are stepped so run() stops where Simulation.run does
+        bound = min(bound, (max_time - simulation.time) / dt - 2)
+        bottom, top = simulation.player.lane_index, simulation.enemy.lane_index
+        for lane in range(NUM_LANES):
+            bound = min(bound, self.lane_bound(lane, bottom.units[lane], top.units[lane]))
+            if bound < MIN_JUMP:
+                return 0
+        return int(bound)
+
+    def advance(self, max_time: float = math.inf):
+        """Jump to the next event, or step one tick if it is due now."""
+        simulation = self.simulation
+        ticks = self.next_event(max_time)
+        if ticks >= MIN_JUMP:
+            simulation.coast(ticks)
+            self.jumped += ticks
+        else:
+            simulation.step()
+        self.events += 1
+
+    def run(self, max_time: float = 600.0) -> str | None:
+        """Play until the match ends or max_time elapses, like Simulation.run; return the winner."""
+        simulation = self.simulation
+        while not simulation.game_over and simulation.time < max_time:
+            self.advance(max_time)
+        return simulation.winner
+
+
+def main():
+    # Imported here: the AIs import this module, and the simulation shouldn't pay for the CLI
+    import argparse
+    from src.simulation import Simulation
+
+    parser = argparse.ArgumentParser(description="Compare fast-forwarded AI matches with stepped ones")
+    parser.add_argument("--games", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-time", type=float, default=600.0)
+    args = parser.parse_args()
+
+    stepped_seconds = forward_seconds = 0.0
+    ticks = events = mismatches = 0
+    for index in range(args.games):
+        seed = args.seed + index
+        start = time.perf_counter()
+        stepped = Simulation(player_ai=True, seed=seed)
+        stepped.run(max_time=args.max_time)
+        stepped_seconds += time.perf_counter() - start
+
+        start = time.perf_counter()
+        forward = FastForward(Simulation(player_ai=True, seed=seed))
+        forward.run(max_time=args.max_time)
+        forward_seconds += time.perf_counter() - start
+
+        ticks += stepped.ticks
+        events += forward.events
+        same = (forward.simulation.ticks, forward.simulation.winner) == (stepped.ticks, stepped.winner)
+        mismatches += not same
+
+    print(f"{args.games} games, {ticks / args.games:.0f} ticks and {events / args.games:.0f} events per game")
+    print(f"stepped {stepped_seconds:.2f}s, fast-forwarded {forward_seconds:.2f}s "
+          f"({stepped_seconds / forward_seconds:.1f}x), {mismatches} mismatched results")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,33 +1,155 @@
+import os
+import random
+from contextlib import nullcontext
 import pygame
 from src.constants import (
-    SCREEN_WIDTH, SCREEN_HEIGHT, FPS, BLACK
+    SCREEN_WIDTH, SCREEN_HEIGHT, FPS, TICK_RATE, MAX_CATCHUP_TICKS, BLACK
 )
 from src.player import Player
-from src.ai import AI
+from src.simulation import Simulation, PLAYER_SIDE
+from src.replay import record
 from src.battlefield import Battlefield
+from src.sprites import SpriteAtlas
+from src.renderer import DirtyRectRenderer
+from src.profiler import FrameProfiler
+from src.timestep import FixedTimestep, SimulationThread
+from src.startup import StartupTimer
 from src.ui import UI
 
 
 class Game:
-    def __init__(self):
-        pygame.init()
+    def __init__(self, seed: int | None = None, record_path: str | None = None,
+                 opponent: str = "heuristic", dirty_rects: bool = False,
+                 profile_path: str | None = None, tick_rate: int = TICK_RATE, fps: int = FPS,
+                 max_catchup: int = MAX_CATCHUP_TICKS, sim_thread: bool = False,
+                 startup: StartupTimer | None = None):
+        # A seed makes the game deterministic (the simulation always runs at a
+        # fixed timestep). Recording needs that, so it picks a seed if none was given.
+        if record_path is not None and seed is None:
+            seed = random.randrange(2 ** 31)
+        self.seed = seed
+        self.record_path = record_path
+        self.log = None
+        # Matches started this session, so each one is recorded to its own file
+        self.matches = 0
+        # "heuristic" for AI, "search" for SearchAI
+        self.opponent = opponent
+
+        # The simulation ticks at tick_rate whatever the render rate (fps), and
+        # units are drawn interpolated between their last two tick positions
+        self.tick_rate = tick_rate
+        self.fps = fps
+        self.max_catchup = max_catchup
+        self.use_sim_thread = sim_thread
+        self.timestep = None
+        # Set while the simulation steps on its own thread, see src.timestep
+        self.sim_thread = None
+        self.lock = nullcontext()
+
+        # Startup phases are timed up to the first frame, then reported
+        self.startup = startup
+        # Only the display: pygame.init() would also open the audio device
+        # and joysticks, which the game doesn't use. Fonts load on first use.
+        pygame.display.init()
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("Forever War")
         self.clock = pygame.time.Clock()
+        self.mark_startup("display")
+
+        # Unit and icon sprites are drawn once, up front
+        self.sprites = SpriteAtlas()
+        self.battlefield = Battlefield(self.sprites)
+        self.ui = UI(self.sprites)
+        self.mark_startup("sprites")
+        # Optional renderer that only repaints what changed
+        self.renderer = DirtyRectRenderer(self.screen, self.battlefield, self.ui) if dirty_rects else None
 
-        self.battlefield = Battlefield()
-        self.ui = UI()
-        self.ui.init_fonts()
+        # Frame profiler, toggled with F3 (F4 exports it); idle unless enabled
+        self.profiler = FrameProfiler()
+        self.profile_path = profile_path
 
         self.reset_game()
+        if profile_path is not None:
+            self.profiler.enable(self)
+        self.mark_startup("match setup")
+
+    def mark_startup(self, phase: str):
+        if self.startup is not None:
+            self.startup.mark(phase)
 
     def reset_game(self):
         """Reset the game state."""
-        self.player = Player(is_human=True)
-        self.enemy = AI()
-        self.game_over = False
-        self.player_won = False
+        self.stop_sim_thread()
+        self.save_recording()
+        self.matches += 1
+        self.simulation = self.create_simulation()
+        if self.record_path is not None:
+            self.log = record(self.simulation)
         self.running = True
+        if self.renderer is not None:
+            self.renderer.invalidate()
+        if self.use_sim_thread:
+            self.sim_thread = SimulationThread(self.simulation, self.max_catchup)
+            self.lock = self.sim_thread.lock
+        else:
+            self.timestep = FixedTimestep(self.tick_rate, self.max_catchup, self.simulation)
+        if self.profiler.enabled:
+            # Time the new match's players
+            self.profiler.attach(self)
+        if self.sim_thread is not None:
+            self.sim_thread.start()
+
+    def create_simulation(self) -> Simulation:
+        """The simulation of a new match."""
+        enemy = None
+        if self.opponent == "search":
+            # Imported here so the usual opponent doesn't load the search code
+            from src.search_ai import SearchAI
+            # The search runs on a worker thread so a decision never stalls a frame
+            enemy = SearchAI(threaded=True)
+        return Simulation(enemy=enemy, seed=self.seed, tick_rate=self.tick_rate)
+
+    def stop_sim_thread(self):
+        if self.sim_thread is not None:
+            self.sim_thread.stop()
+            self.sim_thread = None
+            self.lock = nullcontext()
+
+    @property
+    def alpha(self) -> float:
+        """How far between the last tick and the next the current frame is drawn."""
+        if self.sim_thread is not None:
+            return self.sim_thread.alpha
+        return self.timestep.alpha
+
+    def recording_path(self) -> str:
+        """Where the current match is recorded: record_path, then with -2, -3... added for the next matches."""
+        if self.matches <= 1:
+            return self.record_path
+        root, extension = os.path.splitext(self.record_path)
+        return f"{root}-{self.matches}{extension}"
+
+    def save_recording(self):
+        """Write the current match's action log, if recording."""
+        if self.log is not None:
+            self.log.end_tick = self.simulation.ticks
+            self.log.save(self.recording_path())
+
+    @property
+    def player(self) -> Player:
+        return self.simulation.player
+
+    @property
+    def enemy(self) -> Player:
+        return self.simulation.enemy
+
+    @property
+    def game_over(self) -> bool:
+        return self.simulation.game_over
+
+    @property
+    def player_won(self) -> bool:
+        return self.simulation.player_won
 
     def handle_events(self):
         """Handle pygame events."""
@@ -40,6 +162,10 @@ class Game:
                     self.running = False
                 elif event.key == pygame.K_SPACE and self.game_over:
                     self.reset_game()
+                elif event.key == pygame.K_F3:
+                    self.profiler.toggle(self)
+                elif event.key == pygame.K_F4 and self.profiler.enabled:
+                    self.profiler.export(self.profile_path or "frame_profile.csv")
 
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 if event.button == 1:  # Left click
@@ -61,39 +187,44 @@ class Game:
             lane = self.battlefield.get_lane_from_x(pos[0])
             if lane is not None:
                 # Try to spawn unit
-                if self.player.can_afford(selected.unit_name):
-                    self.player.spawn_unit(selected.unit_name, lane)
+                if self.spawn(selected.unit_name, lane):
                     self.ui.deck.deselect()
         else:
             # Clicking on battlefield without selected card - deselect
             if self.battlefield.is_in_battlefield(pos):
                 self.ui.deck.deselect()
 
-    def update(self, dt: float):
-        """Update game state."""
-        if self.game_over:
-            return
-
-        # Update player and enemy
-        self.player.update(dt, self.enemy.units)
-        self.enemy.update(dt, self.player.units)
+    def spawn(self, unit_name: str, lane: int) -> bool:
+        """Spawn one of the player's units; return whether it happened."""
+        with self.lock:
+            return self.simulation.apply_action(PLAYER_SIDE, unit_name, lane) is not None
 
-        # Check win conditions
-        if self.player.check_win_condition():
-            self.game_over = True
-            self.player_won = True
-        elif self.enemy.check_win_condition():
-            self.game_over = True
-            self.player_won = False
+    def update(self, frame_time: float):
+        """Run as many fixed ticks as frame_time seconds of real time cover."""
+        if self.sim_thread is not None:
+            # Stepped on its own thread
+            return
+        for _ in range(self.timestep.advance(frame_time)):
+            self.simulation.step()
 
     def render(self):
         """Render the game."""
+        # Keeps a simulation thread from stepping mid-frame
+        with self.lock:
+            self.draw(self.alpha)
+
+    def draw(self, alpha: float):
+        """Draw the current state, units alpha of the way from their last tick's position."""
+        if self.renderer is not None:
+            self.renderer.render(self.player, self.enemy, self.game_over, self.player_won, alpha)
+            return
+
         # Clear screen
         self.screen.fill(BLACK)
 
         # Render battlefield
         self.battlefield.render(self.screen)
-        self.battlefield.render_units(self.screen, self.player.units, self.enemy.units)
+        self.battlefield.render_units(self.screen, self.player.units, self.enemy.units, alpha)
 
         # Render UI
         self.ui.render_header(self.screen, self.enemy.mana)
@@ -103,15 +234,27 @@ class Game:
         if self.game_over:
             self.ui.render_game_over(self.screen, self.player_won)
 
+        self.present()
+
+    def present(self):
+        """Show the rendered frame."""
         pygame.display.flip()
 
     def run(self):
         """Main game loop."""
         while self.running:
-            dt = self.clock.tick(FPS) / 1000.0  # Convert to seconds
+            frame_time = self.clock.tick(self.fps) / 1000.0  # Convert to seconds
 
             self.handle_events()
-            self.update(dt)
+            self.update(frame_time)
             self.render()
+            if self.startup is not None:
+                self.startup.mark("first frame")
+                print(self.startup.report(), flush=True)
+                self.startup = None
 
+        self.stop_sim_thread()
+        self.save_recording()
+        if self.profile_path is not None and self.profiler.enabled:
+            self.profiler.export(self.profile_path)
         pygame.quit()
@@ -0,0 +1,137 @@
+from bisect import bisect_left, bisect_right
+from typing import Optional, TYPE_CHECKING
+from src.constants import NUM_LANES
+
+if TYPE_CHECKING:
+    from src.unit import Unit
+
+
+# Changes each lane remembers for units checking a cached target (see unchanged_within);
+# a unit that last looked more changes ago than this searches again
+CHANGE_HISTORY = 16
+
+
+def _sort_key(unit: "Unit") -> tuple[float, int]:
+    return (unit.y, unit.seq)
+
+
+class LaneIndex:
+    """Living units of one side, bucketed by lane and sorted by (y, spawn order)."""
+
+    def __init__(self, num_lanes: int = NUM_LANES):
+        self.units: list[list["Unit"]] = [[] for _ in range(num_lanes)]
+        self.ys: list[list[float]] = [[] for _ in range(num_lanes)]
+        # Per lane, a count of changes (spawns, and refreshes in which units
+        # moved) and the y span of each of the last CHANGE_HISTORY of them
+        self.versions = [0] * num_lanes
+        self.changes: list[list[tuple[float, float]]] = [[] for _ in range(num_lanes)]
+
+    def __len__(self) -> int:
+        return sum(len(bucket) for bucket in self.units)
+
+    def insert(self, unit: "Unit"):
+        """Add a newly spawned unit to its lane."""
+        ys = self.ys[unit.lane]
+        # New units have the highest spawn order, so they go after equal ys
+        pos = bisect_right(ys, unit.y)
+        ys.insert(pos, unit.y)
+        self.units[unit.lane].insert(pos, unit)
+        self.note_change(unit.lane, unit.y, unit.y)
+
+    def refresh(self):
+        """Drop dead units and restore y order after units have moved."""
+        for lane, bucket in enumerate(self.units):
+            alive = [u for u in bucket if u.hp > 0]
+            moved = [u.y for u, y in zip(bucket, self.ys[lane]) if u.y != y]
+            if moved:
+                # Buckets are nearly sorted already, which timsort handles in ~O(n)
+                alive.sort(key=_sort_key)
+                self.note_change(lane, min(moved), max(moved))
+            self.units[lane] = alive
+            self.ys[lane] = [u.y for u in alive]
+
+    def note_change(self, lane: int, low: float, high: float):
+        """Record that units spawned in or moved to [low, high] of a lane."""
+        self.versions[lane] += 1
+        changes = self.changes[lane]
+        changes.append((low, high))
+        if len(changes) > CHANGE_HISTORY:
+            del changes[0]
+
+    def unchanged_within(self, lane: int, version: int, low: float, high: float) -> bool:
+        """Whether no unit has spawned in or moved to [low, high] of a lane since its given version."""
+        missed = self.versions[lane] - version
+        if not missed:
+            return True
+        changes = self.changes[lane]
+        if missed > len(changes):
+            return False
+        for change_low, change_high in changes[-missed:]:
+            if change_low <= high and low <= change_high:
+                return False
+        return True
+
+    def front(self, lane: int, lowest: bool) -> float | None:
+        """y of the living unit with the lowest (or highest) y in a lane, if any."""
+        units = self.units[lane]
+        indices = range(len(units)) if lowest else range(len(units) - 1, -1, -1)
+        for i in indices:
+            if units[i].hp > 0:
+                return units[i].y
+        return None
+
+    def snapshot(self) -> tuple:
+        """Copy of the buckets, restorable with restore()."""
+        return tuple(map(tuple, self.units)), tuple(map(tuple, self.ys))
+
+    def restore(self, state: tuple):
+        units, ys = state
+        self.units = list(map(list, units))
+        self.ys = list(map(list, ys))
+        # Anything may have changed, so every cached target is searched again
+        for lane in range(len(self.versions)):
+            self.versions[lane] += 1
+            self.changes[lane].clear()
+
+    def nearest(self, lane: int, y: float, max_range: float) -> Optional["Unit"]:
+        """
+        Find the nearest living unit in a lane within max_range of y.
+        Ties go to the earliest spawned unit, like a linear scan in spawn order.
+        """
+        ys = self.ys[lane]
+        units = self.units[lane]
+        pos = bisect_left(ys, y)
+
+        # Closest unit at or below y (first alive has the lowest spawn order)
+        best = None
+        best_distance = max_range
+        for i in range(pos, len(ys)):
+            distance = ys[i] - y
+            if distance > max_range:
+                break
+            if units[i].hp > 0:
+                best = units[i]
+                best_distance = distance
+                break
+
+        # Closest unit above y
+        i = pos - 1
+        while i >= 0:
+            distance = y - ys[i]
+            if distance > best_distance:
+                break
+            if units[i].hp > 0:
+                # Lowest spawn order among equal ys sits leftmost in the group
+                candidate = units[i]
+                group_y = ys[i]
+                i -= 1
+                while i >= 0 and ys[i] == group_y:
+                    if units[i].hp > 0:
+                        candidate = units[i]
+                    i -= 1
+                if best is None or distance < best_distance or candidate.seq < best.seq:
+                    best = candidate
+                break
+            i -= 1
+
+        return best
@@ -0,0 +1,31 @@
+from src.constants import NUM_LANES
+
+
+class LaneStats:
+    """
+    Living unit count and hp total per lane for one side, kept up to date as
+    units spawn and take damage so the AI never has to rescan an army.
+    """
+
+    def __init__(self, num_lanes: int = NUM_LANES):
+        self.counts = [0] * num_lanes
+        self.hp = [0] * num_lanes
+
+    def add(self, lane: int, hp: int):
+        """Count a newly spawned unit."""
+        self.counts[lane] += 1
+        self.hp[lane] += hp
+
+    def damage(self, lane: int, hp_before: int, hp_after: int):
+        """Account for a unit's hp dropping, and for its death if it hit 0."""
+        self.hp[lane] -= hp_before - hp_after
+        if hp_after <= 0 < hp_before:
+            self.counts[lane] -= 1
+
+    def snapshot(self) -> tuple:
+        return tuple(self.counts), tuple(self.hp)
+
+    def restore(self, state: tuple):
+        counts, hp = state
+        self.counts = list(counts)
+        self.hp = list(hp)
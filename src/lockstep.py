@@ -0,0 +1,109 @@
+from src.constants import SERVER_CHECKSUM_INTERVAL
+from src.player import Player
+from src.ai import AI
+from src.simulation import Simulation
+from src.protocol import (
+    PROTOCOL_VERSION, JOIN, SPAWN, CHECKSUM, RESULT, START, FRAME, END,
+    FLAG_VS_AI, UNIT_NAMES, UNIT_IDS, SIDE_NAMES, ProtocolError,
+    MessageReader, encode, state_checksum,
+)
+
+
+class LockstepSession:
+    """
+    Client side of a lockstep match, independent of sockets: feed it the bytes
+    received from the server and send what take_outgoing() returns. Spawns go
+    to the server, which schedules them input_delay ticks ahead and sends them
+    back to both players in FRAMEs, so every client applies them on the same
+    tick. The simulation may only run ticks the frames have covered.
+    """
+
+    def __init__(self, vs_ai: bool = False):
+        self.vs_ai = vs_ai
+        self.reader = MessageReader()
+        self.outgoing = bytearray(encode(JOIN, PROTOCOL_VERSION, FLAG_VS_AI if vs_ai else 0))
+        self.simulation: Simulation | None = None
+        self.side: str | None = None
+        self.match_id = None
+        # Every tick up to this one has all its commands in self.commands
+        self.through_tick = -1
+        # How far frames normally run ahead of the server's clock, in ticks
+        self.lead = 0
+        self.commands: dict[int, list[tuple[str, str, int]]] = {}
+        self.end_reason: int | None = None
+        self.result_sent = False
+
+    @property
+    def started(self) -> bool:
+        return self.simulation is not None
+
+    @property
+    def ended(self) -> bool:
+        return self.end_reason is not None
+
+    def receive(self, data: bytes):
+        """Handle bytes from the server."""
+        for message in self.reader.feed(data):
+            kind = message[0]
+            if kind == START:
+                self.start(message)
+            elif kind == FRAME:
+                _, through_tick, _, commands = message
+                for tick, side, unit_id, lane in commands:
+                    self.commands.setdefault(tick, []).append((SIDE_NAMES[side], UNIT_NAMES[unit_id], lane))
+                self.through_tick = through_tick
+            elif kind == END:
+                self.end_reason = message[1]
+            else:
+                raise ProtocolError(f"Unexpected message type {kind} from the server")
+
+    def start(self, message: tuple):
+        _, self.match_id, side, seed, tick_rate, input_delay, turn_ticks, flags = message
+        self.side = SIDE_NAMES[side]
+        self.lead = input_delay + turn_ticks - 1
+        # The AI opponent runs in every client's simulation; the seed keeps them in step
+        enemy = AI() if flags & FLAG_VS_AI else Player(is_human=False)
+        self.simulation = Simulation(player=Player(is_human=True), enemy=enemy, seed=seed,
+                                     tick_rate=tick_rate)
+
+    @property
+    def own_player(self) -> Player:
+        return self.simulation.get_side(self.side)
+
+    def spawn(self, unit_name: str, lane: int):
+        """Ask for a spawn; it happens when a FRAME brings it back."""
+        self.outgoing += encode(SPAWN, UNIT_IDS[unit_name], lane)
+
+    def ready_ticks(self) -> int:
+        """How many ticks the frames received so far allow to run."""
+        if self.simulation is None or self.simulation.game_over:
+            return 0
+        return self.through_tick + 1 - self.simulation.ticks
+
+    def step(self):
+        """Apply the current tick's commands and run it; it must be ready."""
+        simulation = self.simulation
+        tick = simulation.ticks
+        if tick % SERVER_CHECKSUM_INTERVAL == 0:
+            self.outgoing += encode(CHECKSUM, tick, state_checksum(simulation))
+        for side, unit_name, lane in self.commands.pop(tick, ()):
+            simulation.apply_action(side, unit_name, lane)
+        simulation.step()
+        if simulation.game_over and not self.result_sent:
+            self.outgoing += encode(RESULT, simulation.ticks, SIDE_NAMES.index(simulation.winner))
+            self.result_sent = True
+
+    def run_ready(self, max_ticks: int | None = None) -> int:
+        """Run the ready ticks (at most max_ticks); return how many ran."""
+        ticks = self.ready_ticks()
+        if max_ticks is not None:
+            ticks = min(ticks, max_ticks)
+        for _ in range(ticks):
+            self.step()
+        return ticks
+
+    def take_outgoing(self) -> bytes:
+        """Bytes to send to the server, clearing them."""
+        data = bytes(self.outgoing)
+        self.outgoing.clear()
+        return data
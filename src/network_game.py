@@ -0,0 +1,124 @@
+import socket
+import pygame
+from src.game import Game
+from src.player import Player
+from src.simulation import Simulation, PLAYER_SIDE, ENEMY_SIDE
+from src.timestep import FixedTimestep
+from src.lockstep import LockstepSession
+from src.protocol import END_OPPONENT_LEFT, end_message
+
+
+class NetworkGame(Game):
+    """The local game window playing a match hosted by a lockstep server."""
+
+    def __init__(self, host: str, port: int, vs_ai: bool = False, **kwargs):
+        self.address = (host, port)
+        self.vs_ai = vs_ai
+        self.sock: socket.socket | None = None
+        # Bytes the non-blocking socket couldn't take yet, sent first next time
+        self.unsent = bytearray()
+        self.session: LockstepSession | None = None
+        super().__init__(**kwargs)
+
+    def create_simulation(self) -> Simulation:
+        """Join a new match; show an empty board until the server starts it."""
+        self.disconnect()
+        self.session = LockstepSession(self.vs_ai)
+        self.sock = socket.create_connection(self.address)
+        self.sock.setblocking(False)
+        self.unsent.clear()
+        pygame.display.set_caption("Forever War - waiting for an opponent")
+        return Simulation(enemy_ai=False)
+
+    def disconnect(self):
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+
+    @property
+    def player(self) -> Player:
+        if self.session.started:
+            return self.session.own_player
+        return self.simulation.player
+
+    @property
+    def enemy(self) -> Player:
+        if self.session.started:
+            return self.simulation.get_side(ENEMY_SIDE if self.session.side == PLAYER_SIDE else PLAYER_SIDE)
+        return self.simulation.enemy
+
+    @property
+    def game_over(self) -> bool:
+        return self.simulation.game_over or self.session.ended
+
+    @property
+    def player_won(self) -> bool:
+        if self.simulation.game_over:
+            return self.simulation.winner == self.session.side
+        return self.session.end_reason == END_OPPONENT_LEFT
+
+    def spawn(self, unit_name: str, lane: int) -> bool:
+        session = self.session
+        if not session.started or session.ended or not self.player.can_afford(unit_name):
+            return False
+        session.spawn(unit_name, lane)
+        return True
+
+    def exchange(self):
+        """Receive what the server sent and send what the session has queued."""
+        session = self.session
+        while self.sock is not None:
+            try:
+                data = self.sock.recv(65536)
+            except BlockingIOError:
+                break
+            except ConnectionError:
+                data = b""
+            if not data:
+                self.disconnect()
+                if session.end_reason is None:
+                    session.end_reason = -1
+                pygame.display.set_caption(f"Forever War - {end_message(session.end_reason)}")
+                break
+            started = session.started
+            session.receive(data)
+            if session.started and not started:
+                self.begin_match()
+        self.unsent += session.take_outgoing()
+        while self.unsent and self.sock is not None:
+            try:
+                sent = self.sock.send(self.unsent)
+            except BlockingIOError:
+                # The send buffer is full; the rest goes out on a later frame
+                break
+            except ConnectionError:
+                # Noticed as a closed connection by the next recv
+                break
+            del self.unsent[:sent]
+
+    def begin_match(self):
+        session = self.session
+        self.simulation = session.simulation
+        # Our game_over, since a match the server ends stops ticking too
+        self.timestep = FixedTimestep(self.simulation.tick_rate, self.max_catchup, self)
+        if self.renderer is not None:
+            self.renderer.invalidate()
+        if self.profiler.enabled:
+            self.profiler.attach(self)
+        pygame.display.set_caption(f"Forever War - match {session.match_id} ({session.side} side)")
+
+    def update(self, frame_time: float):
+        """Run the ticks real time calls for, as far as the server's frames allow."""
+        self.exchange()
+        session = self.session
+        if not session.started:
+            return
+        ticks = self.timestep.advance(frame_time)
+        # Catch up when the frames got further ahead than usual (after a stall)
+        behind = session.ready_ticks() - session.lead
+        session.run_ready(max(ticks, min(behind, self.max_catchup)))
+        self.exchange()
+
+    def run(self):
+        super().run()
+        self.disconnect()
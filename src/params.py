@@ -0,0 +1,43 @@
+import os
+from src.constants import PARAMS_FILE_ENV
+
+# What a parameters file may set: AIParams fields, and these stats of any unit type
+AI_FIELDS = ("decision_interval", "defend_threshold", "reinforce_threshold", "reinforce_chance")
+UNIT_STATS = ("hp", "damage", "speed", "range", "attack_cooldown")
+INTEGER_UNIT_STATS = ("hp", "damage", "speed", "range")
+
+_loaded: dict | None = None
+
+
+def load_params(path: str) -> dict:
+    """
+    A parameters file: a JSON object with "ai" (AIParams fields to values) and
+    "unit_types" (unit type keys to stats to values), both optional. Other
+    keys, like the tuning results src.tuner adds, are ignored.
+    """
+    # Imported here so the usual start, without a file, stays within the import budget
+    import json
+    with open(path) as f:
+        data = json.load(f)
+    ai = data.get("ai", {})
+    unknown = [name for name in ai if name not in AI_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown AI parameters in {path}: {', '.join(unknown)}")
+    unit_types = data.get("unit_types", {})
+    for key, stats in unit_types.items():
+        unknown = [stat for stat in stats if stat not in UNIT_STATS]
+        if unknown:
+            raise ValueError(f"Unit type {key!r} in {path} sets {', '.join(unknown)}; only {', '.join(UNIT_STATS)} can be set")
+        for stat in INTEGER_UNIT_STATS:
+            if stat in stats and not isinstance(stats[stat], int):
+                raise ValueError(f"Unit type {key!r} in {path} needs a whole {stat}")
+    return {"ai": ai, "unit_types": unit_types}
+
+
+def tuned_params() -> dict:
+    """The parameters file PARAMS_FILE_ENV names, loaded once, or empty sections if it isn't set."""
+    global _loaded
+    if _loaded is None:
+        path = os.environ.get(PARAMS_FILE_ENV)
+        _loaded = load_params(path) if path else {"ai": {}, "unit_types": {}}
+    return _loaded
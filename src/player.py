@@ -1,51 +1,181 @@
+from itertools import chain
+from operator import attrgetter
 from src.constants import MAX_MANA, STARTING_MANA, MANA_REGEN_RATE
-from src.unit import Unit, UnitType
+from src.unit import Unit, UnitType, UnitPool, INTERNED_TYPES
+from src.lane_index import LaneIndex
+from src.lane_stats import LaneStats
+
+# Unit attributes saved by snapshots: identity (a pooled unit may have been
+# reused since) and the ones that change after spawning. Unit.target is left
+# out since update() reassigns it before reading it.
+UNIT_STATE = ("seq", "unit_type", "lane", "y", "hp", "attack_cooldown", "is_attacking")
+_unit_state = attrgetter(*UNIT_STATE)
 
 
 class Player:
-    def __init__(self, is_human: bool = True):
+    def __init__(self, is_human: bool = True, is_player_side: bool | None = None):
         self.is_human = is_human
+        # Bottom (player) side by default for humans, top side otherwise
+        self.is_player_side = is_human if is_player_side is None else is_player_side
         self.mana = STARTING_MANA
         self.units: list[Unit] = []
+        self.lane_index = LaneIndex()
+        self.lane_stats = LaneStats()
+        # Dead units, recycled by spawn_unit
+        self.pool = UnitPool()
+        # Called with (unit_name, lane) on every successful spawn
+        self.spawn_listener = None
+        # Optional array-backed storage replacing the Unit objects, see src.unit_store
+        self.unit_store = None
+        # UnitType spawned for each key; src.tuner swaps in ones with other stats
+        self.unit_types = INTERNED_TYPES
+
+    def attach_store(self, store):
+        """Keep this player's units in a shared UnitStore instead of Unit objects."""
+        self.unit_store = store
+        self.units = store.side_units(self.is_player_side)
 
-    def update(self, dt: float, enemy_units: list[Unit]):
+    def update(self, dt: float, opponent: "Player"):
         """Update player state and all units."""
-        # Regenerate mana
+        self.regenerate_mana(dt)
+
+        if self.unit_store is not None:
+            self.unit_store.update_side(self.is_player_side, dt)
+        else:
+            # Update all units
+            enemy_index = opponent.lane_index
+            for unit in self.units:
+                unit.update(dt, enemy_index)
+            self.remove_dead()
+
+        self.act(dt, opponent)
+
+    def regenerate_mana(self, dt: float):
         self.mana = min(MAX_MANA, self.mana + MANA_REGEN_RATE * dt)
 
-        # Update all units
-        for unit in self.units:
-            unit.update(dt, enemy_units)
+    def remove_dead(self):
+        """Remove dead units in place, keeping spawn order, and hand them to the pool."""
+        # LaneStats counts the living, so ticks without deaths skip the pass
+        units = self.units
+        if sum(self.lane_stats.counts) != len(units):
+            kept = 0
+            for unit in units:
+                if unit.hp > 0:
+                    units[kept] = unit
+                    kept += 1
+                else:
+                    self.pool.release(unit)
+            del units[kept:]
+        self.lane_index.refresh()
+
+    def act(self, dt: float, opponent: "Player"):
+        """Decide and spawn, once the units have updated. A plain Player only spawns on input."""
+
+    def idle_ticks(self, dt: float) -> int | None:
+        """
+        Ticks this side can be fast-forwarded over before it acts on its own
+        (see src.fast_forward), or None if it never does. A plain Player only
+        spawns on input.
+        """
+        return None
 
-        # Remove dead units
-        self.units = [u for u in self.units if u.is_alive]
+    def coast(self, ticks: int, dt: float, opponent: "Player"):
+        """
+        Apply ticks updates at once, exactly as update() would, during a stretch
+        where no attack comes due, no unit enters range and this side doesn't act.
+        """
+        mana = self.mana
+        for _ in range(ticks):
+            if mana >= MAX_MANA:
+                break
+            mana = min(MAX_MANA, mana + MANA_REGEN_RATE * dt)
+        self.mana = mana
+
+        enemy_index = opponent.lane_index
+        for unit in self.units:
+            unit.coast(ticks, dt, enemy_index)
+        self.lane_index.refresh()
 
     def can_afford(self, unit_name: str) -> bool:
         """Check if player can afford to spawn a unit."""
-        from src.constants import UNIT_TYPES
-        cost = UNIT_TYPES[unit_name]["cost"]
-        return self.mana >= cost
+        return self.mana >= self.unit_types[unit_name].cost
 
     def spawn_unit(self, unit_name: str, lane: int) -> Unit | None:
         """Spawn a unit in the specified lane if affordable."""
-        from src.constants import UNIT_TYPES
-        cost = UNIT_TYPES[unit_name]["cost"]
-
-        if self.mana < cost:
+        unit_type = self.unit_types[unit_name]
+        if self.mana < unit_type.cost:
             return None
 
-        self.mana -= cost
-        unit_type = UnitType.from_name(unit_name)
-        unit = Unit(unit_type, lane, is_player=self.is_human)
+        self.mana -= unit_type.cost
+        if self.spawn_listener is not None:
+            self.spawn_listener(unit_name, lane)
+        if self.unit_store is not None:
+            return self.unit_store.spawn(unit_type, lane, self.is_player_side)
+        return self.add_unit(unit_type, lane)
+
+    def add_unit(self, unit_type: UnitType, lane: int, seq: int | None = None) -> Unit:
+        """Put a new unit at our base for free, next in spawn order unless seq is given."""
+        unit = self.pool.acquire(unit_type, lane, self.is_player_side, seq)
+        unit.lane_stats = self.lane_stats
         self.units.append(unit)
+        self.lane_index.insert(unit)
+        self.lane_stats.add(lane, unit.hp)
         return unit
 
+    def snapshot(self) -> tuple:
+        """
+        Flat copy of the mutable state, restorable with restore(). Unit objects
+        are referenced rather than copied, with their changing attributes kept
+        in one flat tuple, so restoring reuses them and the UnitTypes they share.
+        Units the pool recycled since are re-initialized from their saved identity.
+        """
+        if self.unit_store is not None:
+            # The shared store is snapshotted by Simulation
+            return (self.mana,)
+        units = tuple(self.units)
+        values = tuple(chain.from_iterable(map(_unit_state, units)))
+        return self.mana, units, values, self.lane_index.snapshot(), self.lane_stats.snapshot()
+
+    def restore(self, state: tuple):
+        """Return to a state taken by snapshot()."""
+        if self.unit_store is not None:
+            self.mana, = state
+            return
+        self.mana, units, values, lane_state, stats_state = state
+        values = iter(values)
+        fields = [values] * len(UNIT_STATE)
+        for unit, seq, unit_type, lane, y, hp, cooldown, attacking in zip(units, *fields):
+            if unit.seq != seq:
+                unit.reset(unit_type, lane, self.is_player_side, seq)
+                unit.lane_stats = self.lane_stats
+            unit.y = unit.prev_y = y
+            unit.hp = hp
+            unit.attack_cooldown = cooldown
+            unit.is_attacking = attacking
+        self.units = list(units)
+        self.lane_index.restore(lane_state)
+        self.lane_stats.restore(stats_state)
+        # Pooled units may be alive again in the restored state
+        self.pool.clear()
+
     def get_units_in_lane(self, lane: int) -> list[Unit]:
         """Get all units in a specific lane."""
         return [u for u in self.units if u.lane == lane and u.is_alive]
 
+    def lane_summary(self, lane: int) -> tuple[int, int, float | None]:
+        """
+        Living unit count, hp total and frontier y (of the unit furthest from
+        our base) in a lane. O(1) apart from skipping dead units at the front.
+        """
+        if self.unit_store is not None:
+            return self.unit_store.lane_summary(self.is_player_side, lane)
+        front = self.lane_index.front(lane, lowest=self.is_player_side)
+        return self.lane_stats.counts[lane], self.lane_stats.hp[lane], front
+
     def check_win_condition(self) -> bool:
         """Check if any unit has reached the enemy base."""
+        if self.unit_store is not None:
+            return self.unit_store.reached_base(self.is_player_side)
         for unit in self.units:
             if unit.has_reached_enemy_base():
                 return True
@@ -0,0 +1,256 @@
+"""
+Precomputed AI policy: a table of the best move for every quantized state,
+built offline and memory-mapped by TableAI.
+
+A state is, per lane, the bucket of AI.calculate_lane_threat and of
+AI.calculate_lane_advantage, plus the whole mana (which also fixes the
+affordable units, since costs are whole). The build plays heuristic AI
+matches headless, and at positions sampled along them tries every legal
+move for each side: it restores a snapshot, plays the move, fast-forwards
+the match over a horizon and scores the outcome. The table keeps each
+state's best move on average, i.e. a best response to the heuristic AI,
+one byte per state. States no build match reached fall back to AI's
+heuristics.
+
+Usage: python -m src.policy_table [--output PATH] [--matches N] [--workers N]
+"""
+
+import mmap
+import struct
+import zlib
+from dataclasses import astuple
+from src.ai import AI, AIParams
+from src.unit_types import UNIT_TABLE
+from src.constants import NUM_LANES, MAX_MANA, AI_DECISION_INTERVAL, POLICY_TABLE_PATH, POLICY_BUCKETS
+
+# Threat and advantage bucket pairs per lane, and whole mana levels
+LANE_STATES = POLICY_BUCKETS * POLICY_BUCKETS
+MANA_LEVELS = MAX_MANA + 1
+TABLE_SIZE = LANE_STATES ** NUM_LANES * MANA_LEVELS
+
+# Moves, one byte each: save mana, no entry (decide heuristically), or
+# 1 + type_id * NUM_LANES + lane to spawn a unit type in a lane
+SAVE_MANA = 0
+NO_ENTRY = 255
+
+# File header: magic, format version, buckets, lanes, mana levels, checksum of
+# the unit types and AI parameters (see expected_header)
+HEADER = struct.Struct("<4sBBBBI")
+MAGIC = b"FWPT"
+VERSION = 2
+
+
+def bucket(value: float) -> int:
+    """Bucket of a threat or advantage from 0.0 to 1.0."""
+    return min(POLICY_BUCKETS - 1, int(value * POLICY_BUCKETS))
+
+
+def state_index(ai: AI, opponent) -> int:
+    """Index of an AI's current state in the table."""
+    index = 0
+    for lane in range(NUM_LANES):
+        threat = bucket(ai.calculate_lane_threat(lane, opponent))
+        advantage = bucket(ai.calculate_lane_advantage(lane, opponent))
+        index = index * LANE_STATES + threat * POLICY_BUCKETS + advantage
+    return index * MANA_LEVELS + min(int(ai.mana), MAX_MANA)
+
+
+def encode_move(type_id: int, lane: int) -> int:
+    return 1 + type_id * NUM_LANES + lane
+
+
+def decode_move(move: int) -> tuple[int, int]:
+    """(type id, lane) of a spawning move."""
+    return divmod(move - 1, NUM_LANES)
+
+
+def legal_moves(mana: float) -> list[int]:
+    """Saving mana, plus every affordable unit type in every lane."""
+    mask = UNIT_TABLE.affordable_mask(mana)
+    return [SAVE_MANA] + [encode_move(type_id, lane)
+                          for type_id in range(len(UNIT_TABLE)) if mask >> type_id & 1
+                          for lane in range(NUM_LANES)]
+
+
+def expected_header() -> bytes:
+    """
+    Header of a table built with the current settings. Its checksum covers
+    every unit type's cost and combat stats, and the parameters of the AI the
+    table answers, which a parameters file (see src.params) may all change.
+    """
+    types = ";".join(
+        f"{name}:{t.cost},{t.hp},{t.damage},{t.speed},{t.range},{t.attack_cooldown!r}"
+        for name, t in zip(UNIT_TABLE.names, UNIT_TABLE.types)
+    )
+    ai = ",".join(repr(value) for value in astuple(AIParams()))
+    checksum = zlib.crc32(f"{types}|{ai}".encode())
+    return HEADER.pack(MAGIC, VERSION, POLICY_BUCKETS, NUM_LANES, MANA_LEVELS, checksum)
+
+
+def write_table(path: str, moves: bytes):
+    """Write a table of TABLE_SIZE moves."""
+    if len(moves) != TABLE_SIZE:
+        raise ValueError(f"A policy table has {TABLE_SIZE} entries, not {len(moves)}")
+    with open(path, "wb") as f:
+        f.write(expected_header())
+        f.write(moves)
+
+
+class PolicyTable:
+    """A built table, memory-mapped read-only so every AI (and process) using it shares its pages."""
+
+    def __init__(self, path: str):
+        try:
+            f = open(path, "rb")
+        except FileNotFoundError:
+            raise FileNotFoundError(f"No policy table at {path}; build one with make policy-table") from None
+        with f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.data[:HEADER.size] != expected_header() or len(self.data) != HEADER.size + TABLE_SIZE:
+            self.data.close()
+            raise ValueError(f"{path} was built for other settings, unit stats or AI parameters; rebuild it")
+
+    def move(self, index: int) -> int:
+        return self.data[HEADER.size + index]
+
+    def coverage(self) -> float:
+        """Fraction of states with an entry."""
+        return 1 - self.data[HEADER.size:].count(NO_ENTRY) / TABLE_SIZE
+
+    def close(self):
+        self.data.close()
+
+
+# Tables by path, opened once per process and shared by every TableAI
+_tables: dict[str, PolicyTable] = {}
+
+
+def load_table(path: str = POLICY_TABLE_PATH) -> PolicyTable:
+    table = _tables.get(path)
+    if table is None:
+        table = _tables[path] = PolicyTable(path)
+    return table
+
+
+class TableAI(AI):
+    """
+    AI that decides with one lookup in a policy table built by this module's
+    CLI, and with AI's heuristics in states the table has no entry for.
+    """
+
+    def __init__(self, is_player_side: bool = False, params: AIParams | None = None,
+                 rng=None, table: PolicyTable | None = None):
+        super().__init__(is_player_side=is_player_side, params=params, rng=rng)
+        self.table = table or load_table()
+
+    def make_decision(self, opponent):
+        move = self.table.move(state_index(self, opponent))
+        if move == NO_ENTRY:
+            super().make_decision(opponent)
+        elif move != SAVE_MANA:
+            type_id, lane = decode_move(move)
+            self.spawn_unit(UNIT_TABLE.names[type_id], lane)
+
+
+def score(simulation, side: str) -> float:
+    """Value of a match state for a side, from 0 (lost) to 1 (won)."""
+    # Imported here with the rest of the build, which TableAI doesn't need
+    from src.search_ai import ForwardModel, BOTTOM, TOP
+    from src.simulation import PLAYER_SIDE
+    if simulation.game_over:
+        return float(simulation.winner == side)
+    model = ForwardModel.capture(simulation.player, simulation.enemy)
+    return model.score(BOTTOM if side == PLAYER_SIDE else TOP)
+
+
+def evaluate_match(task: tuple[int, float, float, float]) -> list[tuple[int, list[tuple[int, float]]]]:
+    """
+    Play one heuristic AI match and, every interval seconds, score every
+    legal move of both sides; return (state index, [(move, score)]) per
+    position and side.
+    """
+    from src.fast_forward import FastForward
+    from src.simulation import Simulation, SIDES, PLAYER_SIDE, ENEMY_SIDE
+
+    seed, interval, horizon, max_time = task
+    simulation = Simulation(player_ai=True, seed=seed)
+    every = max(1, round(interval * simulation.tick_rate))
+    positions = []
+    while not simulation.game_over and simulation.time < max_time:
+        if simulation.ticks % every == 0:
+            snapshot = simulation.snapshot()
+            for side in SIDES:
+                ai = simulation.get_side(side)
+                opponent = simulation.get_side(ENEMY_SIDE if side == PLAYER_SIDE else PLAYER_SIDE)
+                index = state_index(ai, opponent)
+                scores = []
+                for move in legal_moves(ai.mana):
+                    simulation.restore(snapshot)
+                    if move != SAVE_MANA:
+                        type_id, lane = decode_move(move)
+                        simulation.apply_action(side, UNIT_TABLE.names[type_id], lane)
+                    # The move stands in for the AI's next decision
+                    ai.decision_timer = 0.0
+                    FastForward(simulation).run(max_time=simulation.time + horizon)
+                    scores.append((move, score(simulation, side)))
+                positions.append((index, scores))
+            simulation.restore(snapshot)
+        simulation.step()
+    return positions
+
+
+def build_table(matches: int, workers: int, seed: int = 0, interval: float = AI_DECISION_INTERVAL,
+                horizon: float = 10.0, max_time: float = 300.0) -> tuple[bytearray, int]:
+    """Moves for every state from matches build matches, and the number of positions scored."""
+    from multiprocessing import Pool
+
+    if 1 + len(UNIT_TABLE) * NUM_LANES >= NO_ENTRY:
+        raise ValueError("Too many unit types and lanes for one-byte moves")
+    totals: dict[int, dict[int, float]] = {}
+    tasks = [(seed + index, interval, horizon, max_time) for index in range(matches)]
+    positions = 0
+    with Pool(workers) as pool:
+        # In match order, so the sums and the table don't depend on the workers
+        for results in pool.imap(evaluate_match, tasks):
+            for index, scores in results:
+                state_totals = totals.setdefault(index, {})
+                for move, value in scores:
+                    state_totals[move] = state_totals.get(move, 0.0) + value
+                positions += 1
+
+    moves = bytearray([NO_ENTRY]) * TABLE_SIZE
+    for index, state_totals in totals.items():
+        # Ties go to the lowest move, saving mana first
+        moves[index] = max(sorted(state_totals), key=state_totals.__getitem__)
+    return moves, positions
+
+
+def main():
+    import argparse
+    import os
+    import time
+
+    parser = argparse.ArgumentParser(description="Build the policy table for TableAI")
+    parser.add_argument("--output", default=POLICY_TABLE_PATH)
+    parser.add_argument("--matches", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--interval", type=float, default=AI_DECISION_INTERVAL,
+                        help="game seconds between the positions scored in a match")
+    parser.add_argument("--horizon", type=float, default=10.0,
+                        help="game seconds played out after each move")
+    parser.add_argument("--max-time", type=float, default=300.0)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    moves, positions = build_table(args.matches, args.workers, args.seed, args.interval,
+                                   args.horizon, args.max_time)
+    write_table(args.output, moves)
+    table = PolicyTable(args.output)
+    print(f"{positions} positions from {args.matches} matches in {time.perf_counter() - start:.1f}s")
+    print(f"wrote {args.output}: {TABLE_SIZE} states, {table.coverage():.1%} with an entry")
+    table.close()
+
+
+if __name__ == "__main__":
+    main()
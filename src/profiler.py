@@ -0,0 +1,221 @@
+import time
+from array import array
+import pygame
+
+# Timed phases of a frame. Times are exclusive: "enemy" doesn't include "ai".
+# "flip" includes drawing the overlay.
+PHASES = ("events", "player", "enemy", "ai", "win_check", "battlefield", "units", "ui", "flip")
+# Columns of a buffer row: the phases, then the whole frame and the live unit count
+COLUMNS = PHASES + ("frame", "unit_count")
+FRAME = len(PHASES)
+UNITS = FRAME + 1
+
+OVERLAY_BG = (0, 0, 0, 170)
+OVERLAY_TEXT = (220, 220, 120)
+OVERLAY_REFRESH_FRAMES = 30
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of already sorted values."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+class FrameProfiler:
+    """
+    Per-phase frame timings in a fixed-size ring buffer, with an overlay of
+    frame time percentiles. Enabling it replaces the timed methods of the
+    game's objects with timing wrappers on the instances; disabling deletes
+    the wrappers again, so a disabled profiler costs nothing per frame.
+    """
+
+    def __init__(self, capacity: int = 600):
+        self.capacity = capacity
+        self.buffer = array("d", bytes(8 * capacity * len(COLUMNS)))
+        self.count = 0          # frames recorded so far, including overwritten ones
+        self.enabled = False
+        self.game = None
+        self._installed: list[tuple[object, str]] = []
+        self._current = [0.0] * len(PHASES)
+        self._frame_start = None
+        # Time spent in nested timed calls, one entry per active wrapper
+        self._children: list[float] = []
+        self._font = None
+        self._overlay = None
+
+    def toggle(self, game):
+        if self.enabled:
+            self.disable()
+        else:
+            self.enable(game)
+
+    def enable(self, game):
+        self.enabled = True
+        self.attach(game)
+
+    def disable(self):
+        self.enabled = False
+        self.detach()
+        # Let the dirty-rect renderer repaint what the overlay covered
+        if self.game is not None and self.game.renderer is not None:
+            self.game.renderer.invalidate()
+
+    def attach(self, game):
+        """Install timing wrappers on a game's current objects (again after a reset)."""
+        self.detach()
+        self.game = game
+        simulation = game.simulation
+        self._wrap(game, "handle_events", "events", self._start_frame)
+        self._wrap(game, "render", None, after=self._end_frame)
+        self._wrap(game, "present", "flip", self._draw_overlay)
+        # A simulation on its own thread isn't part of the frame, so isn't timed
+        if game.sim_thread is None:
+            self._wrap(simulation.player, "update", "player")
+            self._wrap(simulation.enemy, "update", "enemy")
+            for side in (simulation.player, simulation.enemy):
+                # AI decides in make_decision, SearchAI in start_search
+                for name in ("make_decision", "start_search"):
+                    if hasattr(side, name):
+                        self._wrap(side, name, "ai")
+                self._wrap(side, "check_win_condition", "win_check")
+        self._wrap(game.battlefield, "render", "battlefield")
+        self._wrap(game.battlefield, "render_units", "units")
+        for name in ("render_header", "render_footer", "render_game_over"):
+            self._wrap(game.ui, name, "ui")
+        if game.renderer is not None:
+            # Restoring the background and drawing units happen inside render
+            self._wrap(game.renderer, "render", "units")
+            self._wrap(game.renderer, "present", "flip", self._draw_overlay)
+
+    def detach(self):
+        """Remove the wrappers, restoring the classes' methods."""
+        for obj, name in self._installed:
+            vars(obj).pop(name, None)
+        self._installed = []
+        self._frame_start = None
+        self._children = []
+
+    def _wrap(self, obj, name: str, phase: str | None, before=None, after=None):
+        """Replace obj.name with a wrapper timing it as phase (None: only run the hooks)."""
+        method = getattr(obj, name)
+        perf_counter = time.perf_counter
+        children = self._children
+        current = self._current
+
+        if phase is None:
+            def hooked(*args, **kwargs):
+                if before is not None:
+                    before(*args)
+                try:
+                    return method(*args, **kwargs)
+                finally:
+                    if after is not None:
+                        after()
+
+            setattr(obj, name, hooked)
+            self._installed.append((obj, name))
+            return
+
+        index = PHASES.index(phase)
+
+        def timed(*args, **kwargs):
+            start = perf_counter()
+            children.append(0.0)
+            try:
+                if before is not None:
+                    before(*args)
+                return method(*args, **kwargs)
+            finally:
+                elapsed = perf_counter() - start
+                current[index] += elapsed - children.pop()
+                if children:
+                    children[-1] += elapsed
+                if after is not None:
+                    after()
+
+        setattr(obj, name, timed)
+        self._installed.append((obj, name))
+
+    def _start_frame(self, *args):
+        for i in range(len(PHASES)):
+            self._current[i] = 0.0
+        self._frame_start = time.perf_counter()
+
+    def _end_frame(self):
+        if self._frame_start is None:
+            return
+        row = (self.count % self.capacity) * len(COLUMNS)
+        self.buffer[row:row + FRAME] = array("d", self._current)
+        self.buffer[row + FRAME] = time.perf_counter() - self._frame_start
+        game = self.game
+        self.buffer[row + UNITS] = len(game.player.units) + len(game.enemy.units)
+        self.count += 1
+        self._frame_start = None
+
+    def rows(self) -> list[list[float]]:
+        """Recorded frames, oldest first."""
+        width = len(COLUMNS)
+        frames = min(self.count, self.capacity)
+        first = self.count - frames
+        return [
+            self.buffer[(i % self.capacity) * width:(i % self.capacity + 1) * width].tolist()
+            for i in range(first, self.count)
+        ]
+
+    def summary(self) -> dict:
+        """Frame time percentiles in ms, mean phase times in ms and the last unit count."""
+        rows = self.rows()
+        frames = sorted(row[FRAME] * 1000 for row in rows)
+        means = {
+            phase: sum(row[i] for row in rows) * 1000 / len(rows) if rows else 0.0
+            for i, phase in enumerate(PHASES)
+        }
+        return {
+            "frames": len(rows),
+            "p50": percentile(frames, 0.50),
+            "p95": percentile(frames, 0.95),
+            "p99": percentile(frames, 0.99),
+            "phases": means,
+            "units": int(rows[-1][UNITS]) if rows else 0,
+        }
+
+    def export(self, path: str):
+        """Write the buffer as CSV, times in seconds."""
+        with open(path, "w") as f:
+            f.write(",".join(COLUMNS) + "\n")
+            for row in self.rows():
+                f.write(",".join(f"{value:.9f}" for value in row[:UNITS]) + f",{int(row[UNITS])}\n")
+
+    def _draw_overlay(self, *args):
+        """Draw the stats panel onto the screen right before it is presented."""
+        if self._overlay is None or self.count % OVERLAY_REFRESH_FRAMES == 0:
+            self._overlay = self._render_overlay()
+        self.game.screen.blit(self._overlay, (5, 5))
+        renderer = self.game.renderer
+        if renderer is not None:
+            rect = self._overlay.get_rect(topleft=(5, 5))
+            # The dirty-rect renderer only pushes the areas it is given, and
+            # only repaints under the overlay next frame if told about it
+            if args and isinstance(args[0], list):
+                args[0].append(rect)
+            renderer.add_overlay(rect)
+
+    def _render_overlay(self) -> pygame.Surface:
+        if self._font is None:
+            self._font = pygame.font.Font(None, 20)
+        stats = self.summary()
+        lines = [
+            f"frame ms p50 {stats['p50']:.2f}  p95 {stats['p95']:.2f}  p99 {stats['p99']:.2f}",
+            f"units {stats['units']}  frames {stats['frames']}",
+        ]
+        lines += [f"{phase:<12}{ms:.3f} ms" for phase, ms in stats["phases"].items()]
+        surfaces = [self._font.render(line, True, OVERLAY_TEXT) for line in lines]
+        width = max(surface.get_width() for surface in surfaces) + 10
+        line_height = self._font.get_linesize()
+        panel = pygame.Surface((width, line_height * len(lines) + 10), pygame.SRCALPHA)
+        panel.fill(OVERLAY_BG)
+        for i, surface in enumerate(surfaces):
+            panel.blit(surface, (5, 5 + i * line_height))
+        return panel
@@ -0,0 +1,120 @@
+import struct
+import zlib
+from src.simulation import Simulation, PLAYER_SIDE, ENEMY_SIDE
+from src.unit_types import UNIT_TABLE
+
+# Bumped whenever a message layout or the unit table changes
+PROTOCOL_VERSION = 1
+
+# Unit ids on the wire are indexes into this table, as in replay files
+UNIT_NAMES = UNIT_TABLE.names
+UNIT_IDS = UNIT_TABLE.ids
+# Sides on the wire: 0 is the bottom (player) side, 1 the top (enemy) side
+SIDE_NAMES = (PLAYER_SIDE, ENEMY_SIDE)
+
+# Every message starts with its type byte. All messages have a fixed size,
+# except FRAME, whose header says how many COMMAND records follow it.
+# Client to server
+JOIN = 1            # protocol version, flags
+SPAWN = 2           # unit id, lane
+CHECKSUM = 3        # tick, crc32 of the state before that tick
+RESULT = 4          # tick the match ended on, winning side
+# Server to client
+START = 16          # match id, side, seed, tick rate, input delay, turn ticks, flags
+FRAME = 17          # through tick, command count, then the commands
+END = 18            # reason
+
+MESSAGES = {
+    JOIN: struct.Struct("<BHB"),
+    SPAWN: struct.Struct("<BBB"),
+    CHECKSUM: struct.Struct("<BII"),
+    RESULT: struct.Struct("<BIB"),
+    START: struct.Struct("<BIBqHHHB"),
+    FRAME: struct.Struct("<BIB"),
+    END: struct.Struct("<BB"),
+}
+# Spawn to run at a tick, part of a FRAME
+COMMAND = struct.Struct("<IBBB")     # tick, side, unit id, lane
+# Most commands a FRAME can carry (the count is one byte)
+MAX_FRAME_COMMANDS = 255
+
+# JOIN and START flags
+FLAG_VS_AI = 1      # play against an AI run in lockstep by the client
+
+# END reasons
+END_FINISHED = 0
+END_OPPONENT_LEFT = 1
+END_DESYNC = 2
+END_PROTOCOL_ERROR = 3
+END_SERVER_SHUTDOWN = 4
+END_MESSAGES = {
+    END_FINISHED: "match over",
+    END_OPPONENT_LEFT: "opponent left",
+    END_DESYNC: "desync detected",
+    END_PROTOCOL_ERROR: "protocol error",
+    END_SERVER_SHUTDOWN: "server shut down",
+}
+
+
+def end_message(reason: int | None) -> str:
+    """Description of an END reason (None: the connection just dropped)."""
+    return END_MESSAGES.get(reason, "disconnected")
+
+
+class ProtocolError(Exception):
+    """A peer sent something that isn't a valid message."""
+
+
+def encode(message_type: int, *fields) -> bytes:
+    return MESSAGES[message_type].pack(message_type, *fields)
+
+
+def encode_frame(through_tick: int, commands: list[tuple[int, int, int, int]]) -> bytes:
+    """FRAME granting every tick up to through_tick, with the commands (tick, side, unit id, lane)."""
+    pack = COMMAND.pack
+    return MESSAGES[FRAME].pack(FRAME, through_tick, len(commands)) + b"".join(
+        pack(*command) for command in commands
+    )
+
+
+class MessageReader:
+    """Splits a byte stream into messages, as tuples of their fields (type first)."""
+
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def feed(self, data: bytes) -> list[tuple]:
+        """Add received bytes; return the messages they completed."""
+        self.buffer += data
+        buffer = self.buffer
+        messages = []
+        offset = 0
+        while offset < len(buffer):
+            layout = MESSAGES.get(buffer[offset])
+            if layout is None:
+                raise ProtocolError(f"Unknown message type {buffer[offset]}")
+            end = offset + layout.size
+            if end > len(buffer):
+                break
+            message = layout.unpack_from(buffer, offset)
+            if message[0] == FRAME:
+                count = message[2]
+                end += count * COMMAND.size
+                if end > len(buffer):
+                    break
+                commands = [COMMAND.unpack_from(buffer, offset + layout.size + i * COMMAND.size)
+                            for i in range(count)]
+                message = message + (commands,)
+            messages.append(message)
+            offset = end
+        del buffer[:offset]
+        return messages
+
+
+def state_checksum(simulation: Simulation) -> int:
+    """crc32 of the state lockstep peers must agree on, to detect desyncs."""
+    values = [simulation.ticks, simulation.player.mana, simulation.enemy.mana]
+    for side in (simulation.player, simulation.enemy):
+        for unit in side.units:
+            values += (unit.lane, unit.y, unit.hp)
+    return zlib.crc32(struct.pack(f"<{len(values)}d", *values))
@@ -0,0 +1,142 @@
+import pygame
+from src.constants import (
+    SCREEN_WIDTH, SCREEN_HEIGHT, HEADER_HEIGHT, FOOTER_HEIGHT, BATTLEFIELD_HEIGHT,
+    MAX_MANA, BLACK
+)
+from src.player import Player
+from src.battlefield import Battlefield
+from src.ui import UI
+
+# Width of the mana bar fill in UI.render_footer
+MANA_BAR_WIDTH = 300
+
+# Beyond this many unit sprites, repainting the whole battlefield is cheaper
+# than restoring and updating each one
+MAX_UNIT_RECTS = 128
+
+
+class DirtyRectRenderer:
+    """
+    Alternative to Game.render that only repaints what changed. The static
+    battlefield is drawn once onto a background surface; each frame restores
+    the areas units covered last frame from it, draws the units, redraws the
+    header and footer only when what they show changes, and pushes just those
+    rectangles with pygame.display.update. Needs the battlefield's SpriteAtlas.
+    """
+
+    def __init__(self, screen: pygame.Surface, battlefield: Battlefield, ui: UI):
+        self.screen = screen
+        self.battlefield = battlefield
+        self.ui = ui
+
+        self.background = pygame.Surface(screen.get_size()).convert()
+        self.background.fill(BLACK)
+        battlefield.render(self.background)
+
+        self.battlefield_rect = pygame.Rect(0, HEADER_HEIGHT, SCREEN_WIDTH, BATTLEFIELD_HEIGHT)
+        self.header_rect = pygame.Rect(0, 0, SCREEN_WIDTH, HEADER_HEIGHT)
+        self.footer_rect = pygame.Rect(0, SCREEN_HEIGHT - FOOTER_HEIGHT, SCREEN_WIDTH, FOOTER_HEIGHT)
+
+        # Screen areas covered by units in the last frame, None for the whole battlefield
+        self.unit_rects: list[pygame.Rect] | None = []
+        # Screen areas drawn over the last frame after render, see add_overlay
+        self.overlay_rects: list[pygame.Rect] = []
+        # What the header and footer currently show
+        self.header_state = None
+        self.footer_state = None
+        self.full_redraw = True
+        self.game_over_shown = False
+
+    def add_overlay(self, rect: pygame.Rect):
+        """
+        Note an area drawn over the frame after render (e.g. the profiler's
+        overlay), so the next frame repaints under it instead of drawing a
+        translucent overlay over its last copy.
+        """
+        self.overlay_rects.append(rect)
+
+    def invalidate(self):
+        """Repaint the whole screen next frame (e.g. after a reset)."""
+        self.full_redraw = True
+        self.game_over_shown = False
+
+    def render(self, player: Player, enemy: Player, game_over: bool, player_won: bool,
+               alpha: float = 1.0):
+        """Render a frame, updating only the dirty parts of the display."""
+        if game_over:
+            # The final frame doesn't change, so it is drawn in full once
+            if not self.game_over_shown:
+                self.full_redraw = True
+                self._render(player, enemy, alpha)
+                self.ui.render_game_over(self.screen, player_won)
+                self.present(None)
+                self.game_over_shown = True
+            return
+
+        dirty = self._render(player, enemy, alpha)
+        if self.full_redraw:
+            self.present(None)
+            self.full_redraw = False
+        else:
+            self.present(dirty)
+
+    def present(self, dirty: list[pygame.Rect] | None):
+        """Push the frame to the display: all of it, or only the dirty rectangles."""
+        if dirty is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(dirty)
+
+    def _render(self, player: Player, enemy: Player, alpha: float) -> list[pygame.Rect]:
+        """Draw the frame and return the rectangles that changed."""
+        screen = self.screen
+        if self.full_redraw:
+            screen.blit(self.background, (0, 0))
+            dirty = []
+        elif self.unit_rects is None:
+            screen.blit(self.background, self.battlefield_rect, self.battlefield_rect)
+            dirty = [self.battlefield_rect]
+        else:
+            # Erase last frame's units
+            dirty = self.unit_rects
+            screen.blits([(self.background, rect, rect) for rect in dirty], doreturn=False)
+
+        # Erase last frame's overlays, making the header and footer they covered redraw
+        if self.overlay_rects:
+            for rect in self.overlay_rects:
+                screen.blit(self.background, rect, rect)
+                if rect.colliderect(self.header_rect):
+                    self.header_state = None
+                if rect.colliderect(self.footer_rect):
+                    self.footer_state = None
+            dirty = dirty + self.overlay_rects
+            self.overlay_rects = []
+
+        # Units are clipped to the battlefield, as the header and footer cover them in a full render
+        sprites = self.battlefield.sprites
+        screen.set_clip(self.battlefield_rect)
+        blits = sprites.unit_blits(player.units, alpha) + sprites.unit_blits(enemy.units, alpha)
+        if len(blits) > MAX_UNIT_RECTS:
+            screen.blits(blits, doreturn=False)
+            self.unit_rects = None
+            if self.battlefield_rect not in dirty:
+                dirty = dirty + [self.battlefield_rect]
+        else:
+            self.unit_rects = screen.blits(blits)
+            dirty = dirty + self.unit_rects
+        screen.set_clip(None)
+
+        # Mana labels and card states change on integer boundaries, the bar by the pixel
+        header_state = int(enemy.mana)
+        if self.full_redraw or header_state != self.header_state:
+            self.ui.render_header(screen, enemy.mana)
+            self.header_state = header_state
+            dirty.append(self.header_rect)
+
+        selected = self.ui.deck.selected_card
+        footer_state = (int(player.mana), int(player.mana / MAX_MANA * MANA_BAR_WIDTH), selected)
+        if self.full_redraw or footer_state != self.footer_state:
+            self.ui.render_footer(screen, player.mana, selected)
+            self.footer_state = footer_state
+            dirty.append(self.footer_rect)
+        return dirty
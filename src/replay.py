@@ -0,0 +1,187 @@
+import struct
+from dataclasses import dataclass, field
+
+from src.constants import TICK_RATE
+from src.player import Player
+from src.simulation import Simulation, SimulationSnapshot, SIDES, PLAYER_SIDE, ENEMY_SIDE
+from src.unit_types import UNIT_TABLE
+
+# File layout: header, unit name table, then fixed-size action records
+MAGIC = b"FWR2"
+HEADER = struct.Struct("<4sHqiB")    # magic, tick rate, seed (-1 if none), end tick (-1 if none), unit name count
+# Files from before the end tick was recorded
+MAGIC_V1 = b"FWR1"
+HEADER_V1 = struct.Struct("<4sHqB")
+RECORD = struct.Struct("<IBBB")      # tick, flags, unit id, lane
+
+# Record flags
+FLAG_ENEMY = 1      # action by the enemy (top) side
+FLAG_IN_STEP = 2    # spawned during the tick's update (AI), not before it (input)
+
+
+@dataclass(frozen=True)
+class Action:
+    tick: int
+    side: str
+    unit_name: str
+    lane: int
+    in_step: bool
+
+
+@dataclass
+class ActionLog:
+    """Every spawn of a deterministic match: enough to rebuild any of its ticks."""
+    tick_rate: int = TICK_RATE
+    seed: int | None = None
+    actions: list[Action] = field(default_factory=list)
+    # Tick the recording stopped at, which is before the match ended if it was abandoned
+    end_tick: int | None = None
+
+    def to_bytes(self) -> bytes:
+        names = UNIT_TABLE.names
+        ids = UNIT_TABLE.ids
+        chunks = [HEADER.pack(MAGIC, self.tick_rate, -1 if self.seed is None else self.seed,
+                              -1 if self.end_tick is None else self.end_tick, len(names))]
+        for name in names:
+            encoded = name.encode()
+            chunks.append(bytes([len(encoded)]) + encoded)
+        for action in self.actions:
+            flags = (FLAG_ENEMY if action.side == ENEMY_SIDE else 0) | (FLAG_IN_STEP if action.in_step else 0)
+            chunks.append(RECORD.pack(action.tick, flags, ids[action.unit_name], action.lane))
+        return b"".join(chunks)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "ActionLog":
+        if data[:len(MAGIC)] == MAGIC_V1:
+            magic, tick_rate, seed, name_count = HEADER_V1.unpack_from(data)
+            end_tick = -1
+            offset = HEADER_V1.size
+        else:
+            magic, tick_rate, seed, end_tick, name_count = HEADER.unpack_from(data)
+            if magic != MAGIC:
+                raise ValueError("Not a Forever War replay")
+            offset = HEADER.size
+        names = []
+        for _ in range(name_count):
+            length = data[offset]
+            names.append(data[offset + 1:offset + 1 + length].decode())
+            offset += 1 + length
+
+        log = cls(tick_rate=tick_rate, seed=None if seed < 0 else seed,
+                  end_tick=None if end_tick < 0 else end_tick)
+        for tick, flags, unit_id, lane in RECORD.iter_unpack(data[offset:]):
+            side = ENEMY_SIDE if flags & FLAG_ENEMY else PLAYER_SIDE
+            log.actions.append(Action(tick, side, names[unit_id], lane, bool(flags & FLAG_IN_STEP)))
+        return log
+
+    def save(self, path: str):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str) -> "ActionLog":
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+def record(simulation: Simulation) -> ActionLog:
+    """
+    Start logging every spawn of a simulation, which should use a fixed
+    timestep. Set the log's end_tick when recording stops.
+    """
+    log = ActionLog(tick_rate=simulation.tick_rate, seed=simulation.seed)
+
+    def listener(side: str):
+        def on_spawn(unit_name: str, lane: int):
+            log.actions.append(Action(simulation.ticks, side, unit_name, lane, simulation.in_step))
+        return on_spawn
+
+    for side in SIDES:
+        simulation.get_side(side).spawn_listener = listener(side)
+    return log
+
+
+class ScriptedPlayer(Player):
+    """Player replaying the in-step spawns of a log at the point an AI would make them."""
+
+    def __init__(self, is_player_side: bool, actions: dict[int, list[Action]]):
+        super().__init__(is_human=False, is_player_side=is_player_side)
+        self.actions = actions
+        self.tick = 0
+
+    def act(self, dt: float, opponent: Player):
+        for action in self.actions.get(self.tick, ()):
+            self.spawn_unit(action.unit_name, action.lane)
+        self.tick += 1
+
+    def idle_ticks(self, dt: float) -> int | None:
+        upcoming = [tick for tick in self.actions if tick >= self.tick]
+        if not upcoming:
+            return None
+        return min(upcoming) - self.tick
+
+    def coast(self, ticks: int, dt: float, opponent: Player):
+        super().coast(ticks, dt, opponent)
+        self.tick += ticks
+
+    def snapshot(self) -> tuple:
+        return super().snapshot() + (self.tick,)
+
+    def restore(self, state: tuple):
+        super().restore(state[:-1])
+        self.tick = state[-1]
+
+
+class Replay:
+    """
+    Rebuilds a recorded match from its ActionLog. Keyframes are taken every
+    keyframe_interval ticks while playing forward, so seeking backwards only
+    replays the ticks since the closest earlier keyframe.
+    """
+
+    def __init__(self, log: ActionLog, keyframe_interval: int = 600):
+        self.log = log
+        self.keyframe_interval = keyframe_interval
+        self.inputs: dict[int, list[Action]] = {}
+        scripts: dict[str, dict[int, list[Action]]] = {side: {} for side in SIDES}
+        for action in log.actions:
+            actions = scripts[action.side] if action.in_step else self.inputs
+            actions.setdefault(action.tick, []).append(action)
+
+        self.simulation = Simulation(
+            player=ScriptedPlayer(True, scripts[PLAYER_SIDE]),
+            enemy=ScriptedPlayer(False, scripts[ENEMY_SIDE]),
+            tick_rate=log.tick_rate,
+        )
+        self.keyframes: dict[int, SimulationSnapshot] = {}
+
+    @property
+    def tick(self) -> int:
+        return self.simulation.ticks
+
+    def step(self):
+        """Apply the inputs recorded for the current tick and advance one tick."""
+        simulation = self.simulation
+        if simulation.ticks % self.keyframe_interval == 0 and simulation.ticks not in self.keyframes:
+            self.keyframes[simulation.ticks] = simulation.snapshot()
+        for action in self.inputs.get(simulation.ticks, ()):
+            simulation.apply_action(action.side, action.unit_name, action.lane)
+        simulation.step()
+
+    def seek(self, tick: int) -> Simulation:
+        """Move to the state right before the given tick is played."""
+        if tick < self.simulation.ticks:
+            start = max((t for t in self.keyframes if t <= tick), default=None)
+            if start is None:
+                raise ValueError(f"No keyframe before tick {tick}")
+            self.simulation.restore(self.keyframes[start])
+        while self.simulation.ticks < tick and not self.simulation.game_over:
+            self.step()
+        return self.simulation
+
+    def run(self) -> Simulation:
+        """Play until the match ends, or to the end tick of a recording stopped before that."""
+        end_tick = self.log.end_tick
+        while not self.simulation.game_over and (end_tick is None or self.simulation.ticks < end_tick):
+            self.step()
+        return self.simulation
@@ -0,0 +1,355 @@
+import math
+import random
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+
+from src.player import Player
+from src.fast_forward import ticks_until
+from src.unit_types import UNIT_TABLE
+from src.constants import (
+    AI_DECISION_INTERVAL, SEARCH_AI_BUDGET, SEARCH_AI_HORIZON,
+    SEARCH_AI_MODEL_DT, SEARCH_AI_WAITS, SEARCH_AI_CANDIDATES,
+    NUM_LANES, MAX_MANA, MANA_REGEN_RATE, PLAYER_BASE_Y, ENEMY_BASE_Y
+)
+
+# Unit kinds are UnitType.type_id, indexes into UNIT_NAMES
+UNIT_NAMES = UNIT_TABLE.names
+# Costs are the same for every player (see UnitTypeTable.with_stats); other stats aren't
+KIND_COSTS = list(UNIT_TABLE.costs)
+
+# Model sides: 0 is the bottom (player) side, 1 the top (enemy) side
+BOTTOM = 0
+TOP = 1
+
+# A move: unit kind to spawn (None to save mana), lane, and seconds to wait first
+Move = tuple[int | None, int, float]
+SAVE_MANA: Move = (None, 0, 0.0)
+
+
+@dataclass(frozen=True)
+class SearchParams:
+    budget: float = SEARCH_AI_BUDGET
+    max_iterations: int | None = None
+    horizon: float = SEARCH_AI_HORIZON
+    model_dt: float = SEARCH_AI_MODEL_DT
+    decision_interval: float = AI_DECISION_INTERVAL
+    exploration: float = 1.4
+    waits: tuple[float, ...] = SEARCH_AI_WAITS
+    candidates: int | None = SEARCH_AI_CANDIDATES
+
+
+class ForwardModel:
+    """
+    Coarse copy of a match for rollouts. Units are [y, hp, cooldown, kind]
+    lists bucketed by side and lane, stepped with a large timestep, and every
+    unit targets the opposing front unit of its lane. Each side plays with its
+    own stats per kind: hp, damage, speed, range, attack cooldown.
+    """
+
+    __slots__ = ("lanes", "mana", "stats", "time", "winner")
+
+    def __init__(self, lanes: tuple[list, list], mana: list[float], stats: tuple[list, list]):
+        self.lanes = lanes
+        self.mana = mana
+        self.stats = stats
+        self.time = 0.0
+        self.winner: int | None = None
+
+    @classmethod
+    def capture(cls, bottom: Player, top: Player) -> "ForwardModel":
+        """Model the current state of a match, with each player's own unit_types."""
+        lanes = ([[] for _ in range(NUM_LANES)], [[] for _ in range(NUM_LANES)])
+        stats = tuple(kind_stats(player) for player in (bottom, top))
+        for side, player in ((BOTTOM, bottom), (TOP, top)):
+            for unit in player.units:
+                if unit.hp > 0:
+                    cooldown = max(0.0, getattr(unit, "attack_cooldown", 0.0))
+                    kind = unit.unit_type.type_id
+                    lanes[side][unit.lane].append([unit.y, unit.hp, cooldown, kind])
+        return cls(lanes, [bottom.mana, top.mana], stats)
+
+    def copy(self) -> "ForwardModel":
+        lanes = tuple([[unit[:] for unit in lane] for lane in side] for side in self.lanes)
+        # Stats never change during a search, so copies share them
+        return ForwardModel(lanes, self.mana[:], self.stats)
+
+    def spawn(self, side: int, kind: int, lane: int):
+        self.mana[side] -= KIND_COSTS[kind]
+        y = PLAYER_BASE_Y if side == BOTTOM else ENEMY_BASE_Y
+        self.lanes[side][lane].append([y, self.stats[side][kind][0], 0.0, kind])
+
+    def random_spawn(self, side: int, rng: random.Random):
+        """Rollout policy: like the heuristic AI's fallback, spawn anything affordable once mana reaches 5."""
+        mana = self.mana[side]
+        if mana < 5:
+            return
+        kinds = [kind for kind, cost in enumerate(KIND_COSTS) if cost <= mana]
+        self.spawn(side, rng.choice(kinds), rng.randrange(NUM_LANES))
+
+    def step(self, dt: float):
+        for side in (BOTTOM, TOP):
+            self.mana[side] = min(MAX_MANA, self.mana[side] + MANA_REGEN_RATE * dt)
+            direction = -1 if side == BOTTOM else 1
+            stats = self.stats[side]
+            for lane, units in enumerate(self.lanes[side]):
+                enemies = self.lanes[1 - side][lane]
+                target = _front(enemies, 1 - side)
+                for unit in units:
+                    if unit[1] <= 0:
+                        continue
+                    _, damage, speed, max_range, cooldown = stats[unit[3]]
+                    unit[2] -= dt
+                    # Units meet head on, so the nearest enemy is the opposing front unit
+                    if target is None or abs(target[0] - unit[0]) > max_range:
+                        unit[0] += direction * speed * dt
+                    elif unit[2] <= 0:
+                        target[1] -= damage
+                        unit[2] = cooldown
+                        if target[1] <= 0:
+                            target = _front(enemies, 1 - side)
+
+        winner = None
+        for side in (TOP, BOTTOM):
+            for lane, units in enumerate(self.lanes[side]):
+                units = self.lanes[side][lane] = [unit for unit in units if unit[1] > 0]
+                front = _front(units, side)
+                if front is not None and _progress(side, front[0]) >= PLAYER_BASE_Y - ENEMY_BASE_Y:
+                    # Checked bottom last so it wins ties, like Simulation.step
+                    winner = side
+        self.winner = winner
+        self.time += dt
+
+    def score(self, side: int) -> float:
+        """Value of the state for a side, from 0 (lost) to 1 (won)."""
+        if self.winner is not None:
+            return 1.0 if self.winner == side else 0.0
+        max_distance = PLAYER_BASE_Y - ENEMY_BASE_Y
+        total = 0.0
+        for ours, theirs in zip(self.lanes[side], self.lanes[1 - side]):
+            our_hp = sum(unit[1] for unit in ours)
+            their_hp = sum(unit[1] for unit in theirs)
+            if our_hp + their_hp:
+                total += 0.7 * (our_hp - their_hp) / (our_hp + their_hp)
+            # Progress of each side's front unit toward the other base
+            our_front = _front(ours, side)
+            their_front = _front(theirs, 1 - side)
+            our_push = _progress(side, our_front[0]) if our_front else 0.0
+            their_push = _progress(1 - side, their_front[0]) if their_front else 0.0
+            total += 0.3 * (our_push - their_push) / max_distance
+        total += 0.1 * (self.mana[side] - self.mana[1 - side]) / MAX_MANA
+        return 0.5 + total / (2 * NUM_LANES + 0.2)
+
+
+def kind_stats(player: Player) -> list[tuple]:
+    """Per kind, the stats a player's units have: hp, damage, speed, range, attack cooldown."""
+    types = [player.unit_types[name] for name in UNIT_NAMES]
+    return [(t.hp, t.damage, t.speed, t.range, t.attack_cooldown) for t in types]
+
+
+def _progress(side: int, y: float) -> float:
+    """Distance of a y coordinate from a side's own base."""
+    return PLAYER_BASE_Y - y if side == BOTTOM else y - ENEMY_BASE_Y
+
+
+def _front(units: list[list], side: int) -> list | None:
+    """A side's living unit that has advanced furthest, if any."""
+    front = None
+    for unit in units:
+        if unit[1] > 0 and (front is None or (unit[0] < front[0] if side == BOTTOM else unit[0] > front[0])):
+            front = unit
+    return front
+
+
+def candidate_moves(mana: float, params: SearchParams) -> list[Move]:
+    """Saving mana, plus every unit and lane for each wait that makes the unit affordable."""
+    moves = [SAVE_MANA]
+    for wait in params.waits:
+        available = min(MAX_MANA, mana + MANA_REGEN_RATE * wait)
+        for kind, cost in enumerate(KIND_COSTS):
+            if cost <= available:
+                moves.extend((kind, lane, wait) for lane in range(NUM_LANES))
+    return moves
+
+
+def rollout(model: ForwardModel, side: int, move: Move, params: SearchParams,
+            rng: random.Random | None, deadline: float = math.inf) -> float | None:
+    """
+    Play a move, then both sides' rollout policy (none without an rng), until
+    the horizon; return the score, or None if the deadline passed first.
+    """
+    kind, lane, wait = move
+    pending = kind is not None
+    next_decision = [params.decision_interval, params.decision_interval]
+    perf_counter = time.perf_counter
+    while model.time < params.horizon and model.winner is None:
+        if perf_counter() >= deadline:
+            return None
+        if pending and model.time >= wait and model.mana[side] >= KIND_COSTS[kind]:
+            model.spawn(side, kind, lane)
+            pending = False
+        if rng is not None:
+            for s in (BOTTOM, TOP):
+                if model.time >= next_decision[s]:
+                    next_decision[s] += params.decision_interval
+                    if not (s == side and pending):
+                        model.random_spawn(s, rng)
+        model.step(params.model_dt)
+    return model.score(side)
+
+
+def prune(model: ForwardModel, side: int, moves: list[Move], params: SearchParams,
+          deadline: float) -> list[Move]:
+    """
+    Saving mana plus the best of the other moves, params.candidates in all,
+    ranked by one playout each in which nobody else spawns. Spread over
+    every move, the budget's rollouts would give most only one sample.
+    Ranking every move takes about 2ms in a midgame, so pruning only pays
+    off with a budget several times that.
+    """
+    if params.candidates is None or len(moves) <= params.candidates:
+        return moves
+    scores = {}
+    for move in moves[1:]:
+        value = rollout(model.copy(), side, move, params, None, deadline)
+        if value is None:
+            break
+        scores[move] = value
+    # Ties keep candidate order
+    ranked = sorted(scores, key=scores.__getitem__, reverse=True)
+    return [SAVE_MANA] + ranked[:params.candidates - 1]
+
+
+def search(model: ForwardModel, side: int, params: SearchParams,
+           rng: random.Random) -> tuple[Move, int]:
+    """
+    Anytime UCB1 search over the pruned candidate moves with random
+    rollouts. Runs until the time budget (or max_iterations) is used up, a
+    rollout the deadline cuts short not counting, and returns the move with
+    the best mean score so far, plus the number of rollouts played.
+    """
+    deadline = time.perf_counter() + params.budget
+    moves = prune(model, side, candidate_moves(model.mana[side], params), params, deadline)
+    visits = [0] * len(moves)
+    totals = [0.0] * len(moves)
+    # Every move gets one rollout, in random order, before UCB1 takes over
+    untried = list(range(len(moves)))
+    rng.shuffle(untried)
+
+    iterations = 0
+    while time.perf_counter() < deadline:
+        if params.max_iterations is not None and iterations >= params.max_iterations:
+            break
+        if untried:
+            i = untried.pop()
+        else:
+            log_total = math.log(iterations)
+            i = max(range(len(moves)), key=lambda j: totals[j] / visits[j]
+                    + params.exploration * math.sqrt(log_total / visits[j]))
+        value = rollout(model.copy(), side, moves[i], params, rng, deadline)
+        if value is None:
+            break
+        totals[i] += value
+        visits[i] += 1
+        iterations += 1
+
+    tried = [i for i in range(len(moves)) if visits[i]]
+    if not tried:
+        return SAVE_MANA, 0
+    best = max(tried, key=lambda i: totals[i] / visits[i])
+    return moves[best], iterations
+
+
+_executor: ThreadPoolExecutor | None = None
+
+
+def _search_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="search-ai")
+    return _executor
+
+
+class SearchAI(Player):
+    """
+    Opponent that picks spawns by Monte Carlo lookahead on a ForwardModel
+    under a hard per-decision time budget. With threaded=True the search runs
+    on a worker thread and its move is applied on a later frame, so the game
+    loop never waits for it (under the GIL it still shares the CPU, but for
+    at most the budget per decision).
+    """
+
+    params_class = SearchParams
+
+    def __init__(self, is_player_side: bool = False, params: SearchParams | None = None,
+                 rng: random.Random | None = None, threaded: bool = False):
+        super().__init__(is_human=False, is_player_side=is_player_side)
+        self.params = params or SearchParams()
+        self.rng = rng or random.Random()
+        self.threaded = threaded
+        self.decision_timer = 0.0
+        self.pending: Future | None = None
+        # Move waiting to be played, and the seconds left before playing it
+        self.planned: Move | None = None
+        self.plan_timer = 0.0
+        self.last_iterations = 0
+
+    def act(self, dt: float, opponent: Player):
+        """Play finished searches and start new ones."""
+        if self.pending is not None and self.pending.done():
+            self.plan(self.pending.result())
+            self.pending = None
+
+        if self.planned is not None:
+            self.plan_timer -= dt
+            if self.plan_timer <= 0:
+                kind, lane, _ = self.planned
+                self.planned = None
+                if self.can_afford(UNIT_NAMES[kind]):
+                    self.spawn_unit(UNIT_NAMES[kind], lane)
+
+        self.decision_timer += dt
+        if self.decision_timer >= self.params.decision_interval:
+            if self.pending is None and self.planned is None:
+                self.decision_timer = 0.0
+                self.start_search(opponent)
+
+    def start_search(self, opponent: Player):
+        """Search from the current state, in the background if threaded."""
+        if self.is_player_side:
+            model, side = ForwardModel.capture(self, opponent), BOTTOM
+        else:
+            model, side = ForwardModel.capture(opponent, self), TOP
+        # The search gets its own RNG so the worker never touches ours
+        rng = random.Random(self.rng.getrandbits(64))
+        if self.threaded:
+            self.pending = _search_executor().submit(search, model, side, self.params, rng)
+        else:
+            self.plan(search(model, side, self.params, rng))
+
+    def plan(self, result: tuple[Move, int]):
+        move, self.last_iterations = result
+        if move[0] is not None:
+            self.planned = move
+            self.plan_timer = move[2]
+
+    def idle_ticks(self, dt: float) -> int | None:
+        if self.pending is not None or self.planned is not None:
+            return 0
+        return ticks_until(self.decision_timer, self.params.decision_interval, dt) - 1
+
+    def coast(self, ticks: int, dt: float, opponent: Player):
+        super().coast(ticks, dt, opponent)
+        for _ in range(ticks):
+            self.decision_timer += dt
+
+    def snapshot(self) -> tuple:
+        return super().snapshot() + (self.decision_timer, self.rng.getstate(),
+                                     self.planned, self.plan_timer)
+
+    def restore(self, state: tuple):
+        # A search still running belongs to the abandoned timeline
+        super().restore(state[:-4])
+        self.decision_timer, rng_state, self.planned, self.plan_timer = state[-4:]
+        self.rng.setstate(rng_state)
+        self.pending = None
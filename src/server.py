@@ -0,0 +1,311 @@
+"""
+Lockstep match server: hosts many concurrent matches in one asyncio process.
+
+The server never simulates. Each match relays its players' spawns: a spawn
+received during a turn is scheduled input_delay ticks ahead, and once per
+turn every player gets a FRAME with the turn's commands and the tick up to
+which everything is now known. Clients simulate in lockstep up to that
+tick and report state checksums, which the server compares to catch desyncs.
+Every match has its own coroutine, woken each turn by one shared scheduler.
+
+Usage: python -m src.server [--host H] [--port N] [--input-delay TICKS] [--turn-ticks TICKS]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from collections import Counter
+
+from src.constants import (
+    TICK_RATE, SERVER_PORT, SERVER_INPUT_DELAY, SERVER_TURN_TICKS, SERVER_MAX_SPAWNS_PER_TURN,
+    NUM_LANES,
+)
+from src.protocol import (
+    PROTOCOL_VERSION, JOIN, SPAWN, CHECKSUM, RESULT, START, END, FLAG_VS_AI,
+    END_FINISHED, END_OPPONENT_LEFT, END_DESYNC, END_PROTOCOL_ERROR, END_SERVER_SHUTDOWN,
+    UNIT_NAMES, MAX_FRAME_COMMANDS, ProtocolError, MessageReader, encode, encode_frame,
+)
+
+# Clients whose unsent data grows past this many bytes are too slow and get dropped
+MAX_WRITE_BUFFER = 64 * 1024
+
+
+class TurnScheduler:
+    """Wakes every waiting match coroutine once per turn, on one shared clock."""
+
+    def __init__(self, turn_interval: float):
+        self.turn_interval = turn_interval
+        self.turn = 0
+        self._next: asyncio.Future | None = None
+        # Seconds the scheduler woke late, summed and worst, for monitoring
+        self.total_lag = 0.0
+        self.max_lag = 0.0
+
+    async def wait(self) -> int:
+        """Sleep until the next turn starts; return its number."""
+        if self._next is None:
+            self._next = asyncio.get_running_loop().create_future()
+        return await self._next
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        while True:
+            due = start + (self.turn + 1) * self.turn_interval
+            await asyncio.sleep(due - loop.time())
+            lag = loop.time() - due
+            self.total_lag += lag
+            self.max_lag = max(self.max_lag, lag)
+            self.turn += 1
+            woken, self._next = self._next, None
+            if woken is not None:
+                woken.set_result(self.turn)
+
+
+class Connection:
+    """One client's stream, and where it is: waiting for a match or playing one."""
+
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        self.match: "Match | None" = None
+        self.side = 0
+        self.spawns_this_turn = 0
+        self.closed = False
+
+    def send(self, data: bytes):
+        if self.closed:
+            return
+        transport = self.writer.transport
+        if transport.get_write_buffer_size() > MAX_WRITE_BUFFER:
+            self.close()
+            return
+        self.writer.write(data)
+
+    def close(self, reason: int | None = None):
+        if self.closed:
+            return
+        if reason is not None:
+            self.writer.write(encode(END, reason))
+        self.closed = True
+        self.writer.close()
+
+
+class Match:
+    """Relays the spawns of one match's players, a turn at a time."""
+
+    def __init__(self, server: "MatchServer", match_id: int, connections: list[Connection], seed: int):
+        self.server = server
+        self.match_id = match_id
+        self.connections = connections
+        self.seed = seed
+        self.vs_ai = len(connections) == 1
+        # Ticks since the match started, by the server's clock
+        self.now = 0
+        self.start_turn = 0
+        self.pending: list[tuple[int, int, int]] = []   # side, unit id, lane
+        # Unmatched checksum reports and results, by tick
+        self.checksums: dict[int, tuple[int, int]] = {}
+        self.results: dict[int, tuple[int, int]] = {}
+        self.finished = False
+
+    async def run(self):
+        server = self.server
+        delay, turn_ticks = server.input_delay, server.turn_ticks
+        for side, connection in enumerate(self.connections):
+            connection.match = self
+            connection.side = side
+            connection.send(encode(START, self.match_id, side, self.seed, server.tick_rate,
+                                   delay, turn_ticks, FLAG_VS_AI if self.vs_ai else 0))
+        # Nothing can be scheduled before the first turn's commands
+        self.broadcast(encode_frame(delay + turn_ticks - 1, []))
+
+        self.start_turn = server.scheduler.turn
+        while not self.finished:
+            turn = await server.scheduler.wait()
+            if not self.finished:
+                self.flush(turn)
+
+    def flush(self, turn: int):
+        """Send the turn's FRAME: its commands run input_delay ticks from now."""
+        server = self.server
+        # Turns the scheduler ran while this coroutine was busy are caught up in one go
+        self.now = (turn - self.start_turn) * server.turn_ticks
+        tick = self.now + server.input_delay
+        commands = [(tick, side, unit_id, lane) for side, unit_id, lane in self.pending[:MAX_FRAME_COMMANDS]]
+        self.pending.clear()
+        for connection in self.connections:
+            connection.spawns_this_turn = 0
+        self.broadcast(encode_frame(tick + server.turn_ticks - 1, commands))
+
+    def broadcast(self, data: bytes):
+        for connection in self.connections:
+            connection.send(data)
+
+    def receive(self, connection: Connection, message: tuple):
+        kind = message[0]
+        if kind == SPAWN:
+            _, unit_id, lane = message
+            if unit_id >= len(UNIT_NAMES) or lane >= NUM_LANES:
+                raise ProtocolError("Spawn of an unknown unit or lane")
+            if connection.spawns_this_turn < SERVER_MAX_SPAWNS_PER_TURN:
+                connection.spawns_this_turn += 1
+                self.pending.append((connection.side, unit_id, lane))
+        elif kind == CHECKSUM:
+            self.compare(self.checksums, connection, message[1], message[2])
+        elif kind == RESULT:
+            if self.compare(self.results, connection, message[1], message[2]) and not self.finished:
+                self.end(END_FINISHED)
+        else:
+            raise ProtocolError(f"Unexpected message type {kind}")
+
+    def compare(self, reports: dict, connection: Connection, tick: int, value: int) -> bool:
+        """Check a player's report against the others'; return True once all agree."""
+        if self.vs_ai:
+            return True
+        other = reports.pop(tick, None)
+        if other is None:
+            reports[tick] = (connection.side, value)
+            return False
+        if other[0] == connection.side:
+            raise ProtocolError("Reported the same tick twice")
+        if other[1] != value:
+            self.end(END_DESYNC)
+            return False
+        return True
+
+    def end(self, reason: int):
+        self.finished = True
+        self.server.matches.pop(self.match_id, None)
+        for connection in self.connections:
+            connection.close(reason)
+        self.server.ended[reason] += 1
+
+    def leave(self, connection: Connection):
+        """A player disconnected: the match can't go on."""
+        if self.finished:
+            return
+        self.connections.remove(connection)
+        self.end(END_OPPONENT_LEFT)
+
+
+class MatchServer:
+    """Accepts clients, pairs them into matches and runs the shared turn scheduler."""
+
+    def __init__(self, input_delay: int = SERVER_INPUT_DELAY, turn_ticks: int = SERVER_TURN_TICKS,
+                 tick_rate: int = TICK_RATE, seed: int | None = None):
+        if input_delay < 0 or turn_ticks < 1:
+            raise ValueError("input_delay must be >= 0 and turn_ticks >= 1")
+        self.input_delay = input_delay
+        self.turn_ticks = turn_ticks
+        self.tick_rate = tick_rate
+        self.rng = random.Random(seed)
+        self.scheduler = TurnScheduler(turn_ticks / tick_rate)
+        self.matches: dict[int, Match] = {}
+        self.waiting: Connection | None = None
+        self.next_match_id = 0
+        # Matches ended so far, by END reason
+        self.ended = Counter()
+        self.server: asyncio.Server | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def start(self, host: str = "127.0.0.1", port: int = SERVER_PORT) -> int:
+        """Start listening; return the port (useful with port 0)."""
+        self.server = await asyncio.start_server(self.handle, host, port)
+        self._spawn(self.scheduler.run())
+        return self.server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        for match in list(self.matches.values()):
+            match.end(END_SERVER_SHUTDOWN)
+        if self.waiting is not None:
+            self.waiting.close(END_SERVER_SHUTDOWN)
+        self.server.close()
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _spawn(self, coroutine):
+        task = asyncio.ensure_future(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def start_match(self, connections: list[Connection]):
+        match = Match(self, self.next_match_id, connections, self.rng.randrange(2 ** 31))
+        self.matches[match.match_id] = match
+        self.next_match_id += 1
+        self._spawn(match.run())
+
+    def join(self, connection: Connection, flags: int):
+        if flags & FLAG_VS_AI:
+            self.start_match([connection])
+        elif self.waiting is None or self.waiting.closed:
+            self.waiting = connection
+        else:
+            opponent, self.waiting = self.waiting, None
+            self.start_match([opponent, connection])
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        connection = Connection(writer)
+        messages = MessageReader()
+        joined = False
+        try:
+            while not connection.closed:
+                data = await reader.read(4096)
+                if not data:
+                    break
+                for message in messages.feed(data):
+                    if not joined:
+                        if message[0] != JOIN or message[1] != PROTOCOL_VERSION:
+                            raise ProtocolError("Expected a JOIN with a matching protocol version")
+                        joined = True
+                        self.join(connection, message[2])
+                    elif connection.match is None:
+                        # Nothing is expected before the match starts
+                        raise ProtocolError("Message before the match started")
+                    else:
+                        connection.match.receive(connection, message)
+        except ProtocolError:
+            connection.close(END_PROTOCOL_ERROR)
+        except ConnectionError:
+            pass
+        finally:
+            if connection.match is not None:
+                connection.match.leave(connection)
+            elif self.waiting is connection:
+                self.waiting = None
+            connection.close()
+
+
+async def serve(host: str, port: int, input_delay: int, turn_ticks: int, report_interval: float):
+    server = MatchServer(input_delay, turn_ticks)
+    port = await server.start(host, port)
+    print(f"Listening on {host}:{port} (input delay {input_delay} ticks, {turn_ticks} ticks per turn)")
+    cpu, wall = time.process_time(), time.perf_counter()
+    while True:
+        await asyncio.sleep(report_interval)
+        now_cpu, now_wall = time.process_time(), time.perf_counter()
+        print(f"{len(server.matches)} matches, cpu {100 * (now_cpu - cpu) / (now_wall - wall):.0f}%, "
+              f"worst turn lag {server.scheduler.max_lag * 1000:.1f}ms")
+        cpu, wall = now_cpu, now_wall
+        server.scheduler.max_lag = 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=SERVER_PORT)
+    parser.add_argument("--input-delay", type=int, default=SERVER_INPUT_DELAY,
+                        help="ticks between the server receiving a spawn and the tick it runs on")
+    parser.add_argument("--turn-ticks", type=int, default=SERVER_TURN_TICKS,
+                        help="ticks per turn (one frame per match per turn)")
+    parser.add_argument("--report-interval", type=float, default=10.0)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.input_delay, args.turn_ticks, args.report_interval))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
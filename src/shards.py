@@ -0,0 +1,329 @@
+import itertools
+import multiprocessing
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from src.constants import NUM_LANES, LANE_WIDTH, PLAYER_BASE_Y, ENEMY_BASE_Y
+from src.player import Player
+from src.unit import Unit, UnitType, UnitView, next_spawn_order
+from src.unit_types import UNIT_TABLE
+
+# How shards are run: one after another in this thread, on a thread pool
+# (parallel only on a free-threaded Python), or each in its own process
+INLINE = "inline"
+THREAD = "thread"
+PROCESS = "process"
+BACKENDS = (INLINE, THREAD, PROCESS)
+
+
+def lane_groups(shards: int, num_lanes: int = NUM_LANES) -> list[list[int]]:
+    """Split the lanes into shards contiguous groups, as even as possible."""
+    if not 1 <= shards <= num_lanes:
+        raise ValueError(f"shards must be from 1 to {num_lanes}")
+    size, extra = divmod(num_lanes, shards)
+    groups = []
+    start = 0
+    for index in range(shards):
+        end = start + size + (index < extra)
+        groups.append(list(range(start, end)))
+        start = end
+    return groups
+
+
+class LaneShard:
+    """
+    The units of both sides in a group of lanes. They live in plain Players
+    and are stepped by Player.update, so they act exactly as in a serial
+    Simulation: combat never crosses lanes, and within a lane units still
+    act in spawn order.
+    """
+
+    def __init__(self, lanes: list[int]):
+        self.lanes = lanes
+        # By is_player_side
+        self.sides = {True: Player(is_human=False, is_player_side=True),
+                      False: Player(is_human=False, is_player_side=False)}
+        self.snapshots: dict[int, tuple] = {}
+        # UnitTypes come with the spawns, as each side's Player.unit_types may
+        # differ from the table's; process workers unpickle a copy per spawn,
+        # so equal ones are shared again here
+        self.types: dict[UnitType, UnitType] = {}
+
+    def spawn(self, spawns: list[tuple[UnitType, int, bool, int]]):
+        """Add units (unit type, lane, is_player, seq) at their bases."""
+        for unit_type, lane, is_player, seq in spawns:
+            self.sides[is_player].add_unit(self.types.setdefault(unit_type, unit_type), lane, seq)
+
+    def place(self, states: list[tuple]):
+        """Add units in a given state (unit type, lane, is_player, seq, y, hp, attack cooldown, is_attacking)."""
+        for unit_type, lane, is_player, seq, y, hp, cooldown, attacking in states:
+            side = self.sides[is_player]
+            unit = side.add_unit(self.types.setdefault(unit_type, unit_type), lane, seq)
+            unit.y = unit.prev_y = y
+            side.lane_stats.damage(lane, unit.hp, hp)
+            unit.hp = hp
+            unit.attack_cooldown = cooldown
+            unit.is_attacking = attacking
+        for side in self.sides.values():
+            side.lane_index.refresh()
+
+    def step(self, is_player: bool, dt: float, spawns: list[tuple]) -> tuple:
+        """Spawn, then update one side's units against the other's; return the summary."""
+        self.spawn(spawns)
+        self.sides[is_player].update(dt, self.sides[not is_player])
+        return self.summary()
+
+    def summary(self) -> tuple:
+        """
+        Per lane, both sides' lane_summary (bottom side first), then whether
+        each side has a unit at the opposing base.
+        """
+        bottom, top = self.sides[True], self.sides[False]
+        lanes = [(lane, bottom.lane_summary(lane), top.lane_summary(lane)) for lane in self.lanes]
+        return lanes, bottom.check_win_condition(), top.check_win_condition()
+
+    def units(self) -> list[tuple]:
+        """State of every unit, as (is_player, seq, lane, y, hp)."""
+        return [(unit.is_player, unit.seq, unit.lane, unit.y, unit.hp)
+                for side in self.sides.values() for unit in side.units]
+
+    def views(self) -> list[tuple]:
+        """What a UnitView shows of every unit: (is_player, seq, type id, lane, y, hp, is_attacking)."""
+        return [(unit.is_player, unit.seq, unit.unit_type.type_id, unit.lane, unit.y, unit.hp, unit.is_attacking)
+                for side in self.sides.values() for unit in side.units]
+
+    def snapshot(self, key: int, released: list[int]):
+        # Units can't leave the worker, so snapshots stay here under a key
+        # until the main process has dropped their ShardSnapshot
+        for old_key in released:
+            del self.snapshots[old_key]
+        self.snapshots[key] = (self.sides[True].snapshot(), self.sides[False].snapshot())
+
+    def restore(self, key: int):
+        bottom, top = self.snapshots[key]
+        self.sides[True].restore(bottom)
+        self.sides[False].restore(top)
+
+
+def _serve_shard(connection, lanes: list[int]):
+    """Worker process loop: run the LaneShard methods the main process asks for."""
+    shard = LaneShard(lanes)
+    while True:
+        request = connection.recv()
+        if request is None:
+            break
+        method, args = request
+        connection.send(getattr(shard, method)(*args))
+    connection.close()
+
+
+class ShardSnapshot:
+    """
+    ShardedUnits' part of a SimulationSnapshot. The unit states stay in the
+    shards under key until this is garbage collected.
+    """
+    __slots__ = ("key", "summaries", "reached", "__weakref__")
+
+    def __init__(self, key: int, summaries: dict, reached: dict):
+        self.key = key
+        self.summaries = summaries
+        self.reached = reached
+
+
+class ShardUnits:
+    """List-like view of one side's units across the shards, like StoreUnits."""
+
+    def __init__(self, store: "ShardedUnits", is_player: bool):
+        self.store = store
+        self.is_player = is_player
+
+    def __len__(self) -> int:
+        return len(self.store.views(self.is_player))
+
+    def __iter__(self):
+        return iter(self.store.views(self.is_player))
+
+    def __getitem__(self, index):
+        return self.store.views(self.is_player)[index]
+
+
+class ShardedUnits:
+    """
+    Stand-in for a UnitStore (see Player.attach_store) that keeps the units
+    in lane shards, each stepped by its own worker. The main process keeps
+    mana, AI decisions and win checks; shards only synchronize with it when
+    a side's units update, twice a tick. Spawns are queued and reach their
+    shard before it next steps, and each step reports back the lane
+    summaries the AIs read and whether a unit reached a base.
+    """
+
+    def __init__(self, shards: int = NUM_LANES, backend: str = PROCESS):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown shard backend: {backend!r}")
+        self.groups = lane_groups(shards)
+        self.shard_of_lane = {lane: index for index, group in enumerate(self.groups) for lane in group}
+        self.backend = backend
+        # Spawns waiting for their shard's next step
+        self.pending: list[list[tuple]] = [[] for _ in self.groups]
+        # lane_summary by side and lane, as of the last step
+        self.summaries = {True: [(0, 0, None)] * NUM_LANES, False: [(0, 0, None)] * NUM_LANES}
+        self.reached = {True: False, False: False}
+        self.snapshot_keys = itertools.count()
+        # Keys of collected ShardSnapshots, dropped by the shards at the next snapshot
+        self.released: list[int] = []
+        # UnitType by side and type id, as last spawned (each side's Player.unit_types)
+        self.unit_types = {True: list(UNIT_TABLE.types), False: list(UNIT_TABLE.types)}
+        # Both sides' UnitViews, gathered from the shards when first needed after a change
+        self.cached_views: dict[bool, list[UnitView]] | None = None
+
+        self.shards: list[LaneShard] = []
+        self.executor: ThreadPoolExecutor | None = None
+        self.connections = []
+        self.processes = []
+        if backend == PROCESS:
+            for lanes in self.groups:
+                connection, child = multiprocessing.Pipe()
+                process = multiprocessing.Process(target=_serve_shard, args=(child, lanes), daemon=True)
+                process.start()
+                child.close()
+                self.connections.append(connection)
+                self.processes.append(process)
+        else:
+            self.shards = [LaneShard(lanes) for lanes in self.groups]
+            if backend == THREAD:
+                self.executor = ThreadPoolExecutor(max_workers=len(self.shards))
+
+    def call(self, method: str, args_by_shard: list[tuple]) -> list:
+        """Run a LaneShard method on every shard (the tick barrier); return their results."""
+        if self.backend == PROCESS:
+            for connection, args in zip(self.connections, args_by_shard):
+                connection.send((method, args))
+            return [connection.recv() for connection in self.connections]
+        if self.executor is not None:
+            return list(self.executor.map(lambda shard, args: getattr(shard, method)(*args),
+                                          self.shards, args_by_shard))
+        return [getattr(shard, method)(*args) for shard, args in zip(self.shards, args_by_shard)]
+
+    def close(self):
+        """Stop the workers."""
+        for connection in self.connections:
+            connection.send(None)
+            connection.close()
+        for process in self.processes:
+            process.join()
+        self.connections.clear()
+        self.processes.clear()
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def side_units(self, is_player: bool) -> ShardUnits:
+        return ShardUnits(self, is_player)
+
+    def views(self, is_player: bool) -> list[UnitView]:
+        """
+        Views of one side's units in spawn order, so snapshots of the match
+        state, checksums and rendering see the units in the shards. Costs a
+        round trip to every shard the first time after each change.
+        """
+        if self.cached_views is None:
+            self.call("spawn", [(spawns,) for spawns in self.take_pending()])
+            views = {True: [], False: []}
+            states = sorted(itertools.chain.from_iterable(self.call("views", [()] * len(self.groups))),
+                            key=lambda state: state[1])
+            for unit_is_player, seq, type_id, lane, y, hp, attacking in states:
+                view = UnitView()
+                view.unit_type = self.unit_types[unit_is_player][type_id]
+                view.lane = lane
+                view.x = lane * LANE_WIDTH + LANE_WIDTH // 2
+                view.y = y
+                view.hp = hp
+                view.max_hp = view.unit_type.hp
+                view.is_player = unit_is_player
+                view.is_attacking = attacking
+                view.seq = seq
+                views[unit_is_player].append(view)
+            self.cached_views = views
+        return self.cached_views[is_player]
+
+    def spawn(self, unit_type: UnitType, lane: int, is_player: bool) -> Unit:
+        """Queue a spawn for the lane's shard; return a copy of the unit as spawned."""
+        seq = next_spawn_order()
+        self.unit_types[is_player][unit_type.type_id] = unit_type
+        self.pending[self.shard_of_lane[lane]].append((unit_type, lane, is_player, seq))
+        self.cached_views = None
+        # Keep the summary exact until the shard reports it: a new unit at
+        # the base only becomes the front of an empty lane
+        count, hp, front = self.summaries[is_player][lane]
+        if not count:
+            front = PLAYER_BASE_Y if is_player else ENEMY_BASE_Y
+        self.summaries[is_player][lane] = (count + 1, hp + unit_type.hp, front)
+        return Unit(unit_type, lane, is_player, seq)
+
+    def add_unit(self, unit: Unit):
+        """Copy an existing Unit, including its current state, into its shard."""
+        self.place([unit])
+
+    def place(self, units: list[Unit]):
+        """Copy existing Units, including their current state, into their shards."""
+        states = [[] for _ in self.groups]
+        for unit in units:
+            self.unit_types[unit.is_player][unit.unit_type.type_id] = unit.unit_type
+            states[self.shard_of_lane[unit.lane]].append((
+                unit.unit_type, unit.lane, unit.is_player, unit.seq,
+                unit.y, unit.hp, unit.attack_cooldown, unit.is_attacking,
+            ))
+        self.cached_views = None
+        self.call("spawn", [(spawns,) for spawns in self.take_pending()])
+        self.call("place", [(shard_states,) for shard_states in states])
+        self._store(self.call("summary", [()] * len(self.groups)))
+
+    def take_pending(self) -> list[list[tuple]]:
+        pending = self.pending
+        self.pending = [[] for _ in self.groups]
+        return pending
+
+    def update_side(self, is_player: bool, dt: float):
+        """Update one side's units in every shard at once, like Player.update."""
+        self.cached_views = None
+        self._store(self.call("step", [(is_player, dt, spawns) for spawns in self.take_pending()]))
+
+    def _store(self, results: list[tuple]):
+        reached = {True: False, False: False}
+        for lanes, bottom_reached, top_reached in results:
+            for lane, bottom, top in lanes:
+                self.summaries[True][lane] = bottom
+                self.summaries[False][lane] = top
+            reached[True] |= bottom_reached
+            reached[False] |= top_reached
+        self.reached = reached
+
+    def lane_summary(self, is_player: bool, lane: int) -> tuple[int, int, float | None]:
+        return self.summaries[is_player][lane]
+
+    def reached_base(self, is_player: bool) -> bool:
+        return self.reached[is_player]
+
+    def units(self) -> list[tuple]:
+        """(is_player, seq, lane, y, hp) of every unit, in spawn order, gathered from the shards."""
+        self.call("spawn", [(spawns,) for spawns in self.take_pending()])
+        return sorted(itertools.chain.from_iterable(self.call("units", [()] * len(self.groups))),
+                      key=lambda state: state[1])
+
+    def snapshot(self) -> ShardSnapshot:
+        key = next(self.snapshot_keys)
+        # Not swapped for a new list, as the finalizers append to this one
+        released = self.released[:]
+        del self.released[:len(released)]
+        self.call("spawn", [(spawns,) for spawns in self.take_pending()])
+        self.call("snapshot", [(key, released)] * len(self.groups))
+        snapshot = ShardSnapshot(key, {side: list(summaries) for side, summaries in self.summaries.items()},
+                                 dict(self.reached))
+        weakref.finalize(snapshot, self.released.append, key)
+        return snapshot
+
+    def restore(self, snapshot: ShardSnapshot):
+        self.pending = [[] for _ in self.groups]
+        self.cached_views = None
+        self.call("restore", [(snapshot.key,)] * len(self.groups))
+        self.summaries = {side: list(values) for side, values in snapshot.summaries.items()}
+        self.reached = dict(snapshot.reached)
@@ -0,0 +1,188 @@
+from dataclasses import dataclass
+from src.constants import TICK_RATE, TWO_PHASE_TICK
+from src.player import Player
+from src.ai import AI
+from src.unit import Unit
+from src.two_phase import Plan, plan_units, commit_plans
+
+# Side identifiers accepted by Simulation.apply_action
+PLAYER_SIDE = "player"
+ENEMY_SIDE = "enemy"
+SIDES = (PLAYER_SIDE, ENEMY_SIDE)
+
+
+@dataclass(frozen=True)
+class SimulationSnapshot:
+    """State of a match at one tick, see Simulation.snapshot()."""
+    ticks: int
+    time: float
+    game_over: bool
+    player_won: bool
+    player: tuple
+    enemy: tuple
+    store: object | None  # UnitStore or ShardedUnits state
+
+
+class Simulation:
+    """Pure game state and rules for one match, independent of pygame."""
+
+    def __init__(self, player_ai: bool = False, enemy_ai: bool = True, vectorized: bool = False,
+                 player: Player | None = None, enemy: Player | None = None,
+                 seed: int | None = None, tick_rate: int = TICK_RATE,
+                 shards: int = 0, shard_backend: str = "process", two_phase: bool = TWO_PHASE_TICK):
+        # Explicit players (e.g. AI variants) take precedence over the flags
+        if player is None:
+            player = AI(is_player_side=True) if player_ai else Player(is_human=True)
+        if enemy is None:
+            enemy = AI() if enemy_ai else Player(is_human=False)
+        self.player = player
+        self.enemy = enemy
+        # Two-phase ticks plan and commit Unit objects, which stores replace
+        self.two_phase = two_phase
+        if two_phase and (vectorized or shards):
+            raise ValueError("two_phase can't be combined with vectorized or shards")
+        if vectorized:
+            # Imported lazily since only the array-backed path needs NumPy
+            from src.unit_store import UnitStore
+            store = UnitStore()
+            self.player.attach_store(store)
+            self.enemy.attach_store(store)
+        elif shards:
+            # Lanes split between workers (see src.shards); imported lazily like UnitStore
+            from src.shards import ShardedUnits
+            store = ShardedUnits(shards, shard_backend)
+            self.player.attach_store(store)
+            self.enemy.attach_store(store)
+        # Seeding gives every AI (any side with an rng) its own reproducible RNG
+        self.seed = seed
+        if seed is not None:
+            for side in SIDES:
+                rng = getattr(self.get_side(side), "rng", None)
+                if rng is not None:
+                    rng.seed(f"{seed}:{side}")
+
+        # Fixed timestep used by step() when no dt is given
+        self.tick_rate = tick_rate
+        self.dt = 1.0 / tick_rate
+        self.game_over = False
+        self.player_won = False
+        self.ticks = 0
+        self.time = 0.0
+        # True while units and AIs update, so spawns can tell AI moves from inputs
+        self.in_step = False
+
+    def close(self):
+        """Stop the workers of a sharded simulation; nothing to do for others."""
+        close = getattr(self.player.unit_store, "close", None)
+        if close is not None:
+            close()
+
+    def get_side(self, side: str) -> Player:
+        """Get the player controlling the given side."""
+        if side == PLAYER_SIDE:
+            return self.player
+        if side == ENEMY_SIDE:
+            return self.enemy
+        raise ValueError(f"Unknown side: {side!r}")
+
+    @property
+    def winner(self) -> str | None:
+        """Side that won the match, or None while it is still running."""
+        if not self.game_over:
+            return None
+        return PLAYER_SIDE if self.player_won else ENEMY_SIDE
+
+    def apply_action(self, side: str, unit_name: str, lane: int) -> Unit | None:
+        """Spawn a unit for a side if the match is running and it is affordable."""
+        player = self.get_side(side)
+        if self.game_over or not player.can_afford(unit_name):
+            return None
+        return player.spawn_unit(unit_name, lane)
+
+    def snapshot(self) -> SimulationSnapshot:
+        """
+        Capture the match state, to roll back to with restore(). A snapshot can
+        be restored any number of times, but only into the simulation it came
+        from, whose Unit objects it reuses. The global spawn counter isn't rolled
+        back; units spawned after a restore still sort after every older unit.
+        """
+        store = self.player.unit_store
+        return SimulationSnapshot(
+            self.ticks, self.time, self.game_over, self.player_won,
+            self.player.snapshot(), self.enemy.snapshot(),
+            store.snapshot() if store is not None else None,
+        )
+
+    def restore(self, snapshot: SimulationSnapshot):
+        """Return to the state captured by snapshot()."""
+        self.ticks = snapshot.ticks
+        self.time = snapshot.time
+        self.game_over = snapshot.game_over
+        self.player_won = snapshot.player_won
+        self.player.restore(snapshot.player)
+        self.enemy.restore(snapshot.enemy)
+        if snapshot.store is not None:
+            self.player.unit_store.restore(snapshot.store)
+
+    def step(self, dt: float | None = None):
+        """Advance the match by dt seconds, or by one fixed tick."""
+        if self.game_over:
+            return
+        if dt is None:
+            dt = self.dt
+
+        # Update player and enemy
+        self.in_step = True
+        if self.two_phase:
+            self.step_two_phase(dt)
+        else:
+            self.player.update(dt, self.enemy)
+            self.enemy.update(dt, self.player)
+        self.in_step = False
+        self.ticks += 1
+        self.time += dt
+
+        # Check win conditions
+        if self.player.check_win_condition():
+            self.game_over = True
+            self.player_won = True
+        elif self.enemy.check_win_condition():
+            self.game_over = True
+            self.player_won = False
+
+    def step_two_phase(self, dt: float):
+        """Update both sides as in Player.update, with the units of both resolved as one two-phase tick."""
+        player, enemy = self.player, self.enemy
+        player.regenerate_mana(dt)
+        enemy.regenerate_mana(dt)
+        commit_plans(self.plan_tick(dt))
+        player.remove_dead()
+        enemy.remove_dead()
+        # AI decisions read the committed state; they still go player side first
+        player.act(dt, enemy)
+        enemy.act(dt, player)
+
+    def plan_tick(self, dt: float) -> list[Plan]:
+        """Plans of every unit of both sides, from the state at the start of the tick."""
+        return plan_units(self.player.units, self.enemy.lane_index, dt) \
+            + plan_units(self.enemy.units, self.player.lane_index, dt)
+
+    def coast(self, ticks: int):
+        """
+        Advance ticks fixed ticks at once, with the same result as stepping them,
+        over a stretch src.fast_forward has found to be uneventful.
+        """
+        dt = self.dt
+        self.in_step = True
+        self.player.coast(ticks, dt, self.enemy)
+        self.enemy.coast(ticks, dt, self.player)
+        self.in_step = False
+        self.ticks += ticks
+        for _ in range(ticks):
+            self.time += dt
+
+    def run(self, dt: float | None = None, max_time: float = 600.0) -> str | None:
+        """Step until the match ends or max_time elapses; return the winner."""
+        while not self.game_over and self.time < max_time:
+            self.step(dt)
+        return self.winner
@@ -0,0 +1,109 @@
+import pygame
+from src.constants import (
+    HEALTH_BAR_BG, HEALTH_BAR_PLAYER, HEALTH_BAR_ENEMY
+)
+from src.unit_types import UNIT_TABLE
+
+# Health bars sit above the unit body
+HEALTH_BAR_HEIGHT = 6
+HEALTH_BAR_MARGIN = 10
+HEALTH_BAR_OFFSET = 12
+
+# Card icons
+ICON_SIZE = 20
+ICON_DISABLED_COLOR = (80, 80, 80)
+
+
+class SpriteAtlas:
+    """
+    Unit and card icon surfaces pre-rendered from UNIT_TABLE, so a frame only
+    blits. Must be built after pygame.display.set_mode().
+    """
+
+    def __init__(self):
+        # (type_id, is_player) -> (surface, offset of the unit center). Display
+        # names needn't be unique, and stat overrides keep the type_id
+        self.bodies: dict[tuple[int, bool], tuple[pygame.Surface, tuple[int, int]]] = {}
+        # (bar width, is_player) -> one surface per fill width in pixels, 0..bar width
+        self.health_bars: dict[tuple[int, bool], list[pygame.Surface]] = {}
+        # (type_id, can_afford) -> icon surface
+        self.icons: dict[tuple[int, bool], pygame.Surface] = {}
+
+        for type_id, data in enumerate(UNIT_TABLE.definitions.values()):
+            width = data["size"] + HEALTH_BAR_MARGIN
+            for is_player in (True, False):
+                self.bodies[type_id, is_player] = self._body(data)
+                if (width, is_player) not in self.health_bars:
+                    self.health_bars[width, is_player] = [
+                        self._health_bar(width, fill, is_player) for fill in range(width + 1)
+                    ]
+            for can_afford in (True, False):
+                self.icons[type_id, can_afford] = self._icon(data, can_afford)
+
+    @staticmethod
+    def _convert(surface: pygame.Surface) -> pygame.Surface:
+        # Matching the display's pixel format makes blits much cheaper
+        if pygame.display.get_surface() is not None:
+            return surface.convert_alpha()
+        return surface
+
+    def _body(self, data: dict) -> tuple[pygame.Surface, tuple[int, int]]:
+        """Shape and white outline, drawn as Unit.render does."""
+        size = data["size"]
+        half_size = size // 2
+        if data["shape"] == "rect":
+            surface = pygame.Surface((size, size), pygame.SRCALPHA)
+            rect = surface.get_rect()
+            pygame.draw.rect(surface, data["color"], rect)
+            pygame.draw.rect(surface, (255, 255, 255), rect, 2)
+        else:  # circle
+            surface = pygame.Surface((2 * half_size + 1, 2 * half_size + 1), pygame.SRCALPHA)
+            center = (half_size, half_size)
+            pygame.draw.circle(surface, data["color"], center, half_size)
+            pygame.draw.circle(surface, (255, 255, 255), center, half_size, 2)
+        return self._convert(surface), (half_size, half_size)
+
+    def _health_bar(self, width: int, fill: int, is_player: bool) -> pygame.Surface:
+        surface = pygame.Surface((width, HEALTH_BAR_HEIGHT))
+        surface.fill(HEALTH_BAR_BG)
+        health_color = HEALTH_BAR_PLAYER if is_player else HEALTH_BAR_ENEMY
+        surface.fill(health_color, (0, 0, fill, HEALTH_BAR_HEIGHT))
+        pygame.draw.rect(surface, (200, 200, 200), surface.get_rect(), 1)
+        return self._convert(surface)
+
+    def _icon(self, data: dict, can_afford: bool) -> pygame.Surface:
+        surface = pygame.Surface((ICON_SIZE + 1, ICON_SIZE + 1), pygame.SRCALPHA)
+        color = data["color"] if can_afford else ICON_DISABLED_COLOR
+        if data["shape"] == "rect":
+            pygame.draw.rect(surface, color, (0, 0, ICON_SIZE, ICON_SIZE))
+        else:
+            pygame.draw.circle(surface, color, (ICON_SIZE // 2, ICON_SIZE // 2), ICON_SIZE // 2)
+        return self._convert(surface)
+
+    def icon(self, unit_name: str, can_afford: bool) -> pygame.Surface:
+        """Card icon of a unit type (UNIT_TABLE key), centered at half ICON_SIZE."""
+        return self.icons[UNIT_TABLE.ids[unit_name], can_afford]
+
+    def unit_blits(self, units, alpha: float = 1.0) -> list[tuple[pygame.Surface, tuple[int, int]]]:
+        """
+        (surface, position) pairs drawing living units and their health bars, for
+        Surface.blits. alpha interpolates positions between the last two ticks.
+        """
+        bodies = self.bodies
+        health_bars = self.health_bars
+        sequence = []
+        append = sequence.append
+        for unit in units:
+            if unit.hp <= 0:
+                continue
+            body, (offset_x, offset_y) = bodies[unit.unit_type.type_id, unit.is_player]
+            x = int(unit.x)
+            prev_y = unit.prev_y
+            y = int(prev_y + (unit.y - prev_y) * alpha)
+            append((body, (x - offset_x, y - offset_y)))
+
+            bars = health_bars[unit.unit_type.size + HEALTH_BAR_MARGIN, unit.is_player]
+            width = len(bars) - 1
+            fill = int(width * unit.hp / unit.max_hp)
+            append((bars[fill], (x - width // 2, y - offset_y - HEALTH_BAR_OFFSET)))
+        return sequence
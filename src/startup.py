@@ -0,0 +1,33 @@
+import time
+from src.constants import STARTUP_BUDGET
+
+
+class StartupTimer:
+    """Wall time of each startup phase, from when the timer was created to the first frame."""
+
+    def __init__(self, budget: float = STARTUP_BUDGET):
+        self.budget = budget
+        self.start = time.perf_counter()
+        self.last = self.start
+        self.phases: list[tuple[str, float]] = []
+
+    def mark(self, phase: str):
+        """End a phase: it took the time since the previous mark."""
+        now = time.perf_counter()
+        self.phases.append((phase, now - self.last))
+        self.last = now
+
+    @property
+    def total(self) -> float:
+        return self.last - self.start
+
+    @property
+    def over_budget(self) -> bool:
+        return self.total > self.budget
+
+    def report(self) -> str:
+        lines = [f"{phase:<14} {seconds * 1000:7.1f}ms" for phase, seconds in self.phases]
+        verdict = "OVER BUDGET" if self.over_budget else "ok"
+        lines.append(f"{'total':<14} {self.total * 1000:7.1f}ms "
+                     f"(budget {self.budget * 1000:.0f}ms: {verdict})")
+        return "\n".join(lines)
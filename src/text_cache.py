@@ -0,0 +1,50 @@
+from collections import OrderedDict
+import pygame
+
+# Distinct strings kept rendered; the UI shows well under a hundred at a time
+TEXT_CACHE_SIZE = 256
+
+
+class TextCache:
+    """LRU cache of rendered text surfaces keyed by (font, text, color, antialias, background)."""
+
+    def __init__(self, maxsize: int = TEXT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.surfaces: OrderedDict[tuple, pygame.Surface] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.surfaces)
+
+    def render(self, font: pygame.font.Font, text: str, antialias: bool, color,
+               background=None) -> pygame.Surface:
+        """Rendered text, rasterized only the first time it is asked for."""
+        key = (font, text, tuple(color), antialias, background and tuple(background))
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color, background)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.maxsize:
+            self.surfaces.popitem(last=False)
+        return surface
+
+
+class CachedFont:
+    """Font whose render() goes through a shared TextCache. Callers must not draw on the result."""
+
+    def __init__(self, font: pygame.font.Font, cache: TextCache):
+        self.font = font
+        self.cache = cache
+
+    def render(self, text: str, antialias: bool, color, background=None) -> pygame.Surface:
+        return self.cache.render(self.font, text, antialias, color, background)
+
+    def __getattr__(self, name: str):
+        # Everything else (size, get_height, ...) is the wrapped font's
+        return getattr(self.font, name)
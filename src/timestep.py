@@ -0,0 +1,87 @@
+import threading
+import time
+from src.constants import MAX_CATCHUP_TICKS
+from src.simulation import Simulation
+
+
+class FixedTimestep:
+    """
+    Accumulates real time and turns it into whole simulation ticks, so the
+    simulation always advances by its fixed dt whatever the frame rate. After
+    a hitch at most max_catchup ticks run and the rest of the backlog is
+    dropped: the match slows down briefly instead of spiralling. match is
+    the Simulation, or anything else with a game_over flag.
+    """
+
+    def __init__(self, tick_rate: int, max_catchup: int = MAX_CATCHUP_TICKS, match=None):
+        self.dt = 1.0 / tick_rate
+        self.max_catchup = max_catchup
+        self.match = match
+        self.accumulator = 0.0
+
+    def advance(self, elapsed: float) -> int:
+        """Add elapsed seconds; return how many ticks to run now."""
+        self.accumulator += elapsed
+        ticks = int(self.accumulator / self.dt)
+        if ticks > self.max_catchup:
+            ticks = self.max_catchup
+            # Keep the fractional part so interpolation stays continuous
+            self.accumulator %= self.dt
+        else:
+            self.accumulator -= ticks * self.dt
+        return ticks
+
+    @property
+    def alpha(self) -> float:
+        """How far real time is between the last tick and the next, 0..1."""
+        if self.match is not None and self.match.game_over:
+            # No next tick comes, so units stay where the last one left them
+            return 1.0
+        return min(1.0, self.accumulator / self.dt)
+
+
+class SimulationThread:
+    """
+    Steps a simulation on its own thread at its tick rate. Everything that
+    touches the simulation from another thread (input, rendering) must hold
+    lock while doing so.
+    """
+
+    def __init__(self, simulation: Simulation, max_catchup: int = MAX_CATCHUP_TICKS):
+        self.simulation = simulation
+        self.timestep = FixedTimestep(simulation.tick_rate, max_catchup, simulation)
+        self.lock = threading.Lock()
+        self.last_advance = time.perf_counter()
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="simulation", daemon=True)
+
+    def start(self):
+        self.last_advance = time.perf_counter()
+        self._thread.start()
+
+    def stop(self):
+        """Stop stepping and wait for the thread to finish its current ticks."""
+        self._stopping.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+    @property
+    def alpha(self) -> float:
+        """Interpolation fraction for a frame drawn right now."""
+        if self.simulation.game_over:
+            return 1.0
+        timestep = self.timestep
+        pending = timestep.accumulator + time.perf_counter() - self.last_advance
+        return min(1.0, pending / timestep.dt)
+
+    def _run(self):
+        timestep = self.timestep
+        while not self._stopping.is_set():
+            now = time.perf_counter()
+            ticks = timestep.advance(now - self.last_advance)
+            with self.lock:
+                for _ in range(ticks):
+                    self.simulation.step()
+                self.last_advance = now
+            # Sleep until the next tick is due
+            self._stopping.wait(max(0.0, timestep.dt - timestep.accumulator))
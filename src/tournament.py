@@ -0,0 +1,227 @@
+"""
+AI-vs-AI tournament between two AI variants, played headless on a process pool.
+
+A variant is an AI class (module:Class, default src.ai:AI) plus overrides of
+its parameters (AIParams, or the class's params_class). Variants swap sides
+every game. With --sprt the run stops as soon as a sequential probability
+ratio test decides that variant A is better or worse than B by the given
+margin; games are fed to the test in game order, so the verdict doesn't
+depend on which games finish first. --fast-forward plays games with the
+event-driven engine of src.fast_forward, which gives the same results faster.
+
+Usage:
+    python -m src.tournament --b-param defend_threshold=0.5 --games 2000 --sprt
+    python -m src.tournament --a src.search_ai:SearchAI --a-param budget=0.05 --a-param waits=0,1.5 --a-param candidates=6
+    python -m src.tournament --a src.search_ai:SearchAI --a-param budget=inf --a-param max_iterations=10
+    python -m src.tournament --a src.policy_table:TableAI --fast-forward
+"""
+
+import argparse
+import importlib
+import math
+import os
+import time
+from dataclasses import dataclass, field, fields
+from multiprocessing import Pool
+from types import NoneType, UnionType
+from typing import get_args, get_origin, get_type_hints
+
+from src.ai import AI, AIParams
+from src.simulation import Simulation, PLAYER_SIDE
+from src.fast_forward import FastForward
+
+
+@dataclass(frozen=True)
+class Variant:
+    ai_class: str = "src.ai:AI"
+    params: dict = field(default_factory=dict)
+
+    def resolve(self) -> type:
+        module_name, class_name = self.ai_class.split(":")
+        return getattr(importlib.import_module(module_name), class_name)
+
+    def create(self, is_player_side: bool) -> AI:
+        ai_class = self.resolve()
+        return ai_class(is_player_side=is_player_side, params=params_class(ai_class)(**self.params))
+
+    def describe(self) -> str:
+        overrides = ", ".join(f"{k}={v}" for k, v in sorted(self.params.items()))
+        return f"{self.ai_class}({overrides})"
+
+
+def params_class(ai_class: type) -> type:
+    """Parameter dataclass taken by an AI class."""
+    return getattr(ai_class, "params_class", AIParams)
+
+
+def parse_value(text: str, value_type):
+    """
+    Convert a parameter value to its field's type: "none" for optional
+    fields, and comma-separated items for tuples.
+    """
+    args = get_args(value_type)
+    if get_origin(value_type) is UnionType:
+        if text.lower() == "none" and NoneType in args:
+            return None
+        return parse_value(text, next(arg for arg in args if arg is not NoneType))
+    if get_origin(value_type) is tuple:
+        return tuple(parse_value(item, args[0]) for item in text.split(",") if item)
+    if value_type is bool:
+        return text.lower() in ("1", "true", "yes")
+    return value_type(text)
+
+
+def parse_params(pairs: list[str], params_type: type = AIParams) -> dict:
+    """Parse key=value parameter overrides, each converted to its field's type."""
+    types = get_type_hints(params_type)
+    known = {f.name for f in fields(params_type)}
+    params = {}
+    for pair in pairs:
+        key, _, value = pair.partition("=")
+        if key not in known:
+            raise argparse.ArgumentTypeError(f"Unknown AI parameter: {key!r}")
+        try:
+            params[key] = parse_value(value, types[key])
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"Bad value for {key}: {value!r}") from None
+    return params
+
+
+def play_game(task: tuple[int, int, Variant, Variant, float, bool]) -> tuple[int, int]:
+    """
+    Play one game and return (game index, score for A): 1 win, 0 loss, -1 undecided.
+    The match is seeded from the game index, so for AIs that don't read the
+    clock, results don't depend on which worker plays which game. SearchAI
+    searches until a wall-clock budget runs out, so its moves depend on the
+    machine and its load, unless it stops after a fixed number of rollouts
+    first (max_iterations, with a budget it never reaches).
+    """
+    index, seed, variant_a, variant_b, max_time, fast_forward = task
+    a_is_player = index % 2 == 0
+    player = (variant_a if a_is_player else variant_b).create(is_player_side=True)
+    enemy = (variant_b if a_is_player else variant_a).create(is_player_side=False)
+
+    simulation = Simulation(player=player, enemy=enemy, seed=seed * 1_000_003 + index)
+    if fast_forward:
+        winner = FastForward(simulation).run(max_time=max_time)
+    else:
+        winner = simulation.run(max_time=max_time)
+    if winner is None:
+        return index, -1
+    return index, int((winner == PLAYER_SIDE) == a_is_player)
+
+
+def wilson_interval(wins: int, games: int, z: float = 1.96) -> tuple[float, float]:
+    """Wilson score interval for a win rate."""
+    if games == 0:
+        return 0.0, 1.0
+    rate = wins / games
+    denominator = 1 + z * z / games
+    center = (rate + z * z / (2 * games)) / denominator
+    margin = z * math.sqrt(rate * (1 - rate) / games + z * z / (4 * games * games)) / denominator
+    return center - margin, center + margin
+
+
+class SPRT:
+    """
+    Sequential probability ratio test of H0: p = 0.5 - delta against
+    H1: p = 0.5 + delta, where p is A's win rate over decisive games.
+    """
+
+    def __init__(self, delta: float = 0.05, alpha: float = 0.05, beta: float = 0.05):
+        self.win_llr = math.log((0.5 + delta) / (0.5 - delta))
+        self.loss_llr = -self.win_llr
+        self.lower = math.log(beta / (1 - alpha))
+        self.upper = math.log((1 - beta) / alpha)
+        self.llr = 0.0
+
+    def add(self, won: bool):
+        self.llr += self.win_llr if won else self.loss_llr
+
+    @property
+    def verdict(self) -> str | None:
+        if self.llr >= self.upper:
+            return "A is better"
+        if self.llr <= self.lower:
+            return "A is worse"
+        return None
+
+
+def run_tournament(variant_a: Variant, variant_b: Variant, games: int, workers: int,
+                   seed: int = 0, max_time: float = 600.0, sprt: SPRT | None = None,
+                   fast_forward: bool = False) -> dict:
+    """Play up to `games` games and return the tally, stopping early on an SPRT verdict."""
+    wins = losses = undecided = 0
+    tasks = ((index, seed, variant_a, variant_b, max_time, fast_forward) for index in range(games))
+    start = time.perf_counter()
+
+    with Pool(workers) as pool:
+        # In game order: taking results as they finish would feed the SPRT
+        # short games first and bias its early stop toward them
+        for _, score in pool.imap(play_game, tasks, chunksize=4):
+            if score < 0:
+                undecided += 1
+                continue
+            if score:
+                wins += 1
+            else:
+                losses += 1
+            if sprt is not None:
+                sprt.add(bool(score))
+                if sprt.verdict is not None:
+                    pool.terminate()
+                    break
+
+    return {
+        "wins": wins,
+        "losses": losses,
+        "undecided": undecided,
+        "seconds": time.perf_counter() - start,
+        "verdict": sprt.verdict if sprt is not None else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--a", default="src.ai:AI", help="AI class of variant A (module:Class)")
+    parser.add_argument("--b", default="src.ai:AI", help="AI class of variant B (module:Class)")
+    parser.add_argument("--a-param", action="append", default=[], metavar="KEY=VALUE")
+    parser.add_argument("--b-param", action="append", default=[], metavar="KEY=VALUE")
+    parser.add_argument("--games", type=int, default=1000, help="maximum number of games")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-time", type=float, default=600.0,
+                        help="game seconds before a game counts as undecided")
+    parser.add_argument("--sprt", action="store_true", help="stop early once SPRT decides")
+    parser.add_argument("--fast-forward", action="store_true",
+                        help="jump over uneventful ticks instead of stepping every one")
+    parser.add_argument("--delta", type=float, default=0.05,
+                        help="SPRT win rate margin around 0.5")
+    parser.add_argument("--alpha", type=float, default=0.05)
+    parser.add_argument("--beta", type=float, default=0.05)
+    args = parser.parse_args()
+
+    variant_a = Variant(args.a, parse_params(args.a_param, params_class(Variant(args.a).resolve())))
+    variant_b = Variant(args.b, parse_params(args.b_param, params_class(Variant(args.b).resolve())))
+    sprt = SPRT(args.delta, args.alpha, args.beta) if args.sprt else None
+
+    print(f"A: {variant_a.describe()}")
+    print(f"B: {variant_b.describe()}")
+    result = run_tournament(variant_a, variant_b, args.games, args.workers,
+                            args.seed, args.max_time, sprt, args.fast_forward)
+
+    decisive = result["wins"] + result["losses"]
+    played = decisive + result["undecided"]
+    low, high = wilson_interval(result["wins"], decisive)
+    rate = result["wins"] / decisive if decisive else 0.0
+    print(f"games: {played} ({result['undecided']} undecided) in {result['seconds']:.1f}s "
+          f"({played / result['seconds']:.1f} games/s on {args.workers} workers)")
+    print(f"A won {result['wins']}, lost {result['losses']}: "
+          f"win rate {rate:.3f} (95% CI {low:.3f}-{high:.3f})")
+    if sprt is not None:
+        print(f"SPRT: {result['verdict'] or 'no decision'} (LLR {sprt.llr:.2f}, "
+              f"bounds {sprt.lower:.2f}..{sprt.upper:.2f})")
+
+
+if __name__ == "__main__":
+    main()
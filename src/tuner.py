@@ -0,0 +1,330 @@
+"""
+Evolutionary tuning of the AI parameters and unit stats.
+
+A genetic search over the AIParams fields (the AI_* constants) and the
+combat stats of every unit type; costs stay as they are. Each candidate
+plays --matches fast-forwarded headless matches on a process pool: its AI
+against the current game AI, both sides with the candidate's unit stats,
+swapping sides every match and on the same seeds for every candidate.
+Fitness is the candidate AI's win rate minus how unbalanced its unit stats
+are, i.e. per unit type how much more of the winners' spawns than of the
+losers' it made up.
+
+Every evaluated candidate is appended to a cache in the run directory and a
+checkpoint is written after every generation, so running again with the same
+run directory resumes the job, and no candidate is ever played twice. The
+best candidate so far is kept in the run directory's params.json, which the
+game loads in place of the constants with main.py --params (or PARAMS_FILE_ENV).
+
+Usage: python -m src.tuner [--run-dir DIR] [--generations N] [--population N] [--matches N]
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import time
+from dataclasses import dataclass
+from multiprocessing import Pool
+
+from src.ai import AI, AIParams
+from src.fast_forward import FastForward
+from src.params import AI_FIELDS, UNIT_STATS, INTEGER_UNIT_STATS
+from src.simulation import Simulation, PLAYER_SIDE
+from src.unit_types import UNIT_TABLE
+
+# Ranges searched for the AI parameters; unit stats range UNIT_STAT_SPREAD
+# either side of their current values
+AI_RANGES = {
+    "decision_interval": (0.25, 4.0),
+    "defend_threshold": (0.3, 0.95),
+    "reinforce_threshold": (0.05, 0.7),
+    "reinforce_chance": (0.0, 1.0),
+}
+UNIT_STAT_SPREAD = 0.5
+# Weight of unit type imbalance against win rate in a candidate's fitness
+BALANCE_WEIGHT = 0.5
+# Chance of a gene mutating in a child, and the size of the mutation (genes run from 0 to 1)
+MUTATION_RATE = 0.2
+MUTATION_SIGMA = 0.1
+TOURNAMENT_SIZE = 3
+
+
+@dataclass(frozen=True)
+class Parameter:
+    """One searched value: an AIParams field (section "ai") or a stat of a unit type (section is its key)."""
+    section: str
+    name: str
+    low: float
+    high: float
+    integer: bool = False
+
+    def value(self, gene: float) -> float | int:
+        value = self.low + gene * (self.high - self.low)
+        return round(value) if self.integer else round(value, 4)
+
+    def gene(self, value: float) -> float:
+        return min(1.0, max(0.0, (value - self.low) / (self.high - self.low)))
+
+
+def search_space() -> list[Parameter]:
+    """Every searched value, the AI parameters first, then each unit type's stats."""
+    space = [Parameter("ai", name, *AI_RANGES[name]) for name in AI_FIELDS]
+    for key, definition in UNIT_TABLE.definitions.items():
+        for stat in UNIT_STATS:
+            low = definition[stat] * (1 - UNIT_STAT_SPREAD)
+            high = definition[stat] * (1 + UNIT_STAT_SPREAD)
+            integer = stat in INTEGER_UNIT_STATS
+            if integer:
+                low, high = max(1, math.floor(low)), math.ceil(high)
+            space.append(Parameter(key, stat, low, high, integer))
+    return space
+
+
+def current_genes(space: list[Parameter]) -> list[float]:
+    """Genes of the parameters the game currently plays with."""
+    params = AIParams()
+    return [round(p.gene(getattr(params, p.name) if p.section == "ai" else UNIT_TABLE.definitions[p.section][p.name]), 4)
+            for p in space]
+
+
+def decode(space: list[Parameter], genes: list[float]) -> dict:
+    """Parameters of a candidate, in the parameters file format (see src.params)."""
+    params = {"ai": {}, "unit_types": {}}
+    for parameter, gene in zip(space, genes):
+        if parameter.section == "ai":
+            params["ai"][parameter.name] = parameter.value(gene)
+        else:
+            params["unit_types"].setdefault(parameter.section, {})[parameter.name] = parameter.value(gene)
+    return params
+
+
+def candidate_key(params: dict) -> str:
+    """Cache key of a candidate: genes that decode to the same values share it."""
+    return json.dumps(params, sort_keys=True)
+
+
+def _spawn_counter(counts: list[int]):
+    def on_spawn(unit_name: str, lane: int):
+        counts[UNIT_TABLE.ids[unit_name]] += 1
+    return on_spawn
+
+
+def play_match(task: tuple[str, dict, int, int, float]) -> tuple[str, int, int, list[float]]:
+    """
+    Play one match of a candidate and return (key, match index, result for the
+    candidate: 1 win, 0 loss, -1 undecided, and per unit type the winner's
+    share of spawns minus the loser's).
+    """
+    key, params, index, seed, max_time = task
+    candidate_is_player = index % 2 == 0
+    candidate = AI(is_player_side=candidate_is_player, params=AIParams(**params["ai"]))
+    reference = AI(is_player_side=not candidate_is_player)
+    unit_types = UNIT_TABLE.with_stats(params["unit_types"])
+    spawns = {}
+    for ai in (candidate, reference):
+        ai.unit_types = unit_types
+        spawns[ai] = [0] * len(UNIT_TABLE)
+        ai.spawn_listener = _spawn_counter(spawns[ai])
+
+    player, enemy = (candidate, reference) if candidate_is_player else (reference, candidate)
+    simulation = Simulation(player=player, enemy=enemy, seed=seed * 1_000_003 + index)
+    winner = FastForward(simulation).run(max_time=max_time)
+    if winner is None:
+        return key, index, -1, [0.0] * len(UNIT_TABLE)
+    won = (winner == PLAYER_SIDE) == candidate_is_player
+    winning, losing = (spawns[candidate], spawns[reference]) if won else (spawns[reference], spawns[candidate])
+    shares = [w / max(1, sum(winning)) - l / max(1, sum(losing)) for w, l in zip(winning, losing)]
+    return key, index, int(won), shares
+
+
+def score(results: list[tuple[int, list[float]]]) -> dict:
+    """Fitness of a candidate from its (result, spawn share differences) per match, in match order."""
+    wins = sum(won == 1 for won, _ in results)
+    undecided = sum(won < 0 for won, _ in results)
+    # Undecided matches count as half a win
+    win_rate = (wins + 0.5 * undecided) / len(results)
+    decisive = [shares for won, shares in results if won >= 0]
+    imbalance = 0.0
+    if decisive:
+        imbalance = sum(abs(sum(column) / len(decisive)) for column in zip(*decisive))
+    return {"fitness": win_rate - BALANCE_WEIGHT * imbalance, "win_rate": win_rate, "imbalance": imbalance}
+
+
+def initial_population(genes: list[float], size: int, rng: random.Random) -> list[list[float]]:
+    """The current parameters, and mutations of every gene of them for the rest."""
+    population = [genes]
+    while len(population) < size:
+        population.append(mutate(genes, rng, rate=1.0))
+    return population
+
+
+def mutate(genes: list[float], rng: random.Random, rate: float = MUTATION_RATE) -> list[float]:
+    return [round(min(1.0, max(0.0, gene + rng.gauss(0.0, MUTATION_SIGMA))), 4) if rng.random() < rate else gene
+            for gene in genes]
+
+
+def next_generation(population: list[list[float]], fitnesses: list[float], elite: int,
+                    rng: random.Random) -> list[list[float]]:
+    """Keep the elite, then fill up with mutated uniform crossovers of tournament-selected parents."""
+    ranked = sorted(range(len(population)), key=lambda i: fitnesses[i], reverse=True)
+    children = [population[i] for i in ranked[:elite]]
+
+    # Populations smaller than a tournament hold it among everyone
+    size = min(TOURNAMENT_SIZE, len(population))
+
+    def select() -> list[float]:
+        return population[max(rng.sample(range(len(population)), size), key=lambda i: fitnesses[i])]
+
+    while len(children) < len(population):
+        mother, father = select(), select()
+        child = [m if rng.random() < 0.5 else f for m, f in zip(mother, father)]
+        children.append(mutate(child, rng))
+    return children
+
+
+def write_json(path: str, data):
+    """Write a JSON file atomically, so an interrupted job never leaves half a file."""
+    temporary = path + ".tmp"
+    with open(temporary, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(temporary, path)
+
+
+def load_cache(path: str) -> dict[str, dict]:
+    """Evaluated candidates by key. A line cut short by an interruption is skipped."""
+    cache = {}
+    if os.path.exists(path):
+        with open(path) as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                cache[record["key"]] = record
+    return cache
+
+
+class Tuner:
+    """A tuning job kept in a run directory: cache.jsonl, checkpoint.json and params.json."""
+
+    def __init__(self, run_dir: str, population: int = 16, matches: int = 40, elite: int = 2,
+                 seed: int = 0, max_time: float = 300.0):
+        self.run_dir = run_dir
+        self.space = search_space()
+        self.settings = {
+            "population": population, "matches": matches, "elite": elite, "seed": seed,
+            "max_time": max_time, "space": [[p.section, p.name, p.low, p.high] for p in self.space],
+        }
+        self.cache_path = os.path.join(run_dir, "cache.jsonl")
+        self.checkpoint_path = os.path.join(run_dir, "checkpoint.json")
+        self.params_path = os.path.join(run_dir, "params.json")
+
+        os.makedirs(run_dir, exist_ok=True)
+        self.cache = load_cache(self.cache_path)
+        # End a line cut short by an interruption, so the next record starts on its own
+        if os.path.exists(self.cache_path):
+            with open(self.cache_path, "rb+") as f:
+                if f.seek(0, os.SEEK_END) and (f.seek(-1, os.SEEK_END), f.read(1))[1] != b"\n":
+                    f.write(b"\n")
+        self.rng = random.Random(seed)
+        self.generation = 0
+        self.history: list[dict] = []
+        if os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path) as f:
+                checkpoint = json.load(f)
+            if checkpoint["settings"] != self.settings:
+                raise ValueError(f"{run_dir} holds a job with other settings; resume it with those or use another run directory")
+            self.generation = checkpoint["generation"]
+            self.population = checkpoint["population"]
+            self.history = checkpoint["history"]
+            version, internal, gauss_next = checkpoint["rng"]
+            self.rng.setstate((version, tuple(internal), gauss_next))
+        else:
+            self.population = initial_population(current_genes(self.space), population, self.rng)
+
+    def evaluate(self, pool) -> tuple[list[dict], int]:
+        """Cache records of the current population, and how many candidates weren't cached and were played."""
+        candidates = [decode(self.space, genes) for genes in self.population]
+        keys = [candidate_key(params) for params in candidates]
+        todo = {key: params for key, params in zip(keys, candidates) if key not in self.cache}
+        matches, seed, max_time = self.settings["matches"], self.settings["seed"], self.settings["max_time"]
+        tasks = [(key, params, index, seed, max_time) for key, params in todo.items() for index in range(matches)]
+
+        results: dict[str, list] = {key: [] for key in todo}
+        with open(self.cache_path, "a") as cache_file:
+            for key, index, won, shares in pool.imap_unordered(play_match, tasks, chunksize=4):
+                results[key].append((index, won, shares))
+                if len(results[key]) == matches:
+                    # Scored in match order, so the fitness doesn't depend on the workers
+                    ordered = [(won, shares) for _, won, shares in sorted(results[key], key=lambda r: r[0])]
+                    record = {"key": key, "params": todo[key], **score(ordered)}
+                    self.cache[key] = record
+                    cache_file.write(json.dumps(record) + "\n")
+                    cache_file.flush()
+        return [self.cache[key] for key in keys], len(todo)
+
+    def step(self, pool) -> dict:
+        """Evaluate a generation, save the best candidate so far, breed the next and checkpoint."""
+        start = time.perf_counter()
+        records, played = self.evaluate(pool)
+        fitnesses = [record["fitness"] for record in records]
+        best = max(records, key=lambda record: record["fitness"])
+        summary = {
+            "generation": self.generation, "best": best["fitness"], "win_rate": best["win_rate"],
+            "imbalance": best["imbalance"], "mean": sum(fitnesses) / len(fitnesses),
+            "played": played, "cached": len(records) - played,
+            "seconds": time.perf_counter() - start,
+        }
+        self.history.append(summary)
+
+        overall = max(self.cache.values(), key=lambda record: record["fitness"])
+        write_json(self.params_path, {
+            **overall["params"],
+            "tuning": {key: overall[key] for key in ("fitness", "win_rate", "imbalance")}
+            | {"matches": self.settings["matches"], "generation": self.generation},
+        })
+
+        self.population = next_generation(self.population, fitnesses, self.settings["elite"], self.rng)
+        self.generation += 1
+        version, internal, gauss_next = self.rng.getstate()
+        write_json(self.checkpoint_path, {
+            "settings": self.settings, "generation": self.generation, "population": self.population,
+            "history": self.history, "rng": [version, list(internal), gauss_next],
+        })
+        return summary
+
+    def run(self, generations: int, workers: int):
+        """Run up to generation number generations, printing a line per generation."""
+        if self.generation:
+            print(f"resuming {self.run_dir} at generation {self.generation}, {len(self.cache)} candidates cached")
+        with Pool(workers) as pool:
+            while self.generation < generations:
+                summary = self.step(pool)
+                print(f"generation {summary['generation']}: best {summary['best']:.3f} "
+                      f"(win rate {summary['win_rate']:.3f}, imbalance {summary['imbalance']:.3f}), "
+                      f"mean {summary['mean']:.3f}, {summary['played']} played, {summary['cached']} cached, "
+                      f"{summary['seconds']:.1f}s")
+        print(f"best parameters in {self.params_path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--run-dir", default="tuning", help="where the job keeps its cache, checkpoint and results")
+    parser.add_argument("--generations", type=int, default=20)
+    parser.add_argument("--population", type=int, default=16)
+    parser.add_argument("--matches", type=int, default=40, help="matches played per candidate")
+    parser.add_argument("--elite", type=int, default=2, help="best candidates kept unchanged each generation")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-time", type=float, default=300.0,
+                        help="game seconds before a match counts as undecided")
+    args = parser.parse_args()
+
+    tuner = Tuner(args.run_dir, args.population, args.matches, args.elite, args.seed, args.max_time)
+    tuner.run(args.generations, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Two-phase (plan, then commit) combat ticks.
+
+The legacy tick updates the player side's units, then the enemy's: player
+units strike first, and an enemy they kill that tick never strikes back.
+A two-phase tick has every unit of both sides plan its target, move and
+attack from the same state, then applies all the plans at once, so no unit
+or side goes first. Planning only reads the state and committing only reads
+the plans, so either phase can be split (by lane, say) between workers.
+
+Turned on by Simulation(two_phase=True), or TWO_PHASE_TICK for every match.
+It changes match outcomes, which is why it is off by default: over 20 AI
+matches (seeds 0-19) two came out with the other side winning than with the
+legacy tick, and mirrored matches (both sides spawning the same units)
+stayed mirrored for 15855 ticks on average instead of 272. The CLI below
+measures both; tests/test_two_phase.py checks that the order units are
+planned and committed in doesn't matter, and that fast-forwarding still
+matches stepping.
+
+Usage: python -m src.two_phase [--games N] [--seed N] [--max-time S]
+"""
+
+import random
+from typing import TYPE_CHECKING
+from src.constants import PLAYER_BASE_Y, ENEMY_BASE_Y
+
+if TYPE_CHECKING:
+    from src.lane_index import LaneIndex
+    from src.unit import Unit
+
+# A unit's plan for one tick: (unit, target, whether it attacks, y, attack cooldown, target cache)
+Plan = tuple
+
+
+def plan_units(units: list["Unit"], enemies: "LaneIndex", dt: float) -> list[Plan]:
+    """Phase 1: every unit's plan against the enemies' current positions. Changes nothing."""
+    return [(unit, *unit.plan(dt, enemies)) for unit in units]
+
+
+def commit_plans(plans: list[Plan]):
+    """
+    Phase 2: apply every plan and deal every planned attack. Units only
+    receive damage and damage only adds up, so the order of plans doesn't
+    matter; dead units stay in place until Player.remove_dead.
+    """
+    for unit, target, attacks, y, cooldown, target_cache in plans:
+        unit.apply(target, y, cooldown, target_cache)
+        if attacks:
+            target.take_damage(unit.damage)
+
+
+def is_mirrored(simulation) -> bool:
+    """Whether both sides' units are mirror images (same hp and distance from their base)."""
+    bottom, top = simulation.player.units, simulation.enemy.units
+    if len(bottom) != len(top):
+        return False
+    return all(
+        (b.lane, b.hp) == (t.lane, t.hp) and abs((PLAYER_BASE_Y - b.y) - (t.y - ENEMY_BASE_Y)) < 1e-6
+        for b, t in zip(bottom, top)
+    )
+
+
+def mirrored_ticks(seed: int, two_phase: bool, max_time: float) -> int:
+    """
+    Ticks a mirrored match (both sides spawning the same units at the same
+    ticks) stays mirrored. Two-phase ones only drift apart once float rounding
+    puts a unit on one side of a range boundary and its mirror image on the other.
+    """
+    # Imported here: Simulation imports this module
+    from src.constants import NUM_LANES
+    from src.simulation import Simulation, PLAYER_SIDE, ENEMY_SIDE
+    from src.unit_types import UNIT_TABLE
+
+    script = random.Random(seed)
+    simulation = Simulation(enemy_ai=False, two_phase=two_phase)
+    while not simulation.game_over and simulation.time < max_time:
+        if simulation.ticks % 30 == 0:
+            unit_name, lane = script.choice(UNIT_TABLE.names), script.randrange(NUM_LANES)
+            simulation.apply_action(PLAYER_SIDE, unit_name, lane)
+            simulation.apply_action(ENEMY_SIDE, unit_name, lane)
+        simulation.step()
+        if not is_mirrored(simulation):
+            break
+    return simulation.ticks
+
+
+def main():
+    # Imported here: Simulation imports this module, and the simulation shouldn't pay for the CLI
+    import argparse
+    from src.simulation import Simulation, PLAYER_SIDE
+
+    parser = argparse.ArgumentParser(description="Compare match results of the two-phase and legacy ticks")
+    parser.add_argument("--games", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-time", type=float, default=600.0)
+    args = parser.parse_args()
+
+    mirrored = {two_phase: sum(mirrored_ticks(args.seed + index, two_phase, args.max_time)
+                               for index in range(args.games))
+                for two_phase in (False, True)}
+    print(f"mirrored matches stay mirrored for {mirrored[False] / args.games:.0f} ticks with the legacy tick, "
+          f"{mirrored[True] / args.games:.0f} with the two-phase one")
+
+    same_winner = 0
+    wins = {False: 0, True: 0}
+    ticks = {False: 0, True: 0}
+    for index in range(args.games):
+        seed = args.seed + index
+        legacy = Simulation(player_ai=True, seed=seed)
+        legacy.run(max_time=args.max_time)
+        stepped = Simulation(player_ai=True, seed=seed, two_phase=True)
+        stepped.run(max_time=args.max_time)
+
+        same_winner += legacy.winner == stepped.winner
+        for two_phase, simulation in ((False, legacy), (True, stepped)):
+            wins[two_phase] += simulation.winner == PLAYER_SIDE
+            ticks[two_phase] += simulation.ticks
+
+    print(f"{same_winner}/{args.games} matches won by the same side as with the legacy tick")
+    for two_phase, name in ((False, "legacy"), (True, "two-phase")):
+        print(f"{name:>9}: player side won {wins[two_phase]}/{args.games}, "
+              f"{ticks[two_phase] / args.games:.0f} ticks per match")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,20 +5,46 @@ from src.constants import (
     DARK_GRAY, CARD_Y
 )
 from src.card import Deck
+from src.sprites import SpriteAtlas
+from src.text_cache import TextCache, CachedFont
+
+# Large, medium and small text
+FONT_SIZES = (48, 32, 24)
 
 
 class UI:
-    def __init__(self):
-        self.deck = Deck(CARD_Y)
-        self.font_large = None
-        self.font_medium = None
-        self.font_small = None
+    def __init__(self, sprites: SpriteAtlas | None = None):
+        self.deck = Deck(CARD_Y, sprites)
+        # Default font by size, loaded the first time it is drawn with
+        self.fonts: dict[int, CachedFont] = {}
+        # Rendered strings shared by every font, and the reused game over overlay
+        self.text_cache = TextCache()
+        self.overlay: pygame.Surface | None = None
 
     def init_fonts(self):
-        """Initialize fonts (must be called after pygame.init())."""
-        self.font_large = pygame.font.Font(None, 48)
-        self.font_medium = pygame.font.Font(None, 32)
-        self.font_small = pygame.font.Font(None, 24)
+        """Load the fonts now instead of on first use."""
+        for size in FONT_SIZES:
+            self.font(size)
+
+    def font(self, size: int) -> CachedFont:
+        font = self.fonts.get(size)
+        if font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            font = self.fonts[size] = CachedFont(pygame.font.Font(None, size), self.text_cache)
+        return font
+
+    @property
+    def font_large(self) -> CachedFont:
+        return self.font(FONT_SIZES[0])
+
+    @property
+    def font_medium(self) -> CachedFont:
+        return self.font(FONT_SIZES[1])
+
+    @property
+    def font_small(self) -> CachedFont:
+        return self.font(FONT_SIZES[2])
 
     def render_header(self, screen: pygame.Surface, enemy_mana: float):
         """Render the header with game title and enemy mana."""
@@ -85,10 +111,11 @@ class UI:
     def render_game_over(self, screen: pygame.Surface, player_won: bool):
         """Render game over screen."""
         # Semi-transparent overlay
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        overlay.fill(BLACK)
-        overlay.set_alpha(180)
-        screen.blit(overlay, (0, 0))
+        if self.overlay is None:
+            self.overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+            self.overlay.fill(BLACK)
+            self.overlay.set_alpha(180)
+        screen.blit(self.overlay, (0, 0))
 
         # Result text
         if player_won:
@@ -1,52 +1,51 @@
-import pygame
-from dataclasses import dataclass
-from typing import Optional
+import itertools
+from typing import Optional, TYPE_CHECKING
 from src.constants import (
-    UNIT_TYPES, LANE_WIDTH,
+    LANE_WIDTH,
     HEALTH_BAR_BG, HEALTH_BAR_PLAYER, HEALTH_BAR_ENEMY,
     PLAYER_BASE_Y, ENEMY_BASE_Y
 )
+# UnitType lives with the unit type table; importers of this module still find it here
+from src.unit_types import UnitType, INTERNED_TYPES
 
+if TYPE_CHECKING:
+    import pygame
+    from src.lane_index import LaneIndex
+    from src.lane_stats import LaneStats
 
-@dataclass
-class UnitType:
-    name: str
-    hp: int
-    damage: int
-    speed: int
-    range: int
-    cost: int
-    attack_cooldown: float
-    shape: str
-    color: tuple
-    size: int
-
-    @classmethod
-    def from_name(cls, unit_name: str) -> "UnitType":
-        data = UNIT_TYPES[unit_name]
-        return cls(
-            name=data["name"],
-            hp=data["hp"],
-            damage=data["damage"],
-            speed=data["speed"],
-            range=data["range"],
-            cost=data["cost"],
-            attack_cooldown=data["attack_cooldown"],
-            shape=data["shape"],
-            color=data["color"],
-            size=data["size"],
-        )
+# Global spawn counter, used to break targeting ties in spawn order
+_spawn_counter = itertools.count()
+# Slack on a cached target's distance, so float rounding can't hide an enemy as close
+TARGET_SLACK = 1e-6
+
+
+def next_spawn_order() -> int:
+    """Next value of the global spawn counter."""
+    return next(_spawn_counter)
 
 
 class Unit:
-    def __init__(self, unit_type: UnitType, lane: int, is_player: bool):
+    __slots__ = (
+        "unit_type", "lane", "is_player", "seq", "x", "y", "prev_y",
+        "max_hp", "hp", "damage", "speed", "range", "direction",
+        "target", "target_cache", "attack_cooldown", "is_attacking", "lane_stats",
+    )
+
+    def __init__(self, unit_type: UnitType, lane: int, is_player: bool, seq: int | None = None):
+        self.reset(unit_type, lane, is_player, seq)
+
+    def reset(self, unit_type: UnitType, lane: int, is_player: bool, seq: int | None = None):
+        """(Re)initialize as a freshly spawned unit, so pooled units can be reused."""
         self.unit_type = unit_type
         self.lane = lane
         self.is_player = is_player
+        self.seq = next_spawn_order() if seq is None else seq
 
         # Position (vertical orientation: x is lane-based, y moves)
         self.x = lane * LANE_WIDTH + LANE_WIDTH // 2
         self.y = PLAYER_BASE_Y if is_player else ENEMY_BASE_Y
+        # y before the last update, for drawing between ticks
+        self.prev_y = self.y
 
         # Stats (copy from type so they can be modified)
         self.max_hp = unit_type.hp
@@ -60,31 +59,50 @@ class Unit:
 
         # Combat state
         self.target: Optional["Unit"] = None
+        # Last target found, as (target, its seq, its y, our y, enemy lane version), see find_target
+        self.target_cache: tuple | None = None
         self.attack_cooldown = 0.0
         self.is_attacking = False
 
+        # Owner's per-lane totals, told about every hp change
+        self.lane_stats: Optional["LaneStats"] = None
+
     @property
     def is_alive(self) -> bool:
         return self.hp > 0
 
-    def find_target(self, enemies: list["Unit"]) -> Optional["Unit"]:
-        """Find the nearest enemy unit in range."""
-        nearest_enemy = None
-        nearest_distance = float('inf')
+    def find_target(self, enemies: "LaneIndex") -> Optional["Unit"]:
+        """
+        Find the nearest enemy unit in range. The last target found is kept
+        without searching while it provably still is: neither unit has moved,
+        it is alive (and not recycled by the pool), and the lane index has seen
+        no enemy spawn in or move to anywhere as close since.
+        """
+        target, self.target_cache = self.lookup_target(enemies)
+        return target
 
-        for enemy in enemies:
-            if not enemy.is_alive or enemy.lane != self.lane:
-                continue
+    def lookup_target(self, enemies: "LaneIndex") -> tuple[Optional["Unit"], tuple | None]:
+        """find_target without keeping anything: the target and the target_cache that goes with it."""
+        cache = self.target_cache
+        if cache is not None:
+            target, seq, target_y, y, version = cache
+            if y == self.y and target.hp > 0 and target.seq == seq and target.y == target_y:
+                reach = abs(target_y - y) + TARGET_SLACK
+                if enemies.unchanged_within(self.lane, version, y - reach, y + reach):
+                    latest = enemies.versions[self.lane]
+                    if latest != version:
+                        cache = (target, seq, target_y, y, latest)
+                    return target, cache
 
-            distance = abs(self.y - enemy.y)
-            if distance <= self.range and distance < nearest_distance:
-                nearest_distance = distance
-                nearest_enemy = enemy
+        target = enemies.nearest(self.lane, self.y, self.range)
+        if target is None:
+            return None, None
+        return target, (target, target.seq, target.y, self.y, enemies.versions[self.lane])
 
-        return nearest_enemy
+    def update(self, dt: float, enemies: "LaneIndex"):
+        """Update unit state each tick."""
+        self.prev_y = self.y
 
-    def update(self, dt: float, enemies: list["Unit"]):
-        """Update unit state each frame."""
         # Update attack cooldown
         if self.attack_cooldown > 0:
             self.attack_cooldown -= dt
@@ -102,6 +120,58 @@ class Unit:
             self.is_attacking = False
             self.y += self.direction * self.speed * dt
 
+    def plan(self, dt: float, enemies: "LaneIndex") -> tuple[Optional["Unit"], bool, float, float, tuple | None]:
+        """
+        What update() does this tick, worked out without changing anything:
+        (target, whether it attacks the target, y, attack cooldown, target
+        cache). apply() takes it on; for the two-phase tick, see src.two_phase.
+        """
+        cooldown = self.attack_cooldown
+        if cooldown > 0:
+            cooldown -= dt
+
+        target, cache = self.lookup_target(enemies)
+        if target is not None:
+            if cooldown <= 0:
+                return target, True, self.y, self.unit_type.attack_cooldown, cache
+            return target, False, self.y, cooldown, cache
+        return None, False, self.y + self.direction * self.speed * dt, cooldown, cache
+
+    def apply(self, target: Optional["Unit"], y: float, cooldown: float, target_cache: tuple | None):
+        """Take on the state planned by plan(); the attack itself is dealt separately."""
+        self.prev_y = self.y
+        self.target = target
+        self.target_cache = target_cache
+        self.is_attacking = target is not None
+        self.y = y
+        self.attack_cooldown = cooldown
+
+    def coast(self, ticks: int, dt: float, enemies: "LaneIndex"):
+        """
+        Apply ticks updates at once, exactly as update() would, given that no
+        enemy enters or leaves range and no attack comes due meanwhile (see
+        src.fast_forward). Attacking units hold still while their cooldown runs.
+        """
+        cooldown = self.attack_cooldown
+        for _ in range(ticks):
+            if cooldown <= 0:
+                break
+            cooldown -= dt
+        self.attack_cooldown = cooldown
+
+        self.target = self.find_target(enemies)
+        self.is_attacking = self.target is not None
+        if self.is_attacking:
+            self.prev_y = self.y
+            return
+        # Same additions as ticking, so positions come out bit-identical
+        step = self.direction * self.speed * dt
+        y = self.y
+        for _ in range(ticks - 1):
+            y += step
+        self.prev_y = y
+        self.y = y + step
+
     def attack(self, target: "Unit"):
         """Attack the target unit."""
         target.take_damage(self.damage)
@@ -109,9 +179,12 @@ class Unit:
 
     def take_damage(self, amount: int):
         """Receive damage."""
+        hp_before = self.hp
         self.hp -= amount
         if self.hp < 0:
             self.hp = 0
+        if self.lane_stats is not None:
+            self.lane_stats.damage(self.lane, hp_before, self.hp)
 
     def has_reached_enemy_base(self) -> bool:
         """Check if unit has reached the enemy's base."""
@@ -120,30 +193,38 @@ class Unit:
         else:
             return self.y >= PLAYER_BASE_Y
 
-    def render(self, screen: pygame.Surface):
+    def render_y(self, alpha: float) -> float:
+        """y interpolated between the last two ticks (alpha 1 is the current y)."""
+        return self.prev_y + (self.y - self.prev_y) * alpha
+
+    def render(self, screen: "pygame.Surface", alpha: float = 1.0):
         """Render the unit on screen."""
+        # Imported here so the simulation can run without SDL
+        import pygame
+
         size = self.unit_type.size
         half_size = size // 2
+        y = self.render_y(alpha)
 
         # Draw unit shape
         if self.unit_type.shape == "rect":
             rect = pygame.Rect(
                 self.x - half_size,
-                self.y - half_size,
+                y - half_size,
                 size,
                 size
             )
             pygame.draw.rect(screen, self.unit_type.color, rect)
             pygame.draw.rect(screen, (255, 255, 255), rect, 2)
         else:  # circle
-            pygame.draw.circle(screen, self.unit_type.color, (int(self.x), int(self.y)), half_size)
-            pygame.draw.circle(screen, (255, 255, 255), (int(self.x), int(self.y)), half_size, 2)
+            pygame.draw.circle(screen, self.unit_type.color, (int(self.x), int(y)), half_size)
+            pygame.draw.circle(screen, (255, 255, 255), (int(self.x), int(y)), half_size, 2)
 
         # Draw health bar
         health_bar_width = size + 10
         health_bar_height = 6
         health_bar_x = self.x - health_bar_width // 2
-        health_bar_y = self.y - half_size - 12
+        health_bar_y = y - half_size - 12
 
         # Background
         pygame.draw.rect(screen, HEALTH_BAR_BG,
@@ -158,3 +239,48 @@ class Unit:
         # Border
         pygame.draw.rect(screen, (200, 200, 200),
                         (health_bar_x, health_bar_y, health_bar_width, health_bar_height), 1)
+
+
+class UnitView:
+    """
+    Read-only copy of one unit kept outside Unit objects (see src.unit_store
+    and src.shards), with the attributes Unit.render and the AI use.
+    """
+    __slots__ = ("unit_type", "lane", "x", "y", "hp", "max_hp", "is_player", "is_attacking", "seq")
+
+    render = Unit.render
+    render_y = Unit.render_y
+    has_reached_enemy_base = Unit.has_reached_enemy_base
+
+    @property
+    def is_alive(self) -> bool:
+        return self.hp > 0
+
+    @property
+    def prev_y(self) -> float:
+        # No previous positions are kept, so views draw without interpolation
+        return self.y
+
+
+class UnitPool:
+    """Free list of dead Units that spawns reuse instead of allocating new ones."""
+
+    def __init__(self):
+        self.free: list[Unit] = []
+
+    def __len__(self) -> int:
+        return len(self.free)
+
+    def acquire(self, unit_type: UnitType, lane: int, is_player: bool, seq: int | None = None) -> Unit:
+        if self.free:
+            unit = self.free.pop()
+            unit.reset(unit_type, lane, is_player, seq)
+            return unit
+        return Unit(unit_type, lane, is_player, seq)
+
+    def release(self, unit: Unit):
+        """Take back a dead unit; nothing may use it afterwards."""
+        self.free.append(unit)
+
+    def clear(self):
+        self.free.clear()
@@ -0,0 +1,372 @@
+import numpy as np
+
+from src.constants import (
+    LANE_WIDTH, PLAYER_BASE_Y, ENEMY_BASE_Y
+)
+# UnitView lives with Unit, since sharded units use it too; importers of this module still find it here
+from src.unit import Unit, UnitType, UnitView, next_spawn_order
+from src.unit_types import UNIT_TABLE
+
+# Unit type names by id (UnitType.type_id), the type_id column's values
+UNIT_NAMES = UNIT_TABLE.names
+
+
+class TargetIndex:
+    """
+    Targets sorted by (group, y, spawn order) for vectorized nearest-in-range queries.
+    Groups are lanes, or lanes of separate matches. Targets must be given in spawn order.
+    """
+
+    def __init__(self, group: np.ndarray, y: np.ndarray):
+        # Replace y by its rank so (group, y) packs exactly into one integer key
+        self.distinct_y, y_rank = np.unique(y, return_inverse=True)
+        self.stride = len(self.distinct_y) + 1
+        keys = group * self.stride + y_rank
+        self.order = np.argsort(keys, kind="stable")
+        self.keys = keys[self.order]
+        self.group = group[self.order]
+        self.y = y[self.order]
+        n = len(self.order)
+
+        # First index of every run of equal (group, y), i.e. its earliest spawned unit
+        run_starts = np.ones(n, dtype=bool)
+        run_starts[1:] = self.keys[1:] != self.keys[:-1]
+        self.run_start = np.maximum.accumulate(np.where(run_starts, np.arange(n), 0))
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def positions(self, group: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """Insertion points of attackers among the sorted targets."""
+        # Ranking y among the targets' distinct ys keeps (group, y) order exact
+        y_rank = np.searchsorted(self.distinct_y, y, side="left")
+        return np.searchsorted(self.keys, group * self.stride + y_rank, side="left")
+
+    def nearest(self, pos: np.ndarray, group: np.ndarray, y: np.ndarray,
+                max_range: np.ndarray, alive: np.ndarray | None = None) -> np.ndarray:
+        """
+        For every attacker, index (into the original arrays) of the nearest target
+        in its group within range, or -1. Only targets flagged in alive (in sorted
+        order) are considered. Ties go to the earliest spawned target, like
+        Unit.find_target.
+        """
+        n = len(self.order)
+        targets = np.full(len(pos), -1, dtype=np.int64)
+        if n == 0 or len(pos) == 0:
+            return targets
+
+        # Nearest alive sorted index at or after / before every position
+        index = np.arange(n + 1)
+        if alive is None:
+            next_alive = index
+            prev_alive = index[:n]
+        else:
+            next_alive = np.minimum.accumulate(np.where(np.append(alive, True), index, n)[::-1])[::-1]
+            prev_alive = np.maximum.accumulate(np.where(alive, index[:n], -1))
+
+        # Closest target at or below y; already the earliest spawned of its run
+        right = next_alive[pos]
+        has_right = right < n
+        right = np.minimum(right, n - 1)
+        right_distance = self.y[right] - y
+        has_right &= (self.group[right] == group) & (right_distance <= max_range)
+
+        # Closest target above y, moved to the earliest spawned alive unit of its run
+        left = prev_alive[np.maximum(pos - 1, 0)]
+        has_left = (pos > 0) & (left >= 0)
+        left = next_alive[self.run_start[np.maximum(left, 0)]]
+        left = np.minimum(left, n - 1)
+        left_distance = y - self.y[left]
+        has_left &= (self.group[left] == group) & (left_distance <= max_range)
+
+        right_first = self.order[right] < self.order[left]
+        use_right = has_right & (
+            ~has_left
+            | (right_distance < left_distance)
+            | ((right_distance == left_distance) & right_first)
+        )
+        use_left = has_left & ~use_right
+        targets[use_right] = self.order[right[use_right]]
+        targets[use_left] = self.order[left[use_left]]
+        return targets
+
+
+class StoreUnits:
+    """List-like live view of one side's units in a UnitStore."""
+
+    def __init__(self, store: "UnitStore", is_player: bool):
+        self.store = store
+        self.is_player = is_player
+
+    def __len__(self) -> int:
+        return len(self.store.side_rows(self.is_player))
+
+    def __iter__(self):
+        return iter(self.store.views(self.is_player))
+
+    def __getitem__(self, index):
+        return self.store.views(self.is_player)[index]
+
+
+class UnitStore:
+    """
+    Structure-of-arrays storage for the units of both sides, with a vectorized
+    update that gives the same results as Player.update on Unit objects.
+    Rows are kept in spawn order. Requires NumPy.
+
+    It only pays off with big armies: benchmarks.bench_unit_store measures
+    its tick at 1.3x the speed of Unit objects with 500 units, 3.1x with
+    5,000 and 3.2x with 20,000 (one core, median of three runs of 60 ticks).
+    That is well short of 10x: Unit objects keep their targets (see
+    Unit.find_target), while the store sorts every enemy each update, and
+    chains of kills on shared targets take extra passes to stay exact.
+    """
+
+    COLUMNS = {
+        "type_id": np.int16,
+        "lane": np.int64,
+        "is_player": np.bool_,
+        "seq": np.int64,
+        "y": np.float64,
+        "hp": np.int64,
+        "max_hp": np.int64,
+        "damage": np.int64,
+        "speed": np.int64,
+        "range": np.int64,
+        "attack_cooldown": np.float64,
+        "cooldown": np.float64,
+        "is_attacking": np.bool_,
+        "removed": np.bool_,
+    }
+
+    def __init__(self, capacity: int = 64):
+        self.count = 0
+        self.removed_count = 0
+        # UnitType by side and type id, as last spawned, so views show the
+        # stats of a side's Player.unit_types rather than the table's
+        self.unit_types = {True: list(UNIT_TABLE.types), False: list(UNIT_TABLE.types)}
+        for name, dtype in self.COLUMNS.items():
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _grow(self, needed: int = 1):
+        capacity = max(len(self.y), 1)
+        while capacity < self.count + needed:
+            capacity *= 2
+        for name in self.COLUMNS:
+            column = getattr(self, name)
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:self.count] = column[:self.count]
+            setattr(self, name, grown)
+
+    def _append(self, unit_type: UnitType, lane: int, is_player: bool, seq: int) -> int:
+        """Append a unit with full hp at its side's base and return its row."""
+        if self.count == len(self.y):
+            self._grow()
+        row = self.count
+        self.count += 1
+
+        self.unit_types[is_player][unit_type.type_id] = unit_type
+        self.type_id[row] = unit_type.type_id
+        self.lane[row] = lane
+        self.is_player[row] = is_player
+        self.seq[row] = seq
+        self.y[row] = PLAYER_BASE_Y if is_player else ENEMY_BASE_Y
+        self.hp[row] = unit_type.hp
+        self.max_hp[row] = unit_type.hp
+        self.damage[row] = unit_type.damage
+        self.speed[row] = unit_type.speed
+        self.range[row] = unit_type.range
+        self.attack_cooldown[row] = unit_type.attack_cooldown
+        self.cooldown[row] = 0.0
+        self.is_attacking[row] = False
+        self.removed[row] = False
+        return row
+
+    def spawn(self, unit_type: UnitType, lane: int, is_player: bool) -> UnitView:
+        """Spawn a new unit at its side's base."""
+        return self.view(self._append(unit_type, lane, is_player, next_spawn_order()))
+
+    def add_unit(self, unit: Unit):
+        """Copy an existing Unit, including its current state, into the store."""
+        row = self._append(unit.unit_type, unit.lane, unit.is_player, unit.seq)
+        self.y[row] = unit.y
+        self.hp[row] = unit.hp
+        self.cooldown[row] = unit.attack_cooldown
+        self.is_attacking[row] = unit.is_attacking
+
+    def view(self, row: int) -> UnitView:
+        view = UnitView()
+        view.is_player = bool(self.is_player[row])
+        view.unit_type = self.unit_types[view.is_player][self.type_id[row]]
+        view.lane = int(self.lane[row])
+        view.x = view.lane * LANE_WIDTH + LANE_WIDTH // 2
+        view.y = float(self.y[row])
+        view.hp = int(self.hp[row])
+        view.max_hp = int(self.max_hp[row])
+        view.is_attacking = bool(self.is_attacking[row])
+        view.seq = int(self.seq[row])
+        return view
+
+    def groups(self, rows: np.ndarray) -> np.ndarray:
+        """Targeting groups of rows: units only fight within the same group."""
+        return self.lane[rows]
+
+    def side_units(self, is_player: bool) -> StoreUnits:
+        return StoreUnits(self, is_player)
+
+    def side_rows(self, is_player: bool) -> np.ndarray:
+        """Rows of one side's units in spawn order."""
+        n = self.count
+        return np.flatnonzero((self.is_player[:n] == is_player) & ~self.removed[:n])
+
+    def views(self, is_player: bool) -> list[UnitView]:
+        """Views of one side's units in spawn order."""
+        return [self.view(row) for row in self.side_rows(is_player)]
+
+    def update_side(self, is_player: bool, dt: float):
+        """
+        Update every unit of one side, like Player.update does for Unit objects.
+        Units act in spawn order and a kill is visible to the units acting after it.
+        Targets are first picked for everyone at once, then units whose target was
+        killed by an earlier unit re-target until nothing changes, which usually
+        takes one or two extra passes.
+        """
+        n = self.count
+        movers = self.side_rows(is_player)
+        if len(movers) == 0:
+            return
+        enemies = np.flatnonzero((self.is_player[:n] != is_player) & (self.hp[:n] > 0))
+        direction = -1 if is_player else 1
+
+        # Update attack cooldowns
+        cooldown = self.cooldown[movers]
+        cooldown = np.where(cooldown > 0, cooldown - dt, cooldown)
+        self.cooldown[movers] = cooldown
+        ready = cooldown <= 0
+
+        # Find targets as if nobody died during this update
+        index = TargetIndex(self.groups(enemies), self.y[enemies])
+        sorted_enemies = enemies[index.order]
+        lanes = self.groups(movers)
+        ys = self.y[movers]
+        ranges = self.range[movers]
+        positions = index.positions(lanes, ys)
+        picked = index.nearest(positions, lanes, ys, ranges)
+        targets = self._target_rows(enemies, picked)
+        turn = np.arange(len(movers))
+
+        while True:
+            has_target = targets >= 0
+            attack_turns = np.flatnonzero(has_target & ready)
+            attack_targets = targets[attack_turns]
+            attack_damage = self.damage[movers[attack_turns]]
+            killed_at = self._replay_kills(attack_turns, attack_targets, attack_damage, len(movers))
+
+            # Units whose target was already killed by a unit acting before them
+            stale = has_target & (killed_at[np.maximum(targets, 0)] < turn)
+            if not np.any(stale):
+                break
+
+            # Kills before the first stale unit are final; re-target against them
+            first = int(np.argmax(stale))
+            alive = killed_at[sorted_enemies] >= first
+            retarget = np.flatnonzero(stale)
+            picked = index.nearest(positions[retarget], lanes[retarget], ys[retarget],
+                                   ranges[retarget], alive)
+            targets[retarget] = self._target_rows(enemies, picked)
+
+        # Apply attacks and movement
+        np.subtract.at(self.hp, attack_targets, attack_damage)
+        np.maximum(self.hp[:n], 0, out=self.hp[:n])
+        attackers = movers[attack_turns]
+        self.cooldown[attackers] = self.attack_cooldown[attackers]
+        self.is_attacking[movers] = has_target
+        walkers = movers[~has_target]
+        self.y[walkers] += (direction * self.speed[walkers]) * dt
+
+        # Remove dead units
+        self.remove(movers[self.hp[movers] <= 0])
+
+    def remove(self, rows: np.ndarray):
+        """
+        Mark rows as removed. Their slots are only reclaimed once a quarter of
+        the store is removed, so deaths don't copy every column each tick.
+        """
+        if len(rows) == 0:
+            return
+        self.removed[rows] = True
+        self.hp[rows] = 0
+        self.removed_count += len(rows)
+        if self.removed_count * 4 > self.count:
+            self._compact(~self.removed[:self.count])
+
+    @staticmethod
+    def _target_rows(enemies: np.ndarray, picked: np.ndarray) -> np.ndarray:
+        rows = np.full(len(picked), -1, dtype=np.int64)
+        found = picked >= 0
+        rows[found] = enemies[picked[found]]
+        return rows
+
+    def _replay_kills(self, turns: np.ndarray, targets: np.ndarray, damage: np.ndarray,
+                      never: int) -> np.ndarray:
+        """Turn at which each row is killed by the given ordered attacks, or never."""
+        by_target = np.argsort(targets, kind="stable")
+        sorted_targets = targets[by_target]
+        sorted_damage = damage[by_target]
+
+        # Damage each target has taken before every hit on it
+        damage_before = np.cumsum(sorted_damage) - sorted_damage
+        first_hit = np.ones(len(sorted_targets), dtype=bool)
+        first_hit[1:] = sorted_targets[1:] != sorted_targets[:-1]
+        damage_before -= np.maximum.accumulate(np.where(first_hit, damage_before, 0))
+        hp_before = self.hp[sorted_targets] - damage_before
+        kills = (hp_before > 0) & (hp_before <= sorted_damage)
+
+        killed_at = np.full(self.count, never, dtype=np.int64)
+        killed_at[sorted_targets[kills]] = turns[by_target][kills]
+        return killed_at
+
+    def _compact(self, keep: np.ndarray):
+        """Drop rows, keeping the rest in spawn order."""
+        n = self.count
+        kept = int(np.count_nonzero(keep))
+        for name in self.COLUMNS:
+            column = getattr(self, name)
+            column[:kept] = column[:n][keep]
+        self.count = kept
+        self.removed_count = int(np.count_nonzero(self.removed[:kept]))
+
+    def snapshot(self) -> tuple:
+        """Copy of the live rows of every column, restorable with restore()."""
+        n = self.count
+        return n, self.removed_count, tuple(getattr(self, name)[:n].copy() for name in self.COLUMNS)
+
+    def restore(self, state: tuple):
+        n, removed_count, columns = state
+        if n > len(self.y):
+            self.count = 0
+            self._grow(n)
+        for name, values in zip(self.COLUMNS, columns):
+            getattr(self, name)[:n] = values
+        self.count = n
+        self.removed_count = removed_count
+
+    def lane_summary(self, is_player: bool, lane: int) -> tuple[int, int, float | None]:
+        """Living unit count, hp total and frontier y of one side in a lane, like Player.lane_summary."""
+        rows = self.side_rows(is_player)
+        rows = rows[(self.lane[rows] == lane) & (self.hp[rows] > 0)]
+        if len(rows) == 0:
+            return 0, 0, None
+        y = self.y[rows]
+        front = y.min() if is_player else y.max()
+        return len(rows), int(self.hp[rows].sum()), float(front)
+
+    def reached_base(self, is_player: bool) -> bool:
+        """Check if any unit of a side has reached the opposing base."""
+        y = self.y[self.side_rows(is_player)]
+        if is_player:
+            return bool(np.any(y <= ENEMY_BASE_Y))
+        return bool(np.any(y >= PLAYER_BASE_Y))
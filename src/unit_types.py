@@ -0,0 +1,135 @@
+import os
+from array import array
+from dataclasses import dataclass
+from src.constants import UNIT_TYPES, MAX_MANA, UNIT_TYPES_FILE_ENV
+from src.params import tuned_params
+
+# Fields of every unit type definition, as in UNIT_TYPES
+UNIT_FIELDS = ("name", "hp", "damage", "speed", "range", "cost", "attack_cooldown", "shape", "color", "size")
+
+
+@dataclass(frozen=True, slots=True)
+class UnitType:
+    name: str
+    hp: int
+    damage: int
+    speed: int
+    range: int
+    cost: int
+    attack_cooldown: float
+    shape: str
+    color: tuple
+    size: int
+    # Index into UNIT_TABLE, and into every per-type array
+    type_id: int = 0
+
+    @classmethod
+    def from_name(cls, unit_name: str) -> "UnitType":
+        """The shared, interned UnitType for a UNIT_TABLE key."""
+        return INTERNED_TYPES[unit_name]
+
+    @classmethod
+    def build(cls, data: dict, type_id: int = 0) -> "UnitType":
+        return cls(**{field: data[field] for field in UNIT_FIELDS}, type_id=type_id)
+
+    def __deepcopy__(self, memo: dict) -> "UnitType":
+        # Immutable and interned, so copies of units keep sharing it
+        return self
+
+
+def load_unit_types(path: str) -> dict[str, dict]:
+    """Unit type definitions from a JSON file mapping keys to objects with every UNIT_FIELDS field."""
+    # Imported here so the usual start, without a file, stays within the import budget
+    import json
+    with open(path) as f:
+        data = json.load(f)
+    definitions = {}
+    for key, definition in data.items():
+        missing = [field for field in UNIT_FIELDS if field not in definition]
+        if missing:
+            raise ValueError(f"Unit type {key!r} in {path} has no {', '.join(missing)}")
+        if not isinstance(definition["cost"], int) or not 0 <= definition["cost"] <= MAX_MANA:
+            raise ValueError(f"Unit type {key!r} in {path} needs a whole cost from 0 to {MAX_MANA}")
+        definitions[key] = {**definition, "color": tuple(definition["color"])}
+    return definitions
+
+
+class UnitTypeTable:
+    """
+    Every unit type, numbered in definition order, with its stats in typed
+    arrays indexed by that id. The simulation, the AIs and the numpy paths
+    all read this one table instead of looking stats up by name.
+    """
+
+    def __init__(self, definitions: dict[str, dict]):
+        self.definitions = definitions
+        self.names = list(definitions)
+        self.ids = {name: type_id for type_id, name in enumerate(self.names)}
+        self.types = [UnitType.build(data, type_id) for type_id, data in enumerate(definitions.values())]
+
+        self.costs = array("i", (t.cost for t in self.types))
+        self.hp = array("i", (t.hp for t in self.types))
+        self.damage = array("i", (t.damage for t in self.types))
+        self.speed = array("i", (t.speed for t in self.types))
+        self.range = array("i", (t.range for t in self.types))
+        self.attack_cooldown = array("d", (t.attack_cooldown for t in self.types))
+        self.size = array("i", (t.size for t in self.types))
+
+        # What each whole amount of mana affords, as a bitmask of ids and as
+        # names in id order. Costs are whole numbers, so any mana affords
+        # exactly what its whole part does.
+        self.affordable_masks = []
+        self.affordable = []
+        for mana in range(MAX_MANA + 1):
+            ids = [type_id for type_id, cost in enumerate(self.costs) if cost <= mana]
+            self.affordable_masks.append(sum(1 << type_id for type_id in ids))
+            self.affordable.append([self.names[type_id] for type_id in ids])
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def with_stats(self, stats: dict[str, dict]) -> dict[str, "UnitType"]:
+        """
+        UnitType by key like INTERNED_TYPES, with some stats replaced (unit type
+        key to stat to value, as in a parameters file). For Player.unit_types;
+        ids and costs stay the same, so the table's arrays still apply to them.
+        """
+        unknown = [key for key in stats if key not in self.ids]
+        if unknown:
+            raise ValueError(f"Unknown unit types: {', '.join(unknown)}")
+        return {name: UnitType.build({**self.definitions[name], **stats.get(name, {})}, type_id)
+                for type_id, name in enumerate(self.names)}
+
+    def mask(self, names) -> int:
+        """Bitmask of the given unit types."""
+        return sum(1 << self.ids[name] for name in names)
+
+    def affordable_mask(self, mana: float) -> int:
+        """Bitmask of the types mana can pay for."""
+        return self.affordable_masks[min(int(mana), MAX_MANA)]
+
+    def affordable_names(self, mana: float) -> list[str]:
+        """Names of the types mana can pay for, in id order. Callers must not modify it."""
+        return self.affordable[min(int(mana), MAX_MANA)]
+
+
+def default_definitions() -> dict[str, dict]:
+    """
+    UNIT_TYPES, plus or overridden by the types in the file UNIT_TYPES_FILE_ENV
+    names, if set, with the stats set by the parameters file (see src.params).
+    """
+    definitions = dict(UNIT_TYPES)
+    path = os.environ.get(UNIT_TYPES_FILE_ENV)
+    if path:
+        definitions.update(load_unit_types(path))
+    for key, stats in tuned_params()["unit_types"].items():
+        if key not in definitions:
+            raise ValueError(f"The parameters file sets stats of unknown unit type {key!r}")
+        definitions[key] = {**definitions[key], **stats}
+    return definitions
+
+
+# The unit types of this process, built at import and shared by everything
+UNIT_TABLE = UnitTypeTable(default_definitions())
+# UnitType by key, one instance per type shared by every unit
+INTERNED_TYPES: dict[str, UnitType] = dict(zip(UNIT_TABLE.names, UNIT_TABLE.types))
@@ -0,0 +1,39 @@
+import random
+from src.constants import NUM_LANES
+from src.simulation import Simulation, PLAYER_SIDE
+from src.unit_types import UNIT_TABLE
+
+# Stats a tuned parameters file might set (see src.params)
+OVERRIDES = {"soldier": {"hp": 140, "range": 60}, "archer": {"damage": 9, "attack_cooldown": 0.8},
+             "giant": {"speed": 45}}
+
+
+def spawn_script(seed: int, spawns: int = 60, ticks: int = 1500) -> list[tuple[int, str, int]]:
+    """Random player spawns as (tick, unit name, lane), in tick order."""
+    rng = random.Random(seed)
+    return sorted((rng.randrange(ticks), rng.choice(UNIT_TABLE.names), rng.randrange(NUM_LANES))
+                  for _ in range(spawns))
+
+
+def unit_states(units) -> tuple:
+    return tuple((unit.lane, unit.y, unit.hp) for unit in units)
+
+
+def match_state(simulation: Simulation) -> tuple:
+    """What runs of a match are compared on: tick, result, both sides' mana and units."""
+    return (simulation.ticks, simulation.winner, simulation.player.mana, simulation.enemy.mana,
+            unit_states(simulation.player.units), unit_states(simulation.enemy.units))
+
+
+def play(simulation: Simulation, script: list[tuple[int, str, int]], max_ticks: int = 5000) -> list[tuple]:
+    """Play a spawn script until the match ends or max_ticks; return the state after every tick."""
+    spawns: dict[int, list[tuple[str, int]]] = {}
+    for tick, unit_name, lane in script:
+        spawns.setdefault(tick, []).append((unit_name, lane))
+    trace = []
+    while not simulation.game_over and simulation.ticks < max_ticks:
+        for unit_name, lane in spawns.get(simulation.ticks, ()):
+            simulation.apply_action(PLAYER_SIDE, unit_name, lane)
+        simulation.step()
+        trace.append(match_state(simulation))
+    return trace
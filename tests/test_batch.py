@@ -0,0 +1,118 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.ai import AI, AIParams
+from src.constants import NUM_LANES
+from src.batch import BatchSimulator, UNDECIDED, PLAYER_WON, ENEMY_WON
+from src.simulation import Simulation, PLAYER_SIDE, ENEMY_SIDE
+from src.unit_types import UNIT_TABLE
+from tests.helpers import unit_states
+
+RESULTS = {None: UNDECIDED, PLAYER_SIDE: PLAYER_WON, ENEMY_SIDE: ENEMY_WON}
+# Different enough to play different matches
+PARAMS = [
+    AIParams(),
+    AIParams(decision_interval=0.5, reinforce_chance=0.0),
+    AIParams(decision_interval=1.7, defend_threshold=0.4, reinforce_threshold=0.5),
+    AIParams(decision_interval=0.8, defend_threshold=0.9, reinforce_chance=1.0),
+]
+
+
+class LowestDraw:
+    """
+    Random source always drawing its lowest value, as the random module for
+    AI and as a NumPy generator for BatchSimulator, so both make the same
+    choices: the first lane, and the first option in unit table order.
+    """
+
+    def random(self, size=None):
+        return 0.0 if size is None else np.zeros(size)
+
+    def integers(self, low, high, size):
+        return np.full(size, low)
+
+    def randint(self, low, high):
+        return low
+
+    def choice(self, options):
+        return min(options, key=UNIT_TABLE.ids.__getitem__)
+
+
+class HighestDraw:
+    """LowestDraw's opposite: the last lane, the last option, and failed reinforcement rolls."""
+    HIGH = 0.999999
+
+    def random(self, size=None):
+        return self.HIGH if size is None else np.full(size, self.HIGH)
+
+    def integers(self, low, high, size):
+        return np.full(size, high - 1)
+
+    def randint(self, low, high):
+        return high
+
+    def choice(self, options):
+        return max(options, key=UNIT_TABLE.ids.__getitem__)
+
+
+class SidedBatch(BatchSimulator):
+    """BatchSimulator drawing each side's decisions from its own random source, like two AIs."""
+
+    def __init__(self, num_matches: int, params: AIParams, rngs: dict):
+        super().__init__(num_matches, params=params)
+        self.rngs = rngs
+
+    def make_decisions(self, matches, is_player: bool):
+        self.rng = self.rngs[is_player]
+        super().make_decisions(matches, is_player)
+
+
+def lockstep(params: AIParams) -> tuple[Simulation, SidedBatch]:
+    simulation = Simulation(player=AI(is_player_side=True, params=params, rng=LowestDraw()),
+                            enemy=AI(params=params, rng=HighestDraw()))
+    return simulation, SidedBatch(3, params, {True: LowestDraw(), False: HighestDraw()})
+
+
+def match_views(batch: BatchSimulator, match: int, is_player: bool) -> list:
+    """Views of one side's units in one of the batch's matches, in spawn order."""
+    units = batch.units
+    rows = units.side_rows(is_player)
+    return [units.view(row) for row in rows[units.match[rows] == match]]
+
+
+@pytest.mark.parametrize("params", PARAMS)
+def test_batch_matches_simulation(params):
+    # The batch plays the same match three times over, side by side
+    simulation, batch = lockstep(params)
+    while not simulation.game_over and simulation.time < 300.0:
+        simulation.step()
+        batch.step(simulation.dt)
+        assert batch.ticks == simulation.ticks
+        for match in range(3):
+            assert batch.mana[match].tolist() == [simulation.player.mana, simulation.enemy.mana]
+        if simulation.game_over:
+            # The batch drops the units of finished matches
+            break
+        for is_player, side in ((True, simulation.player), (False, simulation.enemy)):
+            for match in range(3):
+                assert unit_states(match_views(batch, match, is_player)) == unit_states(side.units)
+    assert simulation.game_over
+    assert batch.results.tolist() == [RESULTS[simulation.winner]] * 3
+
+
+def test_lane_evaluations_match_the_ai():
+    params = AIParams(decision_interval=0.6)
+    simulation, batch = lockstep(params)
+    while not simulation.game_over and simulation.ticks < 3000:
+        simulation.step()
+        batch.step(simulation.dt)
+        if simulation.game_over:
+            break
+        for is_player, side, opponent in ((True, simulation.player, simulation.enemy),
+                                          (False, simulation.enemy, simulation.player)):
+            threats, advantages = batch.lane_evaluations(np.array([1]), is_player)
+            assert threats[0].tolist() == pytest.approx(
+                [side.calculate_lane_threat(lane, opponent) for lane in range(NUM_LANES)])
+            assert advantages[0].tolist() == pytest.approx(
+                [side.calculate_lane_advantage(lane, opponent) for lane in range(NUM_LANES)])
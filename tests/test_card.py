@@ -0,0 +1,51 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("pygame")
+
+from src.constants import SCREEN_WIDTH, UNIT_TYPES_FILE_ENV
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Prints the deck's card rects, or the error building it
+DECK_LAYOUT = """
+import json
+from src.card import Deck
+try:
+    print(json.dumps([list(card.rect) for card in Deck(0).cards]))
+except ValueError as error:
+    print(error)
+"""
+
+
+def deck_layout(tmp_path, extra_types: int) -> str:
+    """The deck in a fresh process, since the unit types are read once at import."""
+    env = dict(os.environ)
+    if extra_types:
+        extra = {f"scout{i}": {"name": f"Scout {i}", "hp": 50, "damage": 5, "speed": 100, "range": 40,
+                               "cost": 1, "attack_cooldown": 1.0, "shape": "circle",
+                               "color": [200, 200, 200], "size": 18}
+                 for i in range(extra_types)}
+        path = tmp_path / "unit_types.json"
+        path.write_text(json.dumps(extra))
+        env[UNIT_TYPES_FILE_ENV] = str(path)
+    result = subprocess.run([sys.executable, "-c", DECK_LAYOUT], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True)
+    return result.stdout.strip().splitlines()[-1]
+
+
+@pytest.mark.parametrize("extra_types", (0, 1))
+def test_cards_fit_on_screen(tmp_path, extra_types):
+    rects = json.loads(deck_layout(tmp_path, extra_types))
+    assert len(rects) == 6 + extra_types
+    assert rects[0][0] > 0 and rects[-1][0] + rects[-1][2] < SCREEN_WIDTH
+    for (x, _, width, _), (next_x, _, _, _) in zip(rects, rects[1:]):
+        assert x + width < next_x
+
+
+def test_too_many_cards_are_rejected(tmp_path):
+    assert "don't fit" in deck_layout(tmp_path, 2)
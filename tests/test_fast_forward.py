@@ -0,0 +1,54 @@
+import pytest
+
+from src.fast_forward import FastForward
+from src.replay import Replay, record
+from src.search_ai import SearchAI, SearchParams
+from src.simulation import Simulation
+
+
+def full_state(simulation: Simulation) -> tuple:
+    """Match state including what only fast-forwarding could get wrong: cooldowns and AI timers."""
+    return (simulation.ticks, simulation.time, simulation.winner,
+            tuple((side.mana, getattr(side, "decision_timer", None),
+                   tuple((u.lane, u.y, u.hp, u.attack_cooldown, u.is_attacking) for u in side.units))
+                  for side in (simulation.player, simulation.enemy)))
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_fast_forward_matches_stepping_at_every_jump(seed):
+    stepped = Simulation(player_ai=True, seed=seed)
+    forward = FastForward(Simulation(player_ai=True, seed=seed))
+    jumped = forward.simulation
+    while not jumped.game_over and jumped.time < 300.0:
+        forward.advance(300.0)
+        while stepped.ticks < jumped.ticks:
+            stepped.step()
+        assert full_state(jumped) == full_state(stepped)
+    assert forward.events < jumped.ticks
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_fast_forward_run_matches_simulation_run(seed):
+    stepped = Simulation(player_ai=True, seed=seed)
+    stepped.run(max_time=120.0)
+    forward = FastForward(Simulation(player_ai=True, seed=seed))
+    forward.run(max_time=120.0)
+    assert full_state(forward.simulation) == full_state(stepped)
+
+
+def test_fast_forward_replay():
+    recorded = Simulation(player_ai=True, seed=11)
+    log = record(recorded)
+    recorded.run()
+    replay = Replay(log)
+    FastForward(replay.simulation).run()
+    assert (replay.simulation.ticks, replay.simulation.winner) == (recorded.ticks, recorded.winner)
+
+
+def test_fast_forward_search_ai():
+    params = SearchParams(budget=10.0, max_iterations=10)
+    stepped = Simulation(player_ai=True, enemy=SearchAI(params=params), seed=1)
+    stepped.run(max_time=60.0)
+    forward = FastForward(Simulation(player_ai=True, enemy=SearchAI(params=params), seed=1))
+    forward.run(max_time=60.0)
+    assert full_state(forward.simulation) == full_state(stepped)
@@ -0,0 +1,71 @@
+import random
+
+import pytest
+
+from src.constants import NUM_LANES, PLAYER_BASE_Y, ENEMY_BASE_Y
+from src.lane_index import LaneIndex
+from src.unit import Unit
+from src.unit_types import UNIT_TABLE
+
+
+def linear_nearest(units: list[Unit], lane: int, y: float, max_range: float) -> Unit | None:
+    """The scan LaneIndex replaced: nearest living unit in range, ties to the earliest spawned."""
+    nearest, nearest_distance = None, float("inf")
+    for unit in units:
+        if unit.hp <= 0 or unit.lane != lane:
+            continue
+        distance = abs(y - unit.y)
+        if distance <= max_range and distance < nearest_distance:
+            nearest, nearest_distance = unit, distance
+    return nearest
+
+
+def random_units(rng: random.Random, count: int) -> list[Unit]:
+    """Units in spawn order on a coarse grid of ys, so many share a y, a few of them dead."""
+    units = []
+    for _ in range(count):
+        unit = Unit(rng.choice(UNIT_TABLE.types), rng.randrange(NUM_LANES), is_player=False)
+        unit.y = float(rng.randrange(ENEMY_BASE_Y, PLAYER_BASE_Y, 5))
+        if rng.random() < 0.2:
+            unit.hp = 0
+        units.append(unit)
+    return units
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_nearest_matches_linear_scan(seed):
+    rng = random.Random(seed)
+    units = random_units(rng, 200)
+    index = LaneIndex()
+    for unit in units:
+        index.insert(unit)
+    for _ in range(300):
+        lane = rng.randrange(NUM_LANES)
+        # Whole ys too, so queries land exactly on units and on range boundaries
+        y = float(rng.randrange(ENEMY_BASE_Y, PLAYER_BASE_Y)) if rng.random() < 0.5 \
+            else rng.uniform(ENEMY_BASE_Y, PLAYER_BASE_Y)
+        max_range = rng.choice((30, 40, 45, 150))
+        assert index.nearest(lane, y, max_range) is linear_nearest(units, lane, y, max_range)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_refresh_restores_order_after_moves_and_deaths(seed):
+    rng = random.Random(seed)
+    units = random_units(rng, 100)
+    index = LaneIndex()
+    for unit in units:
+        index.insert(unit)
+    for _ in range(20):
+        for unit in units:
+            if unit.hp > 0 and rng.random() < 0.3:
+                unit.y += rng.choice((-10.0, -5.0, 5.0, 10.0))
+            if rng.random() < 0.02:
+                unit.hp = 0
+        index.refresh()
+        for lane in range(NUM_LANES):
+            alive = sorted((u for u in units if u.lane == lane and u.hp > 0), key=lambda u: (u.y, u.seq))
+            assert index.units[lane] == alive
+            assert index.ys[lane] == [u.y for u in alive]
+        y = rng.uniform(ENEMY_BASE_Y, PLAYER_BASE_Y)
+        lane = rng.randrange(NUM_LANES)
+        assert index.nearest(lane, y, 40) is linear_nearest(units, lane, y, 40)
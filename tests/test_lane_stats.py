@@ -0,0 +1,89 @@
+from unittest.mock import patch
+
+import pytest
+
+from src.ai import AI, AIParams
+from src.constants import NUM_LANES
+from src.player import Player
+from src.shards import LaneShard
+from src.simulation import Simulation
+from tests.helpers import spawn_script, play
+
+
+def scanned_summary(side: Player, lane: int) -> tuple[int, int, float | None]:
+    """lane_summary by scanning every unit, as the AI did before LaneStats."""
+    alive = [unit for unit in side.units if unit.lane == lane and unit.hp > 0]
+    if not alive:
+        return 0, 0, None
+    ys = [unit.y for unit in alive]
+    return len(alive), sum(unit.hp for unit in alive), min(ys) if side.is_player_side else max(ys)
+
+
+def lane_values(ai: AI, opponent: Player) -> list[float]:
+    return [value for lane in range(NUM_LANES)
+            for value in (ai.calculate_lane_threat(lane, opponent), ai.calculate_lane_advantage(lane, opponent))]
+
+
+def check_lanes(*sides: Player):
+    for side in sides:
+        for lane in range(NUM_LANES):
+            assert side.lane_summary(lane) == scanned_summary(side, lane)
+
+
+class CheckedAI(AI):
+    """AI checking its lane evaluation against a full scan at every decision."""
+
+    decisions = 0
+
+    def make_decision(self, opponent: Player):
+        # Mid-tick: the opponent's units killed this tick are still listed
+        check_lanes(self, opponent)
+        tracked = lane_values(self, opponent)
+        with patch.object(Player, "lane_summary", scanned_summary):
+            assert lane_values(self, opponent) == tracked
+        CheckedAI.decisions += 1
+        super().make_decision(opponent)
+
+
+def checked_simulation(seed: int) -> Simulation:
+    # Deciding every tick checks every tick
+    params = AIParams(decision_interval=0.0)
+    return Simulation(player=CheckedAI(is_player_side=True, params=params),
+                      enemy=CheckedAI(params=params), seed=seed)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_lane_stats_match_a_scan(seed):
+    simulation = checked_simulation(seed)
+    CheckedAI.decisions = 0
+    play(simulation, spawn_script(seed), max_ticks=3000)
+    assert CheckedAI.decisions > 1000
+    check_lanes(simulation.player, simulation.enemy)
+
+
+def test_lane_stats_after_restore():
+    simulation = checked_simulation(5)
+    play(simulation, spawn_script(5), max_ticks=800)
+    snapshot = simulation.snapshot()
+    # Past deaths and pool reuse, then back
+    play(simulation, [], max_ticks=2000)
+    simulation.restore(snapshot)
+    check_lanes(simulation.player, simulation.enemy)
+    play(simulation, spawn_script(6), max_ticks=2500)
+
+
+def test_lane_stats_of_placed_units():
+    simulation = Simulation(player_ai=True, seed=2)
+    play(simulation, spawn_script(2), max_ticks=900)
+    units = sorted(simulation.player.units + simulation.enemy.units, key=lambda unit: unit.seq)
+    assert any(unit.hp < unit.unit_type.hp for unit in units)
+
+    shard = LaneShard(list(range(NUM_LANES)))
+    shard.place([(unit.unit_type, unit.lane, unit.is_player, unit.seq, unit.y, unit.hp,
+                  unit.attack_cooldown, unit.is_attacking) for unit in units])
+    bottom, top = shard.sides[True], shard.sides[False]
+    check_lanes(bottom, top)
+    for _ in range(300):
+        shard.step(True, simulation.dt, [])
+        shard.step(False, simulation.dt, [])
+        check_lanes(bottom, top)
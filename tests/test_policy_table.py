@@ -0,0 +1,99 @@
+import pytest
+
+from src import policy_table
+from src.ai import AI, AIParams
+from src.constants import NUM_LANES, MAX_MANA
+from src.policy_table import (
+    TABLE_SIZE, SAVE_MANA, NO_ENTRY, PolicyTable, TableAI,
+    build_table, write_table, state_index, encode_move, decode_move, legal_moves,
+)
+from src.player import Player
+from src.simulation import Simulation
+from src.unit_types import UNIT_TABLE, UnitTypeTable
+
+
+@pytest.fixture(scope="module")
+def table_path(tmp_path_factory):
+    moves, positions = build_table(matches=1, workers=1, max_time=60.0, horizon=4.0)
+    assert positions > 0
+    path = str(tmp_path_factory.mktemp("policy") / "table.bin")
+    write_table(path, moves)
+    return path
+
+
+def test_moves_round_trip():
+    moves = {encode_move(type_id, lane) for type_id in range(len(UNIT_TABLE)) for lane in range(NUM_LANES)}
+    assert len(moves) == len(UNIT_TABLE) * NUM_LANES
+    assert SAVE_MANA not in moves and NO_ENTRY not in moves
+    for type_id in range(len(UNIT_TABLE)):
+        for lane in range(NUM_LANES):
+            assert decode_move(encode_move(type_id, lane)) == (type_id, lane)
+    assert legal_moves(0.0) == [SAVE_MANA]
+    assert len(legal_moves(MAX_MANA)) == 1 + len(UNIT_TABLE) * NUM_LANES
+
+
+def test_state_index_covers_the_table():
+    simulation = Simulation(player_ai=True, seed=4)
+    indexes = set()
+    while not simulation.game_over and simulation.ticks < 3000:
+        simulation.step()
+        for ai, opponent in ((simulation.player, simulation.enemy), (simulation.enemy, simulation.player)):
+            index = state_index(ai, opponent)
+            assert 0 <= index < TABLE_SIZE
+            # Mana is the last digit
+            assert index % (MAX_MANA + 1) == min(int(ai.mana), MAX_MANA)
+            indexes.add(index)
+    assert len(indexes) > 50
+
+
+def test_table_ai_plays_the_stored_move(table_path, monkeypatch):
+    table = PolicyTable(table_path)
+    decisions = []
+    table_decision, heuristic_decision, spawn_unit = TableAI.make_decision, AI.make_decision, Player.spawn_unit
+
+    def decide(ai, opponent):
+        decisions.append((table.move(state_index(ai, opponent)), []))
+        table_decision(ai, opponent)
+
+    def fall_back(ai, opponent):
+        if isinstance(ai, TableAI):
+            decisions[-1][1].append("heuristic")
+        heuristic_decision(ai, opponent)
+
+    def spawn(player, unit_name, lane):
+        if isinstance(player, TableAI):
+            decisions[-1][1].append((unit_name, lane))
+        return spawn_unit(player, unit_name, lane)
+
+    monkeypatch.setattr(TableAI, "make_decision", decide)
+    monkeypatch.setattr(AI, "make_decision", fall_back)
+    monkeypatch.setattr(Player, "spawn_unit", spawn)
+    for seed in range(6):
+        simulation = Simulation(player=TableAI(is_player_side=True, table=table), enemy=TableAI(table=table),
+                                seed=seed)
+        simulation.run(max_time=120.0)
+    table.close()
+
+    stored = [(move, actions) for move, actions in decisions if move != NO_ENTRY]
+    assert stored and len(stored) < len(decisions)
+    for move, actions in decisions:
+        if move == NO_ENTRY:
+            assert actions[0] == "heuristic"
+        elif move == SAVE_MANA:
+            assert actions == []
+        else:
+            type_id, lane = decode_move(move)
+            assert actions == [(UNIT_TABLE.names[type_id], lane)]
+
+
+def test_tables_for_other_stats_or_ai_parameters_are_refused(table_path, monkeypatch):
+    PolicyTable(table_path).close()
+    with monkeypatch.context() as patch:
+        stats = UNIT_TABLE.definitions | {"tank": {**UNIT_TABLE.definitions["tank"], "damage": 11}}
+        patch.setattr(policy_table, "UNIT_TABLE", UnitTypeTable(stats))
+        with pytest.raises(ValueError):
+            PolicyTable(table_path)
+    with monkeypatch.context() as patch:
+        patch.setattr(policy_table, "AIParams", lambda: AIParams(defend_threshold=0.5))
+        with pytest.raises(ValueError):
+            PolicyTable(table_path)
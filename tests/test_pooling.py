@@ -0,0 +1,27 @@
+import pytest
+
+from src.simulation import Simulation
+from src.unit import Unit, UnitPool
+from tests.helpers import spawn_script, play
+
+
+@pytest.mark.parametrize("player_ai", (False, True))
+@pytest.mark.parametrize("seed", range(6))
+def test_pooled_units_play_like_new_ones(seed, player_ai, monkeypatch):
+    script = spawn_script(seed)
+    expected = play(Simulation(player_ai=player_ai, seed=seed), script)
+    # Never hand dead units back, so every spawn allocates a new Unit
+    monkeypatch.setattr(UnitPool, "release", lambda pool, unit: None)
+    assert play(Simulation(player_ai=player_ai, seed=seed), script) == expected
+
+
+def test_dead_units_are_reused(monkeypatch):
+    created = []
+    init = Unit.__init__
+    monkeypatch.setattr(Unit, "__init__", lambda unit, *args: (created.append(unit), init(unit, *args))[1])
+    spawns = []
+    simulation = Simulation(player_ai=True, seed=1)
+    for side in (simulation.player, simulation.enemy):
+        side.spawn_listener = lambda unit_name, lane: spawns.append(unit_name)
+    play(simulation, spawn_script(1, spawns=200, ticks=6000), max_ticks=6000)
+    assert len(created) < len(spawns) // 2
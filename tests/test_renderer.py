@@ -0,0 +1,36 @@
+import os
+
+import pytest
+
+pytest.importorskip("pygame")
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from src.game import Game
+
+
+@pytest.fixture
+def game():
+    game = Game(seed=1, dirty_rects=True)
+    yield game
+    import pygame
+    pygame.quit()
+
+
+def test_profiler_overlay_does_not_pile_up(game):
+    game.profiler.enable(game)
+    frames = []
+    for _ in range(6):
+        game.render()
+        frames.append(game.screen.copy())
+    panel = game.profiler._overlay.get_rect(topleft=(5, 5))
+    # Bottom left corner of the panel: translucent background over the battlefield
+    corner = (panel.left + 2, panel.bottom - 3)
+    assert corner[1] > 60
+    assert len({tuple(frame.get_at(corner)) for frame in frames[1:]}) == 1
+
+    # Turning it off repaints what it covered
+    game.profiler.disable()
+    game.render()
+    fresh = Game(seed=1, dirty_rects=True)
+    fresh.render()
+    assert game.screen.get_at(corner) == fresh.screen.get_at(corner)
@@ -0,0 +1,85 @@
+import os
+
+import pytest
+
+from src.simulation import Simulation
+from src.replay import ActionLog, Replay, record, MAGIC_V1, HEADER, HEADER_V1
+from tests.helpers import spawn_script, play, match_state
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_same_seed_plays_the_same_match(seed):
+    script = spawn_script(seed)
+    first = play(Simulation(player_ai=True, seed=seed), script)
+    second = play(Simulation(player_ai=True, seed=seed), script)
+    assert first == second
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_replay_rebuilds_every_tick(seed):
+    simulation = Simulation(seed=seed)
+    log = record(simulation)
+    states = [match_state(simulation)] + play(simulation, spawn_script(seed), max_ticks=20000)
+    assert simulation.game_over
+    log.end_tick = simulation.ticks
+
+    loaded = ActionLog.from_bytes(log.to_bytes())
+    assert loaded == log
+    replay = Replay(loaded, keyframe_interval=200)
+    assert match_state(replay.run()) == states[-1]
+    # Backwards from keyframes and forwards again
+    for tick in (len(states) // 2, 5, len(states) - 1, 0, 333):
+        assert match_state(replay.seek(tick)) == states[tick]
+
+
+def test_replay_of_an_abandoned_match_stops_at_its_end_tick():
+    simulation = Simulation(player_ai=True, seed=3)
+    log = record(simulation)
+    play(simulation, spawn_script(3), max_ticks=700)
+    assert not simulation.game_over
+    log.end_tick = simulation.ticks
+
+    replay = Replay(ActionLog.from_bytes(log.to_bytes()))
+    assert match_state(replay.run()) == match_state(simulation)
+
+
+def test_replay_loads_files_without_an_end_tick():
+    simulation = Simulation(player_ai=True, seed=4)
+    log = record(simulation)
+    play(simulation, [], max_ticks=20000)
+    log.end_tick = simulation.ticks
+
+    # The header as written before end ticks were recorded
+    data = log.to_bytes()
+    magic, tick_rate, seed, _, name_count = HEADER.unpack_from(data)
+    old = HEADER_V1.pack(MAGIC_V1, tick_rate, seed, name_count) + data[HEADER.size:]
+    loaded = ActionLog.from_bytes(old)
+    assert loaded.end_tick is None and loaded.actions == log.actions
+    assert match_state(Replay(loaded).run()) == match_state(simulation)
+
+
+def test_from_bytes_rejects_other_files():
+    with pytest.raises(ValueError):
+        ActionLog.from_bytes(b"GIF89a" + bytes(HEADER.size))
+
+
+def test_game_records_every_match_to_its_own_file(tmp_path):
+    pygame = pytest.importorskip("pygame")
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    # Imported here so the other replay tests don't need pygame
+    from src.game import Game
+
+    game = Game(record_path=str(tmp_path / "match.fwr"))
+    expected = []
+    try:
+        for seed in range(3):
+            if seed:
+                game.reset_game()
+            play(game.simulation, spawn_script(seed, spawns=20, ticks=600), max_ticks=600 + 100 * seed)
+            expected.append(match_state(game.simulation))
+        game.save_recording()
+    finally:
+        pygame.quit()
+
+    for name, state in zip(("match.fwr", "match-2.fwr", "match-3.fwr"), expected):
+        assert match_state(Replay(ActionLog.load(str(tmp_path / name))).run()) == state
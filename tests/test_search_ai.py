@@ -0,0 +1,61 @@
+import random
+import time
+
+from src.ai import AI
+from src.search_ai import (
+    ForwardModel, SearchParams, SAVE_MANA, BOTTOM, TOP, candidate_moves, prune, rollout, search,
+)
+from src.simulation import Simulation
+from src.unit_types import UNIT_TABLE
+from tests.helpers import OVERRIDES, play, spawn_script
+
+
+def midgame_model() -> ForwardModel:
+    simulation = Simulation(player_ai=True, seed=1)
+    play(simulation, spawn_script(1), max_ticks=1800)
+    model = ForwardModel.capture(simulation.player, simulation.enemy)
+    model.mana[TOP] = 10
+    return model
+
+
+def test_rollout_stops_at_the_deadline():
+    model = midgame_model()
+    params = SearchParams()
+    assert rollout(model.copy(), TOP, SAVE_MANA, params, random.Random(0), deadline=time.perf_counter()) is None
+    assert rollout(model.copy(), TOP, SAVE_MANA, params, random.Random(0)) is not None
+
+
+def test_prune_keeps_saving_mana_and_the_best_moves():
+    model = midgame_model()
+    params = SearchParams(candidates=4)
+    moves = candidate_moves(model.mana[TOP], params)
+    kept = prune(model, TOP, moves, params, deadline=float("inf"))
+    assert len(kept) == 4 and kept[0] == SAVE_MANA
+    scores = {move: rollout(model.copy(), TOP, move, params, None) for move in moves[1:]}
+    assert min(scores[move] for move in kept[1:]) >= max(scores[move] for move in moves[1:] if move not in kept)
+
+
+def test_search_with_max_iterations_is_deterministic():
+    model = midgame_model()
+    params = SearchParams(budget=10.0, max_iterations=30)
+    first = search(model, TOP, params, random.Random(5))
+    assert first[1] == 30
+    assert search(model, TOP, params, random.Random(5)) == first
+
+
+def test_model_plays_each_side_with_its_own_stats():
+    player = AI(is_player_side=True)
+    player.unit_types = UNIT_TABLE.with_stats(OVERRIDES)
+    model = ForwardModel.capture(player, AI())
+    soldier, giant = UNIT_TABLE.ids["soldier"], UNIT_TABLE.ids["giant"]
+    assert model.stats[BOTTOM][soldier][0] == 140 and model.stats[TOP][soldier][0] == UNIT_TABLE.hp[soldier]
+
+    for side in (BOTTOM, TOP):
+        model.mana[side] = 10
+        model.spawn(side, soldier, 0)
+        model.spawn(side, giant, 1)
+    start = [model.lanes[side][1][0][0] for side in (BOTTOM, TOP)]
+    model.step(0.25)
+    assert [unit[1] for unit in (model.lanes[BOTTOM][0][0], model.lanes[TOP][0][0])] == [140, UNIT_TABLE.hp[soldier]]
+    assert start[0] - model.lanes[BOTTOM][1][0][0] == 45 * 0.25
+    assert model.lanes[TOP][1][0][0] - start[1] == UNIT_TABLE.speed[giant] * 0.25
@@ -0,0 +1,161 @@
+import asyncio
+
+from src.client import play_bot
+from src.protocol import (
+    PROTOCOL_VERSION, JOIN, SPAWN, CHECKSUM, START, FRAME, END, FLAG_VS_AI,
+    END_FINISHED, END_OPPONENT_LEFT, END_DESYNC, UNIT_IDS, MessageReader, encode,
+)
+from src.server import MatchServer
+
+INPUT_DELAY = 6
+TURN_TICKS = 3
+
+
+async def start_server(seed: int = 0) -> tuple[MatchServer, int]:
+    server = MatchServer(INPUT_DELAY, TURN_TICKS, seed=seed)
+    # Turns as fast as the clients keep up, instead of real time
+    server.scheduler.turn_interval = 0.001
+    return server, await server.start("127.0.0.1", 0)
+
+
+class RawClient:
+    """Speaks the protocol by hand, to see exactly what the server sends."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.messages = MessageReader()
+        self.received: list[tuple] = []
+
+    @classmethod
+    async def join(cls, port: int, flags: int = 0) -> "RawClient":
+        client = cls(*await asyncio.open_connection("127.0.0.1", port))
+        client.send(encode(JOIN, PROTOCOL_VERSION, flags))
+        return client
+
+    def send(self, data: bytes):
+        self.writer.write(data)
+
+    async def next(self) -> tuple:
+        """The next message from the server."""
+        while not self.received:
+            data = await self.reader.read(65536)
+            assert data, "the server closed the connection"
+            self.received += self.messages.feed(data)
+        return self.received.pop(0)
+
+    async def next_of(self, kind: int) -> tuple:
+        while True:
+            message = await self.next()
+            if message[0] == kind:
+                return message
+
+    def close(self):
+        self.writer.close()
+
+
+def run(coroutine):
+    return asyncio.run(asyncio.wait_for(coroutine, timeout=60.0))
+
+
+def test_bots_play_a_match_to_the_end():
+    async def match():
+        server, port = await start_server()
+        try:
+            return await asyncio.gather(play_bot("127.0.0.1", port, seed=1), play_bot("127.0.0.1", port, seed=2))
+        finally:
+            await server.close()
+
+    first, second = run(match())
+    assert first.end_reason == second.end_reason == END_FINISHED
+    assert {first.side, second.side} == {"player", "enemy"}
+    assert first.simulation.game_over and second.simulation.game_over
+    assert first.simulation.ticks == second.simulation.ticks
+    assert first.simulation.winner == second.simulation.winner
+
+
+def test_spawns_are_scheduled_after_every_granted_tick():
+    async def spawns() -> list[tuple]:
+        server, port = await start_server()
+        client = await RawClient.join(port, FLAG_VS_AI)
+        try:
+            start = await client.next()
+            assert start[0] == START and start[5:7] == (INPUT_DELAY, TURN_TICKS)
+            frame = await client.next()
+            assert frame[0] == FRAME and frame[1] == INPUT_DELAY + TURN_TICKS - 1 and frame[3] == []
+            frames = [frame]
+            sent = 0
+            while sum(len(frame[3]) for frame in frames) < 5:
+                if sent < 5:
+                    client.send(encode(SPAWN, UNIT_IDS["soldier"], sent % 3))
+                    sent += 1
+                frames.append(await client.next_of(FRAME))
+            return frames
+        finally:
+            client.close()
+            await server.close()
+
+    frames = run(spawns())
+    for previous, frame in zip(frames, frames[1:]):
+        _, through_tick, count, commands = frame
+        assert count == len(commands)
+        assert (through_tick - previous[1]) % TURN_TICKS == 0 and through_tick > previous[1]
+        for tick, side, unit_id, lane in commands:
+            # Every command runs on the frame's first new tick, which no client can have run yet
+            assert tick == through_tick - TURN_TICKS + 1 and tick > previous[1]
+            assert (side, unit_id) == (0, UNIT_IDS["soldier"])
+
+
+def test_mismatched_checksums_end_the_match_as_a_desync():
+    async def desync() -> list[tuple]:
+        server, port = await start_server()
+        clients = [await RawClient.join(port), await RawClient.join(port)]
+        try:
+            for client in clients:
+                await client.next_of(START)
+            clients[0].send(encode(CHECKSUM, 60, 1234))
+            clients[1].send(encode(CHECKSUM, 60, 4321))
+            return [await client.next_of(END) for client in clients]
+        finally:
+            for client in clients:
+                client.close()
+            await server.close()
+
+    assert run(desync()) == [(END, END_DESYNC), (END, END_DESYNC)]
+
+
+def test_matching_checksums_keep_the_match_going():
+    async def agree() -> tuple:
+        server, port = await start_server()
+        clients = [await RawClient.join(port), await RawClient.join(port)]
+        try:
+            for client in clients:
+                await client.next_of(START)
+                client.send(encode(CHECKSUM, 60, 1234))
+            # Frames keep coming after both reports arrived
+            for _ in range(20):
+                await clients[0].next_of(FRAME)
+            return len(server.matches), dict(server.ended)
+        finally:
+            for client in clients:
+                client.close()
+            await server.close()
+
+    assert run(agree()) == (1, {})
+
+
+def test_opponent_leaving_ends_the_match():
+    async def leave():
+        server, port = await start_server()
+        bot = asyncio.ensure_future(play_bot("127.0.0.1", port, seed=3))
+        client = await RawClient.join(port)
+        await client.next_of(START)
+        client.close()
+        try:
+            return await bot
+        finally:
+            await server.close()
+
+    session = run(leave())
+    assert session.end_reason == END_OPPONENT_LEFT
+    assert not session.simulation.game_over
@@ -0,0 +1,83 @@
+import gc
+import pytest
+
+from src.ai import AI
+from src.simulation import Simulation
+from src.unit_types import UNIT_TABLE
+from tests.helpers import OVERRIDES, spawn_script, play, match_state
+
+
+def simulation(seed: int, shards: int = 0, backend: str = "inline", unit_types: dict | None = None) -> Simulation:
+    player = AI(is_player_side=True)
+    enemy = AI()
+    if unit_types is not None:
+        player.unit_types = enemy.unit_types = unit_types
+    if not shards:
+        return Simulation(player=player, enemy=enemy, seed=seed)
+    return Simulation(player=player, enemy=enemy, seed=seed, shards=shards, shard_backend=backend)
+
+
+def play_sharded(seed: int, script: list[tuple], max_ticks: int = 5000, **kwargs) -> list[tuple]:
+    sharded = simulation(seed, **kwargs)
+    try:
+        return play(sharded, script, max_ticks)
+    finally:
+        sharded.close()
+
+
+@pytest.mark.parametrize("shards", (1, 2, 3))
+@pytest.mark.parametrize("seed", range(4))
+def test_sharded_matches_serial(seed, shards):
+    script = spawn_script(seed)
+    assert play_sharded(seed, script, shards=shards) == play(simulation(seed), script)
+
+
+@pytest.mark.parametrize("backend", ("thread", "process"))
+def test_backends_match_serial(backend):
+    script = spawn_script(5)
+    expected = play(simulation(5), script, max_ticks=1500)
+    assert play_sharded(5, script, max_ticks=1500, shards=2, backend=backend) == expected
+
+
+def test_sharded_matches_serial_with_overridden_stats():
+    unit_types = UNIT_TABLE.with_stats(OVERRIDES)
+    script = spawn_script(3)
+    expected = play(simulation(3, unit_types=unit_types), script, max_ticks=1500)
+    sharded = simulation(3, shards=2, unit_types=unit_types)
+    try:
+        assert play(sharded, script, max_ticks=1500) == expected
+        for side in (sharded.player, sharded.enemy):
+            for view in side.units:
+                assert view.unit_type is unit_types[UNIT_TABLE.names[view.unit_type.type_id]]
+    finally:
+        sharded.close()
+
+
+def test_restore():
+    sharded = simulation(1, shards=2)
+    try:
+        play(sharded, spawn_script(1), max_ticks=900)
+        snapshot = sharded.snapshot()
+        expected_state = match_state(sharded)
+        expected = play(sharded, [], max_ticks=2400)
+        for _ in range(2):
+            sharded.restore(snapshot)
+            assert match_state(sharded) == expected_state
+            assert play(sharded, [], max_ticks=2400) == expected
+    finally:
+        sharded.close()
+
+
+def test_released_snapshots_are_freed():
+    sharded = simulation(2, shards=2)
+    try:
+        kept = sharded.snapshot()
+        for _ in range(5):
+            sharded.step()
+            sharded.snapshot()
+        gc.collect()
+        sharded.snapshot()
+        for shard in sharded.player.unit_store.shards:
+            assert sorted(shard.snapshots) == [kept.store.key, 6]
+    finally:
+        sharded.close()
@@ -0,0 +1,53 @@
+import pytest
+
+from src.simulation import Simulation
+from src.search_ai import SearchAI, SearchParams
+from tests.helpers import spawn_script, play, match_state
+
+MODES = [{}, {"two_phase": True}, {"vectorized": True}]
+
+
+def continue_play(simulation: Simulation, ticks: int) -> list[tuple]:
+    trace = []
+    for _ in range(ticks):
+        simulation.step()
+        trace.append(match_state(simulation))
+    return trace
+
+
+@pytest.mark.parametrize("mode", MODES)
+@pytest.mark.parametrize("seed", range(4))
+def test_restore_returns_to_the_snapshot_any_number_of_times(seed, mode):
+    if mode.get("vectorized"):
+        pytest.importorskip("numpy")
+    simulation = Simulation(player_ai=True, seed=seed, **mode)
+    play(simulation, spawn_script(seed), max_ticks=900)
+    snapshot = simulation.snapshot()
+    expected_state = match_state(simulation)
+    # Long enough for units to die and the pool to recycle them, and for the match to end
+    expected = continue_play(simulation, 3000)
+    for _ in range(3):
+        simulation.restore(snapshot)
+        assert match_state(simulation) == expected_state
+        assert continue_play(simulation, 3000) == expected
+
+
+def test_restore_after_the_match_ended():
+    simulation = Simulation(player_ai=True, seed=7)
+    play(simulation, [], max_ticks=300)
+    snapshot = simulation.snapshot()
+    expected = match_state(simulation)
+    simulation.run(max_time=600.0)
+    assert simulation.game_over
+    simulation.restore(snapshot)
+    assert not simulation.game_over and match_state(simulation) == expected
+
+
+def test_restore_search_ai():
+    params = SearchParams(max_iterations=20, budget=1.0)
+    simulation = Simulation(player_ai=True, enemy=SearchAI(params=params), seed=2)
+    play(simulation, [], max_ticks=400)
+    snapshot = simulation.snapshot()
+    expected = continue_play(simulation, 600)
+    simulation.restore(snapshot)
+    assert continue_play(simulation, 600) == expected
@@ -0,0 +1,46 @@
+import os
+from types import SimpleNamespace
+
+import pytest
+
+pygame = pytest.importorskip("pygame")
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from src import sprites
+from src.sprites import SpriteAtlas
+from src.unit_types import UNIT_TABLE, UnitTypeTable
+from tests.helpers import OVERRIDES
+
+
+def unit(unit_type, is_player: bool = True) -> SimpleNamespace:
+    return SimpleNamespace(unit_type=unit_type, is_player=is_player, hp=unit_type.hp, max_hp=unit_type.hp,
+                           x=100.0, y=200.0, prev_y=200.0)
+
+
+def colors(blits) -> list[tuple]:
+    """Center color of each unit body in a unit_blits sequence."""
+    return [tuple(surface.get_at((surface.get_width() // 2, surface.get_height() // 2)))[:3]
+            for surface, _ in blits[::2]]
+
+
+def test_types_sharing_a_display_name_keep_their_own_sprites(monkeypatch):
+    # A custom type named like a built-in one, but drawn differently
+    definitions = UNIT_TABLE.definitions | {
+        "elite_soldier": {**UNIT_TABLE.definitions["soldier"], "color": (250, 0, 250), "shape": "circle"},
+    }
+    table = UnitTypeTable(definitions)
+    monkeypatch.setattr(sprites, "UNIT_TABLE", table)
+    atlas = SpriteAtlas()
+    soldier, elite = table.types[table.ids["soldier"]], table.types[table.ids["elite_soldier"]]
+    assert soldier.name == elite.name
+
+    assert colors(atlas.unit_blits([unit(soldier), unit(elite)])) == [soldier.color, elite.color]
+    icons = [atlas.icon(key, True) for key in ("soldier", "elite_soldier")]
+    assert [tuple(icon.get_at((10, 10)))[:3] for icon in icons] == [soldier.color, elite.color]
+
+
+def test_overridden_stats_draw_like_the_type():
+    atlas = SpriteAtlas()
+    overridden = UNIT_TABLE.with_stats(OVERRIDES)
+    for key, unit_type in overridden.items():
+        assert colors(atlas.unit_blits([unit(unit_type, False)])) == [UNIT_TABLE.definitions[key]["color"]]
@@ -0,0 +1,37 @@
+import pytest
+
+from src.fast_forward import FastForward
+from src.lane_index import LaneIndex
+from src.simulation import Simulation
+from src.unit import Unit
+from tests.helpers import spawn_script, play
+from tests.test_fast_forward import full_state
+
+
+def slots(unit: Unit) -> tuple:
+    return tuple(getattr(unit, name, None) for name in Unit.__slots__)
+
+
+@pytest.mark.parametrize("two_phase", (False, True))
+@pytest.mark.parametrize("seed", range(4))
+def test_cached_targets_match_searching(seed, two_phase, monkeypatch):
+    script = spawn_script(seed)
+    cached = play(Simulation(player_ai=True, seed=seed, two_phase=two_phase), script)
+    forward = FastForward(Simulation(player_ai=True, seed=seed, two_phase=two_phase))
+    forward.run(max_time=300.0)
+    monkeypatch.setattr(LaneIndex, "unchanged_within", lambda *args: False)
+    assert play(Simulation(player_ai=True, seed=seed, two_phase=two_phase), script) == cached
+    searched = FastForward(Simulation(player_ai=True, seed=seed, two_phase=two_phase))
+    searched.run(max_time=300.0)
+    assert full_state(searched.simulation) == full_state(forward.simulation)
+
+
+def test_plan_changes_nothing():
+    simulation = Simulation(player_ai=True, seed=3, two_phase=True)
+    while simulation.ticks < 1200:
+        units = simulation.player.units + simulation.enemy.units
+        before = [slots(unit) for unit in units]
+        plans = simulation.plan_tick(simulation.dt)
+        assert [slots(unit) for unit in units] == before
+        assert len(plans) == len(units)
+        simulation.step()
@@ -0,0 +1,68 @@
+import time
+from types import SimpleNamespace
+
+from src.simulation import Simulation
+from src.timestep import FixedTimestep, SimulationThread
+
+# A power of two, so whole ticks add up exactly
+TICK_RATE = 64
+DT = 1.0 / TICK_RATE
+
+
+def test_accumulator_carries_the_remainder():
+    timestep = FixedTimestep(TICK_RATE, max_catchup=8)
+    assert timestep.advance(0.5 * DT) == 0
+    assert timestep.alpha == 0.5
+    assert timestep.advance(0.75 * DT) == 1
+    assert timestep.alpha == 0.25
+    assert timestep.advance(2.5 * DT) == 2
+    assert timestep.alpha == 0.75
+    # Many short frames add up to the same ticks as one long one
+    ticks = sum(timestep.advance(DT / 8) for _ in range(26))
+    assert ticks == 4 and timestep.alpha == 0.0
+
+
+def test_catch_up_is_capped():
+    timestep = FixedTimestep(TICK_RATE, max_catchup=4)
+    assert timestep.advance(4 * DT) == 4
+    assert timestep.accumulator == 0.0
+    # A hitch runs max_catchup ticks and drops the rest, keeping the fraction
+    assert timestep.advance(10.25 * DT) == 4
+    assert timestep.alpha == 0.25
+    assert timestep.advance(0.5 * DT) == 0
+    assert timestep.alpha == 0.75
+
+
+def test_alpha_is_pinned_at_game_over():
+    match = SimpleNamespace(game_over=False)
+    timestep = FixedTimestep(TICK_RATE, match=match)
+    timestep.advance(1.5 * DT)
+    assert timestep.alpha == 0.5
+    match.game_over = True
+    assert timestep.alpha == 1.0
+    timestep.advance(0.25 * DT)
+    assert timestep.alpha == 1.0
+
+
+def test_thread_alpha_is_pinned_at_game_over():
+    simulation = Simulation(seed=0, tick_rate=TICK_RATE)
+    thread = SimulationThread(simulation)
+    thread.last_advance = time.perf_counter()
+    assert thread.alpha < 1.0
+    simulation.game_over = True
+    assert thread.alpha == 1.0
+    # Long after the last tick too
+    thread.last_advance -= 10.0
+    assert thread.alpha == thread.timestep.alpha == 1.0
+
+
+def test_thread_steps_at_the_tick_rate():
+    simulation = Simulation(seed=0, tick_rate=TICK_RATE)
+    thread = SimulationThread(simulation)
+    start = time.perf_counter()
+    thread.start()
+    time.sleep(0.25)
+    thread.stop()
+    elapsed = time.perf_counter() - start
+    # Never ahead of real time
+    assert 0 < simulation.ticks <= elapsed * TICK_RATE
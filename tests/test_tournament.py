@@ -0,0 +1,43 @@
+import argparse
+
+import pytest
+
+from src.ai import AIParams
+from src.search_ai import SearchParams
+from src.tournament import SPRT, Variant, parse_params, run_tournament
+
+
+def test_parse_params_converts_to_field_types():
+    params = parse_params(["budget=0.01", "max_iterations=20", "waits=0,1.5"], SearchParams)
+    assert params == {"budget": 0.01, "max_iterations": 20, "waits": (0.0, 1.5)}
+    SearchParams(**params)
+    assert parse_params(["max_iterations=none", "waits="], SearchParams) == {"max_iterations": None, "waits": ()}
+    assert parse_params(["defend_threshold=0.5"], AIParams) == {"defend_threshold": 0.5}
+
+
+@pytest.mark.parametrize("pair", ["max_iterations=1.5", "speed=2", "budget=fast"])
+def test_parse_params_rejects_bad_pairs(pair):
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_params([pair], SearchParams)
+
+
+def test_sprt_verdict_does_not_depend_on_workers():
+    variant_a = Variant(params={"defend_threshold": 0.3})
+    variant_b = Variant()
+    results = []
+    for workers in (1, 3):
+        result = run_tournament(variant_a, variant_b, games=40, workers=workers, max_time=120.0,
+                                sprt=SPRT(delta=0.3), fast_forward=True)
+        del result["seconds"]
+        results.append(result)
+    assert results[0] == results[1]
+
+
+def test_search_ai_with_fixed_rollouts_does_not_depend_on_workers():
+    variant_a = Variant("src.search_ai:SearchAI", parse_params(["budget=inf", "max_iterations=5"], SearchParams))
+    results = []
+    for workers in (1, 2):
+        result = run_tournament(variant_a, Variant(), games=6, workers=workers, max_time=120.0)
+        del result["seconds"]
+        results.append(result)
+    assert results[0] == results[1]
@@ -0,0 +1,100 @@
+import json
+
+import pytest
+
+from src import tuner
+from src.ai import AIParams
+from src.params import load_params
+from src.tuner import Tuner, decode, candidate_key
+from src.unit_types import UNIT_TABLE
+
+# Short matches keep the tests quick; most end undecided
+SETTINGS = {"population": 2, "matches": 2, "elite": 1, "seed": 3, "max_time": 20.0}
+
+
+class SerialPool:
+    """Pool stand-in playing tasks in this process, in order, counting them."""
+
+    def __init__(self):
+        self.played: list[tuple] = []
+
+    def imap_unordered(self, function, tasks, chunksize=1):
+        for task in tasks:
+            self.played.append(task)
+            yield function(task)
+
+
+def history(job: Tuner) -> list[dict]:
+    return [{key: value for key, value in summary.items() if key != "seconds"} for summary in job.history]
+
+
+def test_candidates_are_played_once(tmp_path):
+    job = Tuner(str(tmp_path), **SETTINGS)
+    # Equal genes, and genes that only differ below the decoded precision
+    nudged = [gene + 1e-9 for gene in job.population[0]]
+    assert candidate_key(decode(job.space, nudged)) == candidate_key(decode(job.space, job.population[0]))
+    job.population = [job.population[0], nudged]
+    pool = SerialPool()
+    records, played = job.evaluate(pool)
+    assert played == 1 and len(pool.played) == SETTINGS["matches"]
+    assert records[0] is records[1]
+
+    # Nor again by the same job, or one reading the cache back
+    assert job.evaluate(pool)[1] == 0
+    resumed = Tuner(str(tmp_path), **SETTINGS)
+    resumed.population = job.population
+    assert resumed.evaluate(pool)[1] == 0
+    assert len(pool.played) == SETTINGS["matches"]
+    with open(tmp_path / "cache.jsonl") as f:
+        assert len(f.readlines()) == 1
+
+
+def test_resume_continues_the_same_job(tmp_path):
+    straight = Tuner(str(tmp_path / "straight"), **SETTINGS)
+    for _ in range(3):
+        straight.step(SerialPool())
+
+    interrupted = Tuner(str(tmp_path / "resumed"), **SETTINGS)
+    interrupted.step(SerialPool())
+    # A cache line cut short by the interruption is skipped and played again
+    with open(tmp_path / "resumed" / "cache.jsonl", "a") as f:
+        f.write('{"key": "cut sh')
+    resumed = Tuner(str(tmp_path / "resumed"), **SETTINGS)
+    assert resumed.generation == 1
+    assert resumed.rng.getstate() == interrupted.rng.getstate()
+    assert resumed.population == interrupted.population
+    for _ in range(2):
+        resumed.step(SerialPool())
+
+    assert resumed.population == straight.population
+    assert resumed.rng.getstate() == straight.rng.getstate()
+    assert history(resumed) == history(straight)
+    assert (tmp_path / "resumed" / "params.json").read_text() == (tmp_path / "straight" / "params.json").read_text()
+
+
+def test_other_settings_are_refused(tmp_path):
+    Tuner(str(tmp_path), **SETTINGS).step(SerialPool())
+    for name, value in (("matches", 3), ("seed", 4), ("max_time", 30.0)):
+        with pytest.raises(ValueError):
+            Tuner(str(tmp_path), **SETTINGS | {name: value})
+    # The job is still there to resume
+    assert Tuner(str(tmp_path), **SETTINGS).generation == 1
+
+
+def test_params_file_loads(tmp_path, monkeypatch):
+    job = Tuner(str(tmp_path), **SETTINGS)
+    # A winning candidate, so the best isn't the current parameters
+    monkeypatch.setattr(tuner, "play_match", lambda task: (task[0], task[2], int(task[1] == best), [0.0] * len(UNIT_TABLE)))
+    best = decode(job.space, job.population[1])
+    job.step(SerialPool())
+
+    loaded = load_params(str(tmp_path / "params.json"))
+    assert loaded == {"ai": best["ai"], "unit_types": best["unit_types"]}
+    with open(tmp_path / "params.json") as f:
+        assert json.load(f)["tuning"]["win_rate"] == 1.0
+    tuned = AIParams(**loaded["ai"])
+    assert [getattr(tuned, name) for name in loaded["ai"]] == list(best["ai"].values())
+    unit_types = UNIT_TABLE.with_stats(loaded["unit_types"])
+    for key, stats in best["unit_types"].items():
+        for stat, value in stats.items():
+            assert getattr(unit_types[key], stat) == value
@@ -0,0 +1,53 @@
+import random
+import pytest
+
+from src.constants import TICK_RATE
+from src.fast_forward import FastForward
+from src.simulation import Simulation
+from src.two_phase import Plan, plan_units, mirrored_ticks
+from tests.test_fast_forward import full_state
+
+
+class ShuffledSimulation(Simulation):
+    """Two-phase simulation planning and committing its units in a random order."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, two_phase=True, **kwargs)
+        self.order = random.Random(0)
+
+    def plan_tick(self, dt: float) -> list[Plan]:
+        player_units = self.order.sample(self.player.units, len(self.player.units))
+        enemy_units = self.order.sample(self.enemy.units, len(self.enemy.units))
+        plans = plan_units(enemy_units, self.player.lane_index, dt) \
+            + plan_units(player_units, self.enemy.lane_index, dt)
+        self.order.shuffle(plans)
+        return plans
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_unit_order_changes_nothing(seed):
+    stepped = Simulation(player_ai=True, seed=seed, two_phase=True)
+    shuffled = ShuffledSimulation(player_ai=True, seed=seed)
+    while not stepped.game_over and stepped.time < 300.0:
+        stepped.step()
+        shuffled.step()
+        assert full_state(shuffled) == full_state(stepped)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_mirrored_matches_stay_mirrored(seed):
+    # 60 seconds of the same spawns on both sides; the legacy tick gives the player side the edge within 10
+    assert mirrored_ticks(seed, two_phase=True, max_time=60.0) > 60 * TICK_RATE
+    assert mirrored_ticks(seed, two_phase=False, max_time=60.0) < 10 * TICK_RATE
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_fast_forward_matches_stepping(seed):
+    stepped = Simulation(player_ai=True, seed=seed, two_phase=True)
+    forward = FastForward(Simulation(player_ai=True, seed=seed, two_phase=True))
+    jumped = forward.simulation
+    while not jumped.game_over and jumped.time < 300.0:
+        forward.advance(300.0)
+        while stepped.ticks < jumped.ticks:
+            stepped.step()
+        assert full_state(jumped) == full_state(stepped)
@@ -0,0 +1,38 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from src.ai import AI
+from src.player import Player
+from src.simulation import Simulation
+from src.unit_types import UNIT_TABLE
+from tests.helpers import OVERRIDES, spawn_script, play
+
+
+def simulation(seed: int, player_ai: bool, vectorized: bool, unit_types: dict | None = None) -> Simulation:
+    player = AI(is_player_side=True) if player_ai else Player(is_human=True)
+    enemy = AI()
+    if unit_types is not None:
+        player.unit_types = enemy.unit_types = unit_types
+    return Simulation(player=player, enemy=enemy, seed=seed, vectorized=vectorized)
+
+
+@pytest.mark.parametrize("player_ai", (False, True))
+@pytest.mark.parametrize("seed", range(8))
+def test_vectorized_matches_objects(seed, player_ai):
+    script = spawn_script(seed)
+    objects = play(simulation(seed, player_ai, vectorized=False), script)
+    vectorized = play(simulation(seed, player_ai, vectorized=True), script)
+    assert vectorized == objects
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_vectorized_matches_objects_with_overridden_stats(seed):
+    unit_types = UNIT_TABLE.with_stats(OVERRIDES)
+    script = spawn_script(seed)
+    objects = simulation(seed, True, vectorized=False, unit_types=unit_types)
+    vectorized = simulation(seed, True, vectorized=True, unit_types=unit_types)
+    assert play(vectorized, script, max_ticks=1500) == play(objects, script, max_ticks=1500)
+    for side in (vectorized.player, vectorized.enemy):
+        for view in side.units:
+            assert view.unit_type is unit_types[UNIT_TABLE.names[view.unit_type.type_id]]